@@ -1,3 +1,22 @@
+# apps/core/admin.py
 from django.contrib import admin
 
-# Register your models here.
+from .models import Notification
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "channel",
+        "chat_id",
+        "status",
+        "attempts",
+        "next_attempt_at",
+        "sent_at",
+        "created_at",
+    )
+    list_filter = ("status", "channel")
+    search_fields = ("chat_id", "text")
+    readonly_fields = ("created_at", "updated_at", "sent_at")
+    ordering = ("-created_at",)
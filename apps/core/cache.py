@@ -0,0 +1,26 @@
+# apps/core/cache.py
+from typing import Optional
+
+from django.conf import settings
+
+__all__ = ("is_shared_cache", "cache_timeout")
+
+# Process ichida yashaydigan backend'lar: bir worker'dagi delete/set
+# boshqalariga ko'rinmaydi
+_LOCAL_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def is_shared_cache(alias: str = "default") -> bool:
+    return settings.CACHES.get(alias, {}).get("BACKEND", "") not in _LOCAL_BACKENDS
+
+
+def cache_timeout(timeout: Optional[int], *, local: int) -> Optional[int]:
+    """
+    Signal bilan invalidatsiya qilinadigan kalitlar uchun TTL: umumiy keshda
+    `timeout`, process-local keshda esa `local` (boshqa worker'larda eski
+    qiymat shundan ortiq yashamasin).
+    """
+    return timeout if is_shared_cache() else local
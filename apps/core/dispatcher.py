@@ -0,0 +1,147 @@
+# apps/core/dispatcher.py
+"""
+Outbox dispatcher (async): navbatdagi `Notification`larni olib,
+process'ning `NotificationClient`i (keep-alive pool) orqali parallel
+yuboradi. Telegram
+limitlari: global ~30 msg/s, bitta chatga ~1 msg/s, guruhga ~20 msg/min.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Dict, List, Optional
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+from .notifications import NotificationClient, TelegramError, get_client
+from .outbox import PendingNotification, backoff_delay, claim_due, record_results
+
+log = logging.getLogger(__name__)
+
+
+def _conf(key: str, default):
+    return getattr(settings, "NOTIFICATIONS", {}).get(key, default)
+
+
+class RateLimiter:
+    """
+    Slot bron qilish: har bir xabar uchun global va per-chat navbatdagi
+    bo'sh vaqt hisoblanadi. `max_wait`dan uzoq kutish kerak bo'lsa slot
+    olinmaydi (xabar keyinga qoldiriladi).
+    """
+
+    def __init__(self, *, rate: float, chat_interval: float, group_interval: float):
+        self.global_interval = 1.0 / rate
+        self.chat_interval = chat_interval
+        self.group_interval = group_interval
+        self._next_global = 0.0
+        self._next_chat: Dict[str, float] = {}
+
+    def _interval(self, chat_id: str) -> float:
+        # Telegram'da guruh/kanal id'lari manfiy
+        return self.group_interval if chat_id.startswith("-") else self.chat_interval
+
+    def reserve(self, chat_id: str, *, max_wait: float) -> Optional[float]:
+        now = asyncio.get_running_loop().time()
+        at = max(now, self._next_global, self._next_chat.get(chat_id, 0.0))
+        if at - now > max_wait:
+            return None
+        self._next_global = at + self.global_interval
+        self._next_chat[chat_id] = at + self._interval(chat_id)
+        return at - now
+
+    def penalize(self, chat_id: str, seconds: float) -> None:
+        """429 `retry_after`: shu chatga shuncha vaqt yozilmaydi."""
+        now = asyncio.get_running_loop().time()
+        self._next_chat[chat_id] = max(self._next_chat.get(chat_id, 0.0), now + seconds)
+
+    def wait_for(self, chat_id: str) -> float:
+        now = asyncio.get_running_loop().time()
+        return max(self._next_chat.get(chat_id, 0.0), self._next_global) - now
+
+
+def make_limiter() -> RateLimiter:
+    return RateLimiter(
+        rate=_conf("GLOBAL_RATE", 25),
+        chat_interval=_conf("CHAT_INTERVAL", 1.0),
+        group_interval=_conf("GROUP_INTERVAL", 3.0),
+    )
+
+
+def _db(fn):
+    def call(*args, **kwargs):
+        close_old_connections()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return sync_to_async(call, thread_sensitive=True)
+
+
+class Dispatcher:
+    def __init__(self, client: NotificationClient, limiter: RateLimiter):
+        self.client = client
+        self.limiter = limiter
+        self.max_wait = _conf("MAX_WAIT", 30)
+        self.max_attempts = _conf("MAX_ATTEMPTS", 8)
+
+    async def _deliver(self, n: PendingNotification):
+        delay = self.limiter.reserve(n.chat_id, max_wait=self.max_wait)
+        if delay is None:
+            return "deferred", (n.id, self.limiter.wait_for(n.chat_id))
+        await asyncio.sleep(delay)
+        try:
+            await self.client.send(chat_id=n.chat_id, text=n.text)
+        except TelegramError as e:
+            if e.retry_after is not None:
+                self.limiter.penalize(n.chat_id, e.retry_after)
+                return self._retry(n, e.retry_after, e)
+            if e.permanent:
+                return "failed", (n.id, e)
+            return self._retry(n, backoff_delay(n.attempts + 1), e)
+        except httpx.HTTPError as e:
+            return self._retry(n, backoff_delay(n.attempts + 1), e)
+        return "sent", n.id
+
+    def _retry(self, n: PendingNotification, delay: float, error):
+        if n.attempts + 1 >= self.max_attempts:
+            return "failed", (n.id, error)
+        return "retry", (n.id, delay, error)
+
+    async def run_once(self, *, limit: int) -> Dict[str, int]:
+        batch: List[PendingNotification] = await _db(claim_due)(limit=limit)
+        if not batch:
+            return {}
+        outcomes = await asyncio.gather(*(self._deliver(n) for n in batch))
+        grouped: Dict[str, list] = {
+            "sent": [],
+            "retry": [],
+            "failed": [],
+            "deferred": [],
+        }
+        for kind, value in outcomes:
+            grouped[kind].append(value)
+        for pk, error in grouped["failed"]:
+            log.warning("Notification %s failed: %s", pk, error)
+        await _db(record_results)(**grouped)
+        return {kind: len(items) for kind, items in grouped.items() if items}
+
+
+async def run_dispatcher(*, batch_size: int, interval: float, once: bool = False):
+    client = get_client()
+    dispatcher = Dispatcher(client, make_limiter())
+    try:
+        while True:
+            stats = await dispatcher.run_once(limit=batch_size)
+            if stats:
+                log.info("Notifications: %s", stats)
+            if once and not stats:
+                return
+            if not stats:
+                await asyncio.sleep(interval)
+    finally:
+        await client.aclose()
@@ -0,0 +1,35 @@
+# apps/core/management/commands/dispatch_notifications.py
+import asyncio
+
+from django.core.management.base import BaseCommand
+
+from apps.core.dispatcher import run_dispatcher
+
+
+class Command(BaseCommand):
+    help = (
+        "Notification outbox'ni yuboradi (retry, backoff, rate limit). "
+        "Doimiy jarayon sifatida ishlaydi; `--once` — navbat bo'shaguncha."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Navbat bo'sh bo'lganda kutish (soniya).",
+        )
+        parser.add_argument("--once", action="store_true")
+
+    def handle(self, *args, **opts):
+        try:
+            asyncio.run(
+                run_dispatcher(
+                    batch_size=max(1, opts["batch_size"]),
+                    interval=opts["interval"],
+                    once=opts["once"],
+                )
+            )
+        except KeyboardInterrupt:
+            pass
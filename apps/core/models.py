@@ -1,3 +1,50 @@
+# apps/core/models.py
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class Notification(models.Model):
+    """
+    Transactional outbox: xabar biznes o'zgarishi bilan bitta tranzaksiyada
+    yoziladi, yuborishni esa alohida `dispatch_notifications` jarayoni
+    bajaradi (retry, backoff, rate limit bilan).
+    """
+
+    class Channel(models.TextChoices):
+        TELEGRAM = "telegram", "Telegram"
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        SENT = "sent", "Sent"
+        FAILED = "failed", "Failed"
+
+    channel = models.CharField(
+        max_length=20, choices=Channel.choices, default=Channel.TELEGRAM  # type: ignore[attr-defined]
+    )
+    chat_id = models.CharField(max_length=64)
+    text = models.TextField()
+
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING  # type: ignore[attr-defined]
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # keyingi urinish vaqti; dispatcher olganda lease sifatida ham suriladi
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default="")
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "core_notifications"
+        indexes = [
+            models.Index(
+                fields=["next_attempt_at"],
+                condition=models.Q(status="pending"),
+                name="notif_pending_due_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Notification<{self.pk}> {self.channel}:{self.chat_id} {self.status}"
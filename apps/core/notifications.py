@@ -1,33 +1,198 @@
 # apps/core/notifications.py
+"""
+Telegram xabarlari uchun process bo'yicha yagona klient.
+
+`httpx.AsyncClient` event loop'ga bog'langan, shuning uchun har bir loop
+o'z pool'ini bir marta ochadi va keyin qayta ishlatadi (keep-alive —
+har xabarga yangi TCP/TLS handshake yo'q). Sinxron Django kodi alohida
+fon thread'idagi loop orqali ishlaydi (`send_sync`, `send_many_sync`),
+async kod esa `await client.send(...)` ni to'g'ridan-to'g'ri chaqiradi.
+"""
+import asyncio
+import atexit
 import logging
+import threading
+import weakref
+from typing import Iterable, List, Optional, Tuple
+
 import httpx
 from django.conf import settings
 
 log = logging.getLogger(__name__)
 
 
-async def _tg_send_async(text: str, chat_id: str):
+def _conf(key: str, default):
+    return getattr(settings, "NOTIFICATIONS", {}).get(key, default)
+
+
+class TelegramError(Exception):
+    """
+    `retry_after` — Telegram 429 bergan kutish (soniya); `permanent` —
+    qayta urinishdan foyda yo'q (masalan chat topilmadi, bot bloklangan).
+    """
+
+    def __init__(
+        self, message: str, *, retry_after: Optional[float] = None, permanent=False
+    ):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.permanent = permanent
+
+
+async def send_telegram(client: httpx.AsyncClient, *, chat_id: str, text: str):
     token = settings.TELEGRAM_BOT_TOKEN
-    if not token or not chat_id or not text:
-        return
-    url = f"https://api.telegram.org/bot{token}/sendMessage"
+    if not token:
+        raise TelegramError("TELEGRAM_BOT_TOKEN is not set", permanent=True)
+    url = f"{_conf('API_URL', 'https://api.telegram.org')}/bot{token}/sendMessage"
     payload = {
         "chat_id": chat_id,
         "text": text,
         "parse_mode": "HTML",
         "disable_web_page_preview": True,
     }
-    timeout = httpx.Timeout(connect=3.0, read=5.0)
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        r = await client.post(url, json=payload)
-        r.raise_for_status()
+    r = await client.post(url, json=payload)
+    if r.status_code == 200:
+        return
+    try:
+        data = r.json()
+    except ValueError:
+        data = {}
+    desc = data.get("description") or r.text[:200]
+    if r.status_code == 429:
+        retry_after = (data.get("parameters") or {}).get("retry_after", 1)
+        raise TelegramError(desc, retry_after=float(retry_after))
+    raise TelegramError(
+        f"{r.status_code}: {desc}", permanent=400 <= r.status_code < 500
+    )
 
 
-def notify_telegram_admin_sync(text: str):
+class _LoopState:
+    def __init__(self, max_connections: int, concurrency: int, timeout: float):
+        self.http = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout, connect=3.0),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=60,
+            ),
+        )
+        self.semaphore = asyncio.Semaphore(concurrency)
 
-    try:
-        import anyio
 
-        anyio.run(_tg_send_async, text, settings.TELEGRAM_ADMIN_CHAT_ID)
+class NotificationClient:
+    """
+    - `send` / `send_many` — async (joriy loop'ning pool'i);
+    - `send_sync` / `send_many_sync` — sinxron kod uchun, fon loop orqali.
+
+    Bir vaqtda yuborilayotgan so'rovlar soni `concurrency` bilan
+    cheklangan. `send_many` xatolarni ko'tarmaydi: natijalar ro'yxatida
+    `None` (yuborildi) yoki exception qaytadi.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.max_connections = max_connections or _conf("MAX_CONNECTIONS", 10)
+        self.concurrency = concurrency or _conf("MAX_CONCURRENCY", 10)
+        self.timeout = timeout or _conf("TIMEOUT", 10.0)
+        self._states = weakref.WeakKeyDictionary()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    # --- async ---
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._states.get(loop)
+        if state is None:
+            state = _LoopState(self.max_connections, self.concurrency, self.timeout)
+            self._states[loop] = state
+        return state
+
+    async def send(self, *, chat_id: str, text: str) -> None:
+        state = self._state()
+        async with state.semaphore:
+            await send_telegram(state.http, chat_id=str(chat_id), text=text)
+
+    async def send_many(
+        self, messages: Iterable[Tuple[str, str]]
+    ) -> List[Optional[BaseException]]:
+        """`messages` — (chat_id, text) juftliklari; tartib saqlanadi."""
+        return await asyncio.gather(
+            *(self.send(chat_id=chat_id, text=text) for chat_id, text in messages),
+            return_exceptions=True,
+        )
+
+    async def aclose(self) -> None:
+        state = self._states.pop(asyncio.get_running_loop(), None)
+        if state is not None:
+            await state.http.aclose()
+
+    # --- sync (fon loop) ---
+
+    def _background_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=loop.run_forever, name="notifications", daemon=True
+                )
+                self._thread.start()
+                self._loop = loop
+            return self._loop
+
+    def _run(self, coro, timeout: Optional[float]):
+        future = asyncio.run_coroutine_threadsafe(coro, self._background_loop())
+        return future.result(timeout)
+
+    def send_sync(self, *, chat_id: str, text: str, timeout: Optional[float] = None):
+        return self._run(
+            self.send(chat_id=chat_id, text=text), timeout or self.timeout * 2
+        )
+
+    def send_many_sync(
+        self, messages: Iterable[Tuple[str, str]], timeout: Optional[float] = None
+    ) -> List[Optional[BaseException]]:
+        return self._run(self.send_many(list(messages)), timeout)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self.aclose(), loop).result(5)
+        except Exception as e:  # noqa
+            log.debug("Notification client close failed: %s", e)
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join(5)
+        loop.close()
+
+
+_client: Optional[NotificationClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> NotificationClient:
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = NotificationClient()
+            atexit.register(_client.shutdown)
+        return _client
+
+
+def notify_telegram_admin_sync(text: str):
+    chat_id = settings.TELEGRAM_ADMIN_CHAT_ID
+    if not settings.TELEGRAM_BOT_TOKEN or not chat_id or not text:
+        return
+    try:
+        get_client().send_sync(chat_id=chat_id, text=text)
     except Exception as e:
         log.warning("Telegram notify failed: %s", e)
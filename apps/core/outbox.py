@@ -0,0 +1,159 @@
+# apps/core/outbox.py
+"""
+Notification outbox: yozish (biznes tranzaksiyasi ichida) va
+dispatcher uchun sinxron DB qismi — navbatdagilarni olish va natijalarni
+yozish. Yuborishning o'zi `apps.core.dispatcher`da.
+"""
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Iterable, List, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Notification
+
+__all__ = (
+    "PendingNotification",
+    "enqueue_notification",
+    "enqueue_admin_notification",
+    "claim_due",
+    "record_results",
+    "backoff_delay",
+)
+
+
+def _conf(key: str, default):
+    return getattr(settings, "NOTIFICATIONS", {}).get(key, default)
+
+
+def enqueue_notification(
+    *, chat_id: str, text: str, channel: str = Notification.Channel.TELEGRAM
+) -> Optional[Notification]:
+    """
+    Outbox'ga yozadi. Chaqiruvchining tranzaksiyasida ishlaydi: rollback
+    bo'lsa xabar ham yo'qoladi, commit bo'lsa albatta yuboriladi.
+    """
+    if not chat_id or not text:
+        return None
+    return Notification.objects.create(channel=channel, chat_id=str(chat_id), text=text)
+
+
+def enqueue_admin_notification(text: str) -> Optional[Notification]:
+    return enqueue_notification(chat_id=settings.TELEGRAM_ADMIN_CHAT_ID, text=text)
+
+
+@dataclass
+class PendingNotification:
+    id: int
+    channel: str
+    chat_id: str
+    text: str
+    attempts: int
+
+
+# Navbatdagilarni olish: SKIP LOCKED — bir nechta dispatcher bir-birini
+# kutmaydi; next_attempt_at lease sifatida suriladi (jarayon o'lsa qayta
+# olinadi).
+_CLAIM_SQL = """
+WITH picked AS (
+    SELECT id FROM core_notifications
+    WHERE status = %(pending)s AND next_attempt_at <= %(now)s
+    ORDER BY next_attempt_at, id
+    LIMIT %(limit)s
+    FOR UPDATE SKIP LOCKED
+)
+UPDATE core_notifications n
+SET next_attempt_at = %(lease)s, updated_at = %(now)s
+FROM picked
+WHERE n.id = picked.id
+RETURNING n.id, n.channel, n.chat_id, n.text, n.attempts
+"""
+
+
+@transaction.atomic
+def claim_due(*, limit: int) -> List[PendingNotification]:
+    now = timezone.now()
+    with connection.cursor() as cur:
+        cur.execute(
+            _CLAIM_SQL,
+            {
+                "pending": Notification.Status.PENDING,
+                "now": now,
+                "lease": now + timedelta(seconds=_conf("LEASE_SECONDS", 120)),
+                "limit": limit,
+            },
+        )
+        rows = cur.fetchall()
+    return sorted((PendingNotification(*row) for row in rows), key=lambda n: n.id)
+
+
+def backoff_delay(
+    attempts: int, *, base: Optional[float] = None, cap: Optional[float] = None
+) -> float:
+    """Exponential backoff + jitter: base * 2^(n-1), `BACKOFF_MAX` bilan cheklangan."""
+    base = _conf("BACKOFF_BASE", 2) if base is None else base
+    cap = _conf("BACKOFF_MAX", 600) if cap is None else cap
+    delay = min(cap, base * 2 ** max(attempts - 1, 0))
+    return delay * random.uniform(0.8, 1.2)
+
+
+@transaction.atomic
+def record_results(
+    *,
+    sent: Iterable[int] = (),
+    retry: Iterable[tuple] = (),
+    failed: Iterable[tuple] = (),
+    deferred: Iterable[tuple] = (),
+) -> None:
+    """
+    - `sent` — id'lar;
+    - `retry` — (id, delay, error): urinish hisoblanadi;
+    - `failed` — (id, error): boshqa urinilmaydi;
+    - `deferred` — (id, delay): rate limit sababli kechiktirildi, urinish emas.
+    """
+    now = timezone.now()
+    sent = list(sent)
+    if sent:
+        Notification.objects.filter(id__in=sent).update(
+            status=Notification.Status.SENT,
+            sent_at=now,
+            attempts=F("attempts") + 1,
+            last_error="",
+            updated_at=now,
+        )
+
+    rows = [
+        Notification(
+            pk=pk,
+            attempts=F("attempts") + 1,
+            next_attempt_at=now + timedelta(seconds=delay),
+            last_error=str(error)[:1000],
+        )
+        for pk, delay, error in retry
+    ]
+    if rows:
+        Notification.objects.bulk_update(
+            rows, ["attempts", "next_attempt_at", "last_error"]
+        )
+
+    failed = list(failed)
+    for pk, error in failed:
+        Notification.objects.filter(pk=pk).update(
+            status=Notification.Status.FAILED,
+            attempts=F("attempts") + 1,
+            last_error=str(error)[:1000],
+            updated_at=now,
+        )
+
+    rows = [
+        Notification(pk=pk, next_attempt_at=now + timedelta(seconds=delay))
+        for pk, delay in deferred
+    ]
+    if rows:
+        Notification.objects.bulk_update(rows, ["next_attempt_at"])
@@ -0,0 +1,193 @@
+# apps/core/pagination.py
+import base64
+import binascii
+import datetime
+import json
+from collections import OrderedDict
+from decimal import Decimal
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination: `OFFSET` o'rniga `(ordering..., id)` bo'yicha
+    `WHERE (created_at, id) < (%s, %s)` filtri. Chuqur sahifalar ham bitta
+    indeks skanida olinadi.
+
+    - `cursor` — oldingi javobdagi `next` ichidagi qiymat;
+    - `page_size` — sahifa hajmi (max `max_page_size`);
+    - `count=false` — `COUNT(*)` hisoblanmaydi, javobda `count` bo'lmaydi.
+
+    Tartib view'dagi `OrderingFilter`dan (yoki `default_ordering`dan) olinadi,
+    oxiriga har doim `id` qo'shiladi.
+    """
+
+    page_size = api_settings.PAGE_SIZE or 20
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    count_query_param = "count"
+    default_ordering = ("-created_at",)
+    tiebreaker = "id"
+
+    def get_ordering(self, request, queryset, view):
+        ordering = None
+        if view is not None and any(
+            issubclass(b, OrderingFilter) for b in getattr(view, "filter_backends", [])
+        ):
+            ordering = OrderingFilter().get_ordering(request, queryset, view)
+        ordering = list(ordering or self.default_ordering)
+        if not any(o.lstrip("-") in {self.tiebreaker, "pk"} for o in ordering):
+            desc = ordering[0].startswith("-")
+            ordering.append(f"-{self.tiebreaker}" if desc else self.tiebreaker)
+        return ordering
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def want_count(self, request):
+        raw = request.query_params.get(self.count_query_param, "true")
+        return raw.lower() not in {"0", "false", "no"}
+
+    def decode_cursor(self, request, ordering, model):
+        raw = request.query_params.get(self.cursor_query_param)
+        if not raw:
+            return None
+        try:
+            padded = raw + "=" * (-len(raw) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if payload["o"] != ordering or len(payload["v"]) != len(ordering):
+                raise ValueError
+            return [
+                model._meta.get_field(name.lstrip("-")).to_python(value)
+                for name, value in zip(ordering, payload["v"])
+            ]
+        except (
+            binascii.Error,
+            ValueError,
+            KeyError,
+            TypeError,
+            FieldDoesNotExist,
+            ValidationError,
+        ):
+            raise NotFound("Invalid cursor")
+
+    def encode_cursor(self, obj, ordering):
+        values = [_encode_value(getattr(obj, o.lstrip("-"))) for o in ordering]
+        payload = json.dumps({"o": ordering, "v": values}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def _after(ordering, values):
+        # (a, b, c) > (x, y, z) ni har bir maydon yo'nalishi bilan yoyamiz
+        cond = Q()
+        for i, name in enumerate(ordering):
+            field = name.lstrip("-")
+            op = "lt" if name.startswith("-") else "gt"
+            step = Q(**{f"{field}__{op}": values[i]})
+            for prev, value in zip(ordering[:i], values[:i]):
+                step &= Q(**{prev.lstrip("-"): value})
+            cond |= step
+        return cond
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering = self.get_ordering(request, queryset, view)
+        queryset = queryset.order_by(*self.ordering)
+
+        self.count = queryset.count() if self.want_count(request) else None
+
+        values = self.decode_cursor(request, self.ordering, queryset.model)
+        if values is not None:
+            queryset = queryset.filter(self._after(self.ordering, values))
+
+        size = self.get_page_size(request)
+        items = list(queryset[: size + 1])
+        self.page = items[:size]
+        self.next_cursor = (
+            self.encode_cursor(self.page[-1], self.ordering)
+            if len(items) > size
+            else None
+        )
+        return self.page
+
+    def restore(self, request, *, count, next_cursor):
+        """Keshdan olingan sahifa uchun holatni tiklaydi."""
+        self.request = request
+        self.count = count
+        self.next_cursor = next_cursor
+
+    def get_next_link(self):
+        if not self.next_cursor:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        body = OrderedDict()
+        if self.count is not None:
+            body["count"] = self.count
+        body["next"] = self.get_next_link()
+        body["results"] = data
+        return Response(body)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "count": {"type": "integer", "example": 123},
+                "next": {
+                    "type": "string",
+                    "nullable": True,
+                    "format": "uri",
+                    "example": "http://api.example.org/accounts/?cursor=eyJvIjpb",
+                },
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Keyingi sahifa kursori (`next` ichidan).",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": f"Sahifa hajmi (max {self.max_page_size}).",
+                "schema": {"type": "integer"},
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "`false` bo'lsa COUNT(*) hisoblanmaydi.",
+                "schema": {"type": "boolean"},
+            },
+        ]
@@ -1,3 +1,128 @@
-from django.test import TestCase
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
-# Create your tests here.
+from django.test import SimpleTestCase, override_settings
+
+from apps.core.notifications import NotificationClient, TelegramError
+
+
+class _StubTelegram(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_StubServer"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        srv = self.server
+        with srv.lock:
+            srv.in_flight += 1
+            srv.max_in_flight = max(srv.max_in_flight, srv.in_flight)
+            srv.ports.add(self.client_address[1])
+        time.sleep(srv.delay)
+        with srv.lock:
+            srv.in_flight -= 1
+            srv.received.append(body)
+
+        if body["chat_id"] == "flood":
+            code = 429
+            resp = {"ok": False, "parameters": {"retry_after": 7}}
+        elif body["chat_id"] == "blocked":
+            code, resp = 403, {"ok": False, "description": "bot was blocked"}
+        else:
+            code, resp = 200, {"ok": True}
+        data = json.dumps(resp).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class _StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _StubTelegram)
+        self.lock = threading.Lock()
+        self.delay = 0.0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.ports = set()
+        self.received = []
+
+
+class NotificationClientTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = _StubServer()
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.settings_override = override_settings(
+            TELEGRAM_BOT_TOKEN="test-token",
+            NOTIFICATIONS={"API_URL": f"http://127.0.0.1:{cls.server.server_port}"},
+        )
+        cls.settings_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        srv = self.server
+        srv.delay, srv.max_in_flight = 0.0, 0
+        srv.ports.clear()
+        srv.received.clear()
+        self.client = NotificationClient(max_connections=3, concurrency=3)
+        self.addCleanup(self.client.shutdown)
+
+    def test_send_many_sync_reuses_connections(self):
+        results = self.client.send_many_sync([(str(i), f"m{i}") for i in range(30)])
+        results += self.client.send_many_sync([("1", "again")])
+
+        self.assertEqual(results, [None] * 31)
+        self.assertEqual(len(self.server.received), 31)
+        # keep-alive: 31 ta xabar pool'dagi 3 tadan ko'p bo'lmagan ulanishda
+        self.assertLessEqual(len(self.server.ports), 3)
+
+    def test_concurrency_is_bounded(self):
+        self.server.delay = 0.05
+        self.client.send_many_sync([("1", str(i)) for i in range(12)])
+        self.assertEqual(len(self.server.received), 12)
+        self.assertLessEqual(self.server.max_in_flight, 3)
+        self.assertGreater(self.server.max_in_flight, 1)
+
+    def test_send_many_returns_errors_in_order(self):
+        results = self.client.send_many_sync(
+            [("1", "ok"), ("flood", "x"), ("blocked", "y")]
+        )
+        self.assertIsNone(results[0])
+        self.assertIsInstance(results[1], TelegramError)
+        self.assertEqual(results[1].retry_after, 7)
+        self.assertFalse(results[1].permanent)
+        self.assertTrue(results[2].permanent)
+
+    def test_send_sync_raises(self):
+        with self.assertRaises(TelegramError):
+            self.client.send_sync(chat_id="blocked", text="x")
+        self.client.send_sync(chat_id="1", text="hello")
+        self.assertEqual(self.server.received[-1]["text"], "hello")
+
+    def test_async_usage(self):
+        async def main():
+            await self.client.send(chat_id="5", text="a")
+            results = await self.client.send_many([("5", "b"), ("6", "c")])
+            await self.client.aclose()
+            return results
+
+        self.assertEqual(asyncio.run(main()), [None, None])
+        self.assertEqual(
+            sorted(m["text"] for m in self.server.received), ["a", "b", "c"]
+        )
@@ -3,7 +3,7 @@ from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
 
-from .models import Payment
+from .models import Payment, PaymentEvent
 
 
 @admin.register(Payment)
@@ -88,3 +88,27 @@ class PaymentAdmin(admin.ModelAdmin):
 
     def has_delete_permission(self, request, obj=None):
         return False
+
+
+@admin.register(PaymentEvent)
+class PaymentEventAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "payment",
+        "click_trans_id",
+        "action",
+        "error_code",
+        "status",
+        "attempts",
+        "next_attempt_at",
+        "received_at",
+        "processed_at",
+    )
+    list_filter = ("status", "action")
+    search_fields = ("click_trans_id", "payment__id")
+    raw_id_fields = ("payment",)
+    readonly_fields = ("received_at", "processed_at", "payload", "last_error")
+    ordering = ("-id",)
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,34 @@
+# apps/payments/management/commands/process_payment_events.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.payments.services import process_payment_events
+
+
+class Command(BaseCommand):
+    help = (
+        "Click webhook inbox'idagi (PaymentEvent) eventlarni batch bilan "
+        "qo'llaydi. Bir nechta worker parallel ishlashi mumkin (SKIP LOCKED)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Soniya; 0 bo'lsa navbat bo'shaguncha ishlab to'xtaydi.",
+        )
+
+    def handle(self, *args, **opts):
+        size = max(1, opts["batch_size"])
+        while True:
+            stats = process_payment_events(limit=size)
+            if stats:
+                self.stdout.write(f"{stats}")
+            if sum(stats.values()) >= size:
+                continue
+            if not opts["interval"]:
+                return
+            time.sleep(opts["interval"])
@@ -73,3 +73,64 @@ class Payment(models.Model):
 
     def __str__(self):
         return f"Payment<{self.id}> {self.provider} {self.status} {self.amount} {self.currency}"
+
+
+class PaymentEvent(models.Model):
+    """
+    Click webhook inbox (append-only). Webhook faqat tekshiradi, shu yerga
+    yozadi va javob qaytaradi; holat o'zgarishlarini `process_payment_events`
+    worker'i batch bilan qo'llaydi. `(click_trans_id, action)` unique —
+    Click qayta yuborgan so'rov ikkinchi marta qo'llanmaydi.
+    """
+
+    class Action(models.TextChoices):
+        PREPARE = "prepare", "Prepare"
+        COMPLETE = "complete", "Complete"
+        CANCEL = "cancel", "Cancel"
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        PROCESSED = "processed", "Processed"
+        SKIPPED = "skipped", "Skipped"
+        FAILED = "failed", "Failed"
+
+    id = models.BigAutoField(primary_key=True)
+    payment = models.ForeignKey(
+        Payment, on_delete=models.CASCADE, related_name="events"
+    )
+    click_trans_id = models.CharField(max_length=64)
+    action = models.CharField(max_length=20, choices=Action.choices)  # noqa
+    error_code = models.CharField(max_length=20, blank=True, default="")
+    error_note = models.CharField(max_length=255, blank=True, default="")
+    payload = models.JSONField(default=dict, blank=True)
+
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.PENDING  # noqa
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # xatodan keyin exponential backoff bilan suriladi
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default="")
+
+    received_at = models.DateTimeField(default=timezone.now, db_index=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "payment_events"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["click_trans_id", "action"], name="uniq_payment_event"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=models.Q(status="pending"),
+                name="payevent_pending_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return (
+            f"PaymentEvent<{self.id}> {self.click_trans_id} {self.action} {self.status}"
+        )
@@ -1,16 +1,20 @@
 # apps/payments/services.py
 import hashlib
 import hmac
+import json
+from collections import defaultdict
+from datetime import timedelta
 from decimal import Decimal
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 from django.conf import settings
-from django.db import transaction
-from django.db.models import F
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef
 from django.utils import timezone
 
-from apps.profiles.models import StudentProfile, StudentTopUpLog
-from .models import Payment, PaymentStatus
+from apps.core.outbox import backoff_delay
+from apps.profiles.ledger import top_up
+from .models import Payment, PaymentEvent, PaymentStatus
 
 
 def _click_sign(payload: Dict[str, Any]) -> str:
@@ -40,19 +44,13 @@ def mark_payment_paid_and_topup(
         return payment
     amount = Decimal(str(payment.amount))
 
-    StudentProfile.objects.filter(pk=payment.student.pk).update(
-        balance=F("balance") + amount
-    )
-
-    payment.student.refresh_from_db(fields=["balance"])
-
-    StudentTopUpLog.objects.create(
-        student=payment.student,
+    (entry,) = top_up(
+        student_ids=[payment.student_id],
         amount=amount,
-        new_balance=payment.student.balance,
-        actor=None,
+        reference=f"payment:{payment.id}",
         note=f"Click top-up Payment<{payment.id}>",
     )
+    payment.student.balance = entry.balance_after
 
     payment.status = PaymentStatus.PAID
     payment.provider_payload = webhook_payload or {}
@@ -96,3 +94,238 @@ def mark_payment_failed(
 
     payment.save(update_fields=update_fields)
     return payment
+
+
+def mark_payment_pending(*, payment: Payment, webhook_payload: Dict[str, Any]) -> bool:
+    if payment.status not in {
+        PaymentStatus.CREATED,
+        PaymentStatus.FAILED,
+        PaymentStatus.CANCELED,
+    }:
+        return False
+    payment.status = PaymentStatus.PENDING
+    payment.provider_invoice_id = str(webhook_payload.get("invoice_id", "") or "")
+    payment.provider_txn_id = str(webhook_payload.get("click_trans_id", "") or "")
+    payment.provider_payload = webhook_payload
+    payment.error_code = str(webhook_payload.get("error", "0"))
+    payment.error_note = webhook_payload.get("error_note", "") or ""
+    payment.save(
+        update_fields=[
+            "status",
+            "provider_invoice_id",
+            "provider_txn_id",
+            "provider_payload",
+            "error_code",
+            "error_note",
+            "updated_at",
+        ]
+    )
+    return True
+
+
+def mark_payment_canceled(*, payment: Payment, webhook_payload: Dict[str, Any]) -> bool:
+    if payment.status in {PaymentStatus.PAID, PaymentStatus.CANCELED}:
+        return False
+    payment.status = PaymentStatus.CANCELED
+    payment.provider_payload = webhook_payload
+    payment.error_code = str(webhook_payload.get("error", "0"))
+    payment.error_note = (
+        webhook_payload.get("error_note", "") or "Canceled by user/provider"
+    )
+    payment.save(
+        update_fields=[
+            "status",
+            "provider_payload",
+            "error_code",
+            "error_note",
+            "updated_at",
+        ]
+    )
+    return True
+
+
+# --- Click webhook inbox ---
+
+CLICK_ACTIONS = {
+    "prepare": PaymentEvent.Action.PREPARE,
+    "check": PaymentEvent.Action.PREPARE,
+    "complete": PaymentEvent.Action.COMPLETE,
+    "pay": PaymentEvent.Action.COMPLETE,
+    "cancel": PaymentEvent.Action.CANCEL,
+}
+
+
+_INSERT_EVENT_SQL = """
+INSERT INTO payment_events (
+    payment_id, click_trans_id, action, error_code, error_note, payload,
+    status, attempts, last_error, received_at, next_attempt_at
+)
+VALUES (%s, %s, %s, %s, %s, %s::jsonb, %s, 0, '', %s, %s)
+ON CONFLICT (click_trans_id, action) DO NOTHING
+RETURNING id
+"""
+
+
+def record_click_event(
+    *, payment_id, click_trans_id: str, action: str, payload: Dict[str, Any]
+) -> bool:
+    """
+    Inbox'ga bitta `INSERT ... ON CONFLICT DO NOTHING`; Payment qatori
+    qulflanmaydi. Qayta kelgan (dublikat) event uchun False.
+    """
+    now = timezone.now()
+    with connection.cursor() as cur:
+        cur.execute(
+            _INSERT_EVENT_SQL,
+            [
+                payment_id,
+                click_trans_id,
+                action,
+                str(payload.get("error", "0") or "0")[:20],
+                str(payload.get("error_note", "") or "")[:255],
+                json.dumps(payload, default=str),
+                PaymentEvent.Status.PENDING,
+                now,
+                now,
+            ],
+        )
+        return cur.fetchone() is not None
+
+
+def _apply_event(payment: Payment, event: PaymentEvent) -> bool:
+    """Holat o'tishi qo'llansa True, idempotent holda o'tkazib yuborilsa False."""
+    payload = event.payload or {}
+    if event.action == PaymentEvent.Action.PREPARE:
+        return mark_payment_pending(payment=payment, webhook_payload=payload)
+    if event.action == PaymentEvent.Action.CANCEL:
+        return mark_payment_canceled(payment=payment, webhook_payload=payload)
+    # COMPLETE
+    if payment.status == PaymentStatus.PAID:
+        return False
+    if event.error_code not in {"", "0"}:
+        mark_payment_failed(
+            payment=payment,
+            webhook_payload=payload,
+            error_code=event.error_code,
+            error_note=event.error_note,
+        )
+        return True
+    mark_payment_paid_and_topup(payment=payment, webhook_payload=payload)
+    return True
+
+
+def _in_order(events: List[PaymentEvent]) -> List[PaymentEvent]:
+    """
+    Har bir payment uchun faqat undan oldingi barcha pending eventlar ham
+    batch'da bo'lgan eventlar qoladi: backoff'dagi yoki boshqa worker
+    qulflagan oldingi event kutilmasdan keyingisi qo'llanmaydi.
+    """
+    upto = max(e.id for e in events)
+    pending = defaultdict(list)
+    for payment_id, event_id in (
+        PaymentEvent.objects.filter(
+            status=PaymentEvent.Status.PENDING,
+            payment_id__in={e.payment_id for e in events},
+            id__lte=upto,
+        )
+        .order_by("id")
+        .values_list("payment_id", "id")
+    ):
+        pending[payment_id].append(event_id)
+
+    ready = []
+    for event in events:
+        queue = pending[event.payment_id]
+        if queue and queue[0] == event.id:
+            queue.pop(0)
+            ready.append(event)
+        else:
+            pending[event.payment_id] = []  # navbat uzildi
+    return ready
+
+
+@transaction.atomic
+def process_payment_events(*, limit: int = 100) -> Dict[str, int]:
+    """
+    Vaqti kelgan eventlarni `FOR UPDATE SKIP LOCKED` bilan olib, tegishli
+    Payment'larni id tartibida bitta so'rovda qulflaydi va eventlarni
+    kelish tartibida qo'llaydi. Har bir event o'z savepoint'ida — bittasi
+    yiqilsa boshqa payment'larniki commit bo'ladi, shu payment'ning
+    keyingi eventlari esa navbatda qoladi. Yiqilgan event exponential
+    backoff bilan `MAX_EVENT_ATTEMPTS`gacha qayta uriniladi.
+    """
+    now = timezone.now()
+    events: List[PaymentEvent] = list(
+        PaymentEvent.objects.select_for_update(skip_locked=True)
+        .filter(status=PaymentEvent.Status.PENDING, next_attempt_at__lte=now)
+        # backoff'dagi event ortidagilar batch'ni egallamasin
+        .exclude(
+            Exists(
+                PaymentEvent.objects.filter(
+                    payment_id=OuterRef("payment_id"),
+                    status=PaymentEvent.Status.PENDING,
+                    id__lt=OuterRef("id"),
+                    next_attempt_at__gt=now,
+                )
+            )
+        )
+        .order_by("id")[:limit]
+    )
+    if not events:
+        return {}
+    events = _in_order(events)
+    if not events:
+        return {}
+    payments = {
+        p.pk: p
+        # faqat payments qatorlari (student_profiles emas), id tartibida
+        for p in Payment.objects.select_for_update(of=("self",))
+        .select_related("student")
+        .filter(id__in={e.payment_id for e in events})
+        .order_by("id")
+    }
+
+    conf = settings.PAYMENTS
+    max_attempts = conf.get("MAX_EVENT_ATTEMPTS", 5)
+    stats = {"processed": 0, "skipped": 0, "failed": 0, "retry": 0, "blocked": 0}
+    blocked = set()
+    done = []
+    for event in events:
+        if event.payment_id in blocked:
+            stats["blocked"] += 1
+            continue
+        event.attempts += 1
+        done.append(event)
+        try:
+            with transaction.atomic():
+                applied = _apply_event(payments[event.payment_id], event)
+        except Exception as exc:  # noqa
+            event.last_error = f"{type(exc).__name__}: {exc}"[:1000]
+            if event.attempts >= max_attempts:
+                event.status = PaymentEvent.Status.FAILED
+                stats["failed"] += 1
+            else:
+                event.next_attempt_at = now + timedelta(
+                    seconds=backoff_delay(
+                        event.attempts,
+                        base=conf.get("EVENT_BACKOFF_BASE", 5),
+                        cap=conf.get("EVENT_BACKOFF_MAX", 3600),
+                    )
+                )
+                stats["retry"] += 1
+            # keyingi eventlar bu event qo'llanmaguncha kutadi
+            blocked.add(event.payment_id)
+            # savepoint rollback: Payment obyekti DB holatidan qaytadan olinadi
+            payments[event.payment_id].refresh_from_db()
+            continue
+        event.status = (
+            PaymentEvent.Status.PROCESSED if applied else PaymentEvent.Status.SKIPPED
+        )
+        event.processed_at = now
+        event.last_error = ""
+        stats[event.status] += 1
+
+    PaymentEvent.objects.bulk_update(
+        done, ["status", "attempts", "next_attempt_at", "last_error", "processed_at"]
+    )
+    return {k: v for k, v in stats.items() if v}
@@ -6,13 +6,17 @@ import logging
 from uuid import UUID
 
 from django.conf import settings
-from django.db import transaction
 from django.shortcuts import get_object_or_404
 from django.views.decorators.csrf import csrf_exempt
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import permissions, status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import (
+    api_view,
+    authentication_classes,
+    permission_classes,
+    throttle_classes,
+)
 from rest_framework.response import Response
 
 from apps.profiles.models import StudentProfile
@@ -42,10 +46,7 @@ def verify_click_request(payload: dict) -> bool:
     return calculated == provided
 
 
-from .services import (
-    mark_payment_failed as svc_mark_payment_failed,
-    mark_payment_paid_and_topup as svc_mark_payment_paid_and_topup,
-)
+from .services import CLICK_ACTIONS, record_click_event
 
 
 @extend_schema(
@@ -104,13 +105,18 @@ def create_topup(request):
         "Bu endpointni faqat Click server avtomatik chaqiradi.\n"
         "Frontend hech qachon bu yerga so‘rov yubormaydi.\n\n"
         "Vazifasi: Click’dan kelgan `prepare`, `complete`, `cancel` kabi signalni qabul qilish, "
-        "imzo (signature) va IP manzilini tekshirish, va to‘lov statusini yangilash."
+        "imzo (signature) va IP manzilini tekshirish va `PaymentEvent` inbox'ga yozish. "
+        "To‘lov statusi va balans `process_payment_events` worker'ida yangilanadi; "
+        "qayta kelgan event (`click_trans_id`, `action`) ikkinchi marta qo‘llanmaydi."
     ),
     request=OpenApiTypes.OBJECT,
     responses={200: OpenApiTypes.OBJECT},
 )
 @csrf_exempt
 @api_view(["POST"])
+@authentication_classes([])
+@throttle_classes([])
+@permission_classes([permissions.AllowAny])  # imzo va IP bilan tekshiriladi
 def click_webhook(request):
     allowed_ips = set(settings.CLICK.get("ALLOWED_IPS", []))
     remote_ip = request.META.get("REMOTE_ADDR", "")
@@ -135,75 +141,35 @@ def click_webhook(request):
             {"error": "Invalid transaction id"}, status=status.HTTP_400_BAD_REQUEST
         )
 
-    action = str(payload.get("action", "")).lower()
-    error = str(payload.get("error", "0"))
-    error_note = payload.get("error_note", "")
-
-    with transaction.atomic():
-        payment = get_object_or_404(Payment.objects.select_for_update(), id=payment_id)
-
-        if action in {"prepare", "check"}:
-            if payment.status in {
-                PaymentStatus.CREATED,
-                PaymentStatus.FAILED,
-                PaymentStatus.CANCELED,
-            }:
-                payment.status = PaymentStatus.PENDING
-                payment.provider_invoice_id = payload.get("invoice_id", "")
-                payment.provider_txn_id = payload.get("click_trans_id", "")
-                payment.provider_payload = payload
-                payment.error_code = error
-                payment.error_note = error_note
-                payment.save(
-                    update_fields=[
-                        "status",
-                        "provider_invoice_id",
-                        "provider_txn_id",
-                        "provider_payload",
-                        "error_code",
-                        "error_note",
-                        "updated_at",
-                    ]
-                )
-            return Response({"status": "pending", "payment_id": str(payment.id)})
-
-        if action in {"complete", "pay"}:
-            if error != "0":
-                svc_mark_payment_failed(
-                    payment, payload, error_code=error, error_note=error_note   # noqa
-                )  # noqa
-                return Response({"status": "failed", "payment_id": str(payment.id)})
-
-            try:
-                svc_mark_payment_paid_and_topup(payment, payload)
-            except Exception as exc:
-                log.exception("❌ Top-up failed for payment %s: %s", payment.id, exc)
-                svc_mark_payment_failed(payment, payload)  # noqa
-                return Response(
-                    {"error": "Top-up failed"},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                )
-
-            return Response({"status": "paid", "payment_id": str(payment.id)})
-
-        if action == "cancel":
-            payment.status = PaymentStatus.CANCELED
-            payment.provider_payload = payload
-            payment.error_code = error
-            payment.error_note = error_note or "Canceled by user/provider"
-            payment.save(
-                update_fields=[
-                    "status",
-                    "provider_payload",
-                    "error_code",
-                    "error_note",
-                    "updated_at",
-                ]
-            )
-            return Response({"status": "canceled", "payment_id": str(payment.id)})
-
+    action = CLICK_ACTIONS.get(str(payload.get("action", "")).lower())
+    if action is None:
         return Response({"error": "Unknown action"}, status=status.HTTP_400_BAD_REQUEST)
 
+    click_trans_id = str(payload.get("click_trans_id", "") or "")
+    if not click_trans_id:
+        return Response(
+            {"error": "Missing click_trans_id"}, status=status.HTTP_400_BAD_REQUEST
+        )
+
+    # Qulfsiz PK lookup; holat o'zgarishini `process_payment_events` qo'llaydi
+    if not Payment.objects.filter(id=payment_id).exists():
+        return Response({"error": "Payment not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    created = record_click_event(
+        payment_id=payment_id,
+        click_trans_id=click_trans_id,
+        action=action,
+        payload=payload.dict() if hasattr(payload, "dict") else dict(payload),
+    )
+    return Response(
+        {
+            "status": "accepted",
+            "payment_id": str(payment_id),
+            "action": action,
+            "duplicate": not created,
+        }
+    )
+
 
 @extend_schema(
     tags=["Payments"],
@@ -7,7 +7,9 @@ from django.contrib import admin, messages
 from django.db import transaction
 from django.utils.timezone import localtime
 
+from .ledger import top_up
 from .models import (
+    LedgerEntry,
     StudentProfile,
     TeacherProfile,
     StudentApprovalLog,
@@ -41,9 +43,25 @@ class StudentTopUpLogInline(admin.TabularInline):
         return False
 
 
+class LedgerEntryInline(admin.TabularInline):
+    model = LedgerEntry
+    extra = 0
+    can_delete = False
+    fields = ("created_at", "kind", "amount", "balance_after", "reference", "actor")
+    readonly_fields = fields
+    ordering = ("-created_at",)
+    show_change_link = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("actor")
+
+
 @admin.register(StudentProfile)
 class StudentProfileAdmin(admin.ModelAdmin):
-    inlines = [StudentApprovalLogInline, StudentTopUpLogInline]
+    inlines = [StudentApprovalLogInline, StudentTopUpLogInline, LedgerEntryInline]
 
     list_display = (
         "id",
@@ -65,7 +83,8 @@ class StudentProfileAdmin(admin.ModelAdmin):
     ordering = ("-created_at",)
     date_hierarchy = "created_at"
 
-    readonly_fields = ("created_at", "updated_at", "type")
+    # balans faqat daftar orqali o'zgaradi (top-up action'lari)
+    readonly_fields = ("created_at", "updated_at", "type", "balance")
     fieldsets = (
         ("User", {"fields": ("user",)}),
         (
@@ -148,21 +167,14 @@ class StudentProfileAdmin(admin.ModelAdmin):
         )
 
     def _bulk_topup(self, request, queryset, amount: Decimal):
-        updated = 0
-        with transaction.atomic():
-            for sp in queryset.select_for_update():
-                old = sp.balance
-                new_balance = (old + amount).quantize(Decimal("0.01"))
-                sp.balance = new_balance
-                sp.save(update_fields=["balance", "updated_at"])
-                StudentTopUpLog.objects.create(
-                    student=sp,
-                    amount=amount,
-                    new_balance=new_balance,
-                    actor=request.user,
-                    note=f"Admin bulk topup +{amount}",
-                )
-                updated += 1
+        # bitta UPDATE ... RETURNING + daftar yozuvlari + log'lar
+        entries = top_up(
+            student_ids=queryset.values_list("id", flat=True),
+            amount=amount,
+            actor=request.user,
+            note=f"Admin bulk topup +{amount}",
+        )
+        updated = len(entries)
         self.message_user(
             request,
             f"Topped up {updated} student(s) by {amount} UZS.",
@@ -305,6 +317,7 @@ class StudentTopUpLogAdmin(admin.ModelAdmin):
         "new_balance",
         "actor",
         "note",
+        "ledger_entry",
         "created_at",
         "updated_at",
     )
@@ -0,0 +1,268 @@
+# apps/profiles/dashboard.py
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connection
+from rest_framework import serializers
+
+from apps.user_tests.catalogue import (
+    catalogue_items,
+    catalogue_version,
+    with_purchased,
+)
+from apps.user_tests.models import UserTest, TestResult
+from .models import StudentProfile
+
+__all__ = (
+    "build_student_dashboard",
+    "get_student_dashboard",
+    "invalidate_student_dashboard",
+)
+
+# DRF formatlari bilan bir xil chiqish uchun field'larning o'zidan foydalanamiz
+_DT = serializers.DateTimeField()
+_MONEY = serializers.DecimalField(max_digits=12, decimal_places=2)
+
+_POOL: Optional[ThreadPoolExecutor] = None
+
+
+def _conf(key: str, default):
+    return getattr(settings, "DASHBOARD", {}).get(key, default)
+
+
+def _dt(value):
+    return None if value is None else _DT.to_representation(value)
+
+
+def _money(value):
+    return _MONEY.to_representation(value or 0)
+
+
+def _float(value):
+    return None if value is None else float(value)
+
+
+# --- Bo'limlar (har biri bitta `.values()` so'rovi) ---
+
+
+def _profile(user_id) -> Optional[Dict[str, Any]]:
+    row = (
+        StudentProfile.objects.filter(user_id=user_id)
+        .values(
+            "id",
+            "balance",
+            "type",
+            "is_approved",
+            "created_at",
+            "updated_at",
+            "user__id",
+            "user__fullname",
+            "user__telegram_username",
+            "user__phone_number",
+            "user__role",
+            "user__last_activity",
+        )
+        .first()
+    )
+    if row is None:
+        return None
+    return {
+        "id": str(row["id"]),
+        "user": {
+            "id": str(row["user__id"]),
+            "fullname": row["user__fullname"],
+            "telegram_username": row["user__telegram_username"],
+            "phone_number": row["user__phone_number"],
+            "role": row["user__role"],
+            "last_activity": _dt(row["user__last_activity"]),
+        },
+        "balance": _money(row["balance"]),
+        "type": row["type"],
+        "is_approved": row["is_approved"],
+        "is_offline": row["type"] == StudentProfile.TYPE_OFFLINE,
+        "created_at": _dt(row["created_at"]),
+        "updated_at": _dt(row["updated_at"]),
+    }
+
+
+def _all_tests(user_id, limit: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": str(t["id"]),
+            "title": t["title"],
+            "price": _money(t["price"]),
+            "purchased": t["purchased"],
+        }
+        for t in with_purchased(catalogue_items(limit), user_id)
+    ]
+
+
+def _my_tests(user_id, limit: int) -> List[Dict[str, Any]]:
+    qs = (
+        UserTest.objects.filter(user_id=user_id)
+        .order_by("-created_at")
+        .values(
+            "id",
+            "status",
+            "started_at",
+            "completed_at",
+            "price_paid",
+            "test_id",
+            "test__title",
+            "test__price",
+        )
+    )
+    return [
+        {
+            "id": str(ut["id"]),
+            "status": ut["status"],
+            "started_at": _dt(ut["started_at"]),
+            "completed_at": _dt(ut["completed_at"]),
+            "price_paid": _money(ut["price_paid"]),
+            "test": {
+                "id": str(ut["test_id"]),
+                "title": ut["test__title"],
+                "price": _money(ut["test__price"]),
+                "purchased": True,
+            },
+        }
+        for ut in (qs[:limit] if limit > 0 else qs)
+    ]
+
+
+def _results(user_id, limit: int) -> List[Dict[str, Any]]:
+    qs = (
+        TestResult.objects.filter(user_test__user_id=user_id)
+        .order_by("-created_at")
+        .values(
+            "user_test_id",
+            "user_test__test_id",
+            "user_test__test__title",
+            "listening_score",
+            "reading_score",
+            "writing_score",
+            "overall_score",
+            "created_at",
+        )
+    )
+    return [
+        {
+            "user_test_id": str(tr["user_test_id"]),
+            "test_id": str(tr["user_test__test_id"]),
+            "test_title": tr["user_test__test__title"],
+            "listening_score": _float(tr["listening_score"]),
+            "reading_score": _float(tr["reading_score"]),
+            "writing_score": _float(tr["writing_score"]),
+            "overall_score": _float(tr["overall_score"]),
+            "created_at": _dt(tr["created_at"]),
+        }
+        for tr in (qs[:limit] if limit > 0 else qs)
+    ]
+
+
+# --- Yig'ish ---
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _POOL
+    if _POOL is None:
+        _POOL = ThreadPoolExecutor(
+            max_workers=_conf("WORKERS", 4), thread_name_prefix="dashboard"
+        )
+    return _POOL
+
+
+def _persistent_connections() -> bool:
+    # CONN_MAX_AGE=0 da har bir thread har safar yangi ulanish ochadi —
+    # parallellik foydasidan qimmatga tushadi
+    db = connection.settings_dict
+    return db.get("CONN_MAX_AGE") != 0 or bool(db.get("OPTIONS", {}).get("pool"))
+
+
+def _concurrent() -> bool:
+    return (
+        _conf("CONCURRENT", False)
+        and _persistent_connections()
+        and not connection.in_atomic_block
+    )
+
+
+def _in_thread(fn: Callable, *args):
+    # Har bir thread o'z DB ulanishida ishlaydi; eskirganini yopamiz
+    close_old_connections()
+    try:
+        return fn(*args)
+    finally:
+        close_old_connections()
+
+
+def build_student_dashboard(
+    user_id, *, all_limit: int = 0, my_limit: int = 0, res_limit: int = 0
+) -> Optional[Dict[str, Any]]:
+    """
+    Student dashboard javobini yig'adi (`all_tests` katalog keshidan).
+    Default — request thread'ida ketma-ket. `CONCURRENT` yoqilgan va
+    ulanishlar doimiy (`CONN_MAX_AGE` yoki pool) bo'lsa profil, my_tests va
+    results parallel thread'larda olinadi; tranzaksiya ichida har doim
+    ketma-ket — boshqa ulanish commit qilinmagan ma'lumotni ko'rmaydi.
+    """
+    jobs = {
+        "profile": (_profile, user_id),
+        "my_tests": (_my_tests, user_id, my_limit),
+        "results": (_results, user_id, res_limit),
+    }
+    if _concurrent():
+        futures = {name: _pool().submit(_in_thread, *job) for name, job in jobs.items()}
+        all_tests = _all_tests(user_id, all_limit)
+        parts = {name: f.result() for name, f in futures.items()}
+    else:
+        all_tests = _all_tests(user_id, all_limit)
+        parts = {name: fn(*args) for name, (fn, *args) in jobs.items()}
+
+    if parts["profile"] is None:
+        return None
+    return {
+        "profile": parts["profile"],
+        "sections": {
+            "all_tests": all_tests,
+            "my_tests": parts["my_tests"],
+            "results": parts["results"],
+        },
+    }
+
+
+def _generation_key(user_id) -> str:
+    return f"profiles:dashboard:gen:{user_id}"
+
+
+def invalidate_student_dashboard(user_id) -> None:
+    try:
+        cache.incr(_generation_key(user_id))
+    except ValueError:
+        cache.set(_generation_key(user_id), 1, timeout=None)
+
+
+def get_student_dashboard(
+    user_id, *, all_limit: int = 0, my_limit: int = 0, res_limit: int = 0
+) -> Optional[Dict[str, Any]]:
+    """Qisqa TTL bilan per-user kesh; o'zgarishlarda signal orqali tozalanadi."""
+    key = "profiles:dashboard:%s:g%s:c%s:%d:%d:%d" % (
+        user_id,
+        cache.get(_generation_key(user_id), 0),
+        catalogue_version(),
+        all_limit,
+        my_limit,
+        res_limit,
+    )
+    data = cache.get(key)
+    if data is None:
+        data = build_student_dashboard(
+            user_id, all_limit=all_limit, my_limit=my_limit, res_limit=res_limit
+        )
+        if data is not None:
+            cache.set(key, data, timeout=_conf("CACHE_TTL", 30))
+    return data
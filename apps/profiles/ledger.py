@@ -0,0 +1,274 @@
+# apps/profiles/ledger.py
+"""
+Yagona pul yo'li: balans o'zgarishi va daftar yozuvi bitta statement'da.
+
+    WITH upd AS (UPDATE student_profiles ... WHERE balance + amount >= 0
+                 RETURNING balance)
+    INSERT INTO ledger_entries ... SELECT ... FROM upd
+
+Qator qulfi faqat shu statement davomida (va tashqi tranzaksiya oxirigacha)
+ushlanadi; Python'da read-modify-write yo'q, parallel xaridlar manfiy
+balansga olib kelmaydi.
+"""
+from __future__ import annotations
+
+import uuid
+from decimal import Decimal
+from typing import Iterable, List, Optional
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .dashboard import invalidate_student_dashboard
+from .models import LedgerEntry, StudentTopUpLog
+
+__all__ = (
+    "InsufficientFunds",
+    "post_entry",
+    "post_entries",
+    "top_up",
+    "reconcile_balances",
+)
+
+
+class InsufficientFunds(ValueError):
+    pass
+
+
+_POST_SQL = """
+WITH upd AS (
+    UPDATE student_profiles
+    SET balance = balance + %(amount)s, updated_at = %(now)s
+    WHERE id = ANY(%(students)s::uuid[]) AND balance + %(amount)s >= 0
+    RETURNING id, user_id, balance
+), ins AS (
+    INSERT INTO ledger_entries (
+        id, student_id, kind, amount, balance_after, reference, actor_id,
+        note, created_at
+    )
+    SELECT gen_random_uuid(), upd.id, %(kind)s, %(amount)s, upd.balance,
+           %(reference)s, %(actor)s, %(note)s, %(now)s
+    FROM upd
+    RETURNING id, student_id, balance_after
+)
+SELECT ins.id, ins.student_id, ins.balance_after, upd.user_id
+FROM ins JOIN upd ON upd.id = ins.student_id
+"""
+
+
+def _invalidate(user_ids) -> None:
+    # raw SQL StudentProfile signal'ini yubormaydi
+    owners = set(user_ids)
+
+    def invalidate():
+        for owner in owners:
+            invalidate_student_dashboard(owner)
+
+    transaction.on_commit(invalidate)
+
+
+def _post(
+    student_ids: List,
+    amount: Decimal,
+    kind: str,
+    *,
+    reference: str,
+    actor_id,
+    note: str,
+) -> List[LedgerEntry]:
+    now = timezone.now()
+    with connection.cursor() as cur:
+        cur.execute(
+            _POST_SQL,
+            {
+                "students": [str(s) for s in student_ids],
+                "amount": amount,
+                "kind": kind,
+                "reference": reference,
+                "actor": actor_id,
+                "note": note[:255],
+                "now": now,
+            },
+        )
+        rows = cur.fetchall()
+    _invalidate(row[3] for row in rows)
+    return [
+        LedgerEntry(
+            id=entry_id,
+            student_id=student_id,
+            kind=kind,
+            amount=amount,
+            balance_after=balance_after,
+            reference=reference,
+            actor_id=actor_id,
+            note=note[:255],
+            created_at=now,
+        )
+        for entry_id, student_id, balance_after, _ in rows
+    ]
+
+
+# bitta statement o'zi atomar — tashqi tranzaksiyada savepoint shart emas
+@transaction.atomic(savepoint=False)
+def post_entry(
+    *,
+    student_id,
+    amount: Decimal,
+    kind: str,
+    reference: str = "",
+    actor=None,
+    note: str = "",
+) -> LedgerEntry:
+    """
+    Balansni `amount`ga o'zgartiradi (kirim musbat, chiqim manfiy) va
+    daftarga yozadi — bitta round trip. Mablag' yetmasa `InsufficientFunds`.
+    `(kind, reference)` takrorlansa IntegrityError (statement to'liq bekor).
+    """
+    entries = _post(
+        [student_id],
+        Decimal(amount),
+        kind,
+        reference=reference,
+        actor_id=getattr(actor, "pk", actor),
+        note=note,
+    )
+    if not entries:
+        raise InsufficientFunds("Hisobingizda mablag' yetarli emas.")
+    return entries[0]
+
+
+@transaction.atomic
+def post_entries(
+    *,
+    student_ids: Iterable,
+    amount: Decimal,
+    kind: str,
+    actor=None,
+    note: str = "",
+) -> List[LedgerEntry]:
+    """Bir nechta student uchun bir xil yozuv (masalan admin bulk top-up)."""
+    ids = sorted({str(s) for s in student_ids})
+    if not ids:
+        return []
+    return _post(
+        ids,
+        Decimal(amount),
+        kind,
+        reference="",
+        actor_id=getattr(actor, "pk", actor),
+        note=note,
+    )
+
+
+def _topup_logs(entries: List[LedgerEntry]) -> None:
+    StudentTopUpLog.objects.bulk_create(
+        [
+            StudentTopUpLog(
+                student_id=e.student_id,
+                amount=e.amount,
+                new_balance=e.balance_after,
+                actor_id=e.actor_id,
+                note=e.note,
+                ledger_entry_id=e.id,
+            )
+            for e in entries
+        ]
+    )
+
+
+@transaction.atomic
+def top_up(
+    *,
+    student_ids: Iterable,
+    amount: Decimal,
+    reference: str = "",
+    actor=None,
+    note: str = "",
+) -> List[LedgerEntry]:
+    """Kirim: daftar yozuvi + undan olingan `StudentTopUpLog`."""
+    ids = list(student_ids)
+    if reference:
+        if len(ids) != 1:
+            raise ValueError("reference faqat bitta student uchun")
+        entries = [
+            post_entry(
+                student_id=ids[0],
+                amount=amount,
+                kind=LedgerEntry.Kind.TOPUP,
+                reference=reference,
+                actor=actor,
+                note=note,
+            )
+        ]
+    else:
+        entries = post_entries(
+            student_ids=ids,
+            amount=amount,
+            kind=LedgerEntry.Kind.TOPUP,
+            actor=actor,
+            note=note,
+        )
+    _topup_logs(entries)
+    return entries
+
+
+# --- Reconciliation ---
+
+_SCAN_SQL = """
+SELECT sp.id, sp.balance, COALESCE(SUM(le.amount), 0)
+FROM (
+    SELECT id, balance FROM student_profiles
+    WHERE %(after)s::uuid IS NULL OR id > %(after)s::uuid
+    ORDER BY id
+    LIMIT %(limit)s
+) sp
+LEFT JOIN ledger_entries le ON le.student_id = sp.id
+GROUP BY sp.id, sp.balance
+ORDER BY sp.id
+"""
+
+_FIX_SQL = """
+UPDATE student_profiles sp
+SET balance = COALESCE(s.total, 0), updated_at = %(now)s
+FROM (
+    SELECT p.id, (SELECT SUM(amount) FROM ledger_entries WHERE student_id = p.id) AS total
+    FROM student_profiles p
+    WHERE p.id = ANY(%(ids)s::uuid[])
+) s
+WHERE sp.id = s.id AND sp.balance <> COALESCE(s.total, 0)
+RETURNING sp.id, sp.user_id, sp.balance
+"""
+
+
+def reconcile_balances(*, chunk_size: int = 1000, fix: bool = True):
+    """
+    Balanslarni daftar yig'indisi bilan `chunk_size`lik bo'laklarda
+    solishtiradi (keyset, har bo'lak bitta guruhlangan so'rov). `fix` bo'lsa
+    farq qilganlari qulflanib, daftardan qayta hisoblanadi. Yield:
+    `(student_id, balance, ledger_total)`.
+    """
+    after: Optional[uuid.UUID] = None
+    while True:
+        with connection.cursor() as cur:
+            cur.execute(_SCAN_SQL, {"after": after, "limit": chunk_size})
+            rows = cur.fetchall()
+        if not rows:
+            return
+        after = rows[-1][0]
+        drift = [row for row in rows if row[1] != row[2]]
+        if drift and fix:
+            with transaction.atomic():
+                ids = [str(row[0]) for row in drift]
+                with connection.cursor() as cur:
+                    # qulf: post_entry yozuvi va balansi bitta statement'da,
+                    # shuning uchun qulfdan keyingi SUM izchil
+                    cur.execute(
+                        "SELECT id FROM student_profiles WHERE id = ANY(%s::uuid[]) "
+                        "ORDER BY id FOR UPDATE",
+                        [ids],
+                    )
+                    cur.execute(_FIX_SQL, {"ids": ids, "now": timezone.now()})
+                    _invalidate(row[1] for row in cur.fetchall())
+        yield from drift
+        if len(rows) < chunk_size:
+            return
@@ -0,0 +1,24 @@
+# apps/profiles/management/commands/reconcile_ledger.py
+from django.core.management.base import BaseCommand
+
+from apps.profiles.ledger import reconcile_balances
+
+
+class Command(BaseCommand):
+    help = "Student balanslarini daftar (ledger_entries) yig'indisi bilan solishtirib tuzatadi."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Faqat farqlarni ko'rsatish"
+        )
+
+    def handle(self, *args, **opts):
+        drift = 0
+        for student_id, balance, total in reconcile_balances(
+            chunk_size=opts["chunk_size"], fix=not opts["dry_run"]
+        ):
+            self.stdout.write(f"{student_id}: {balance} -> {total}")
+            drift += 1
+        verb = "topildi" if opts["dry_run"] else "tuzatildi"
+        self.stdout.write(self.style.SUCCESS(f"{drift} ta balans {verb}."))
@@ -0,0 +1,108 @@
+# Generated by Django 5.2.6 on 2026-10-16 23:20
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+# Mavjud balanslar daftarga bitta "opening" yozuvi bilan o'tkaziladi
+OPENING_SQL = """
+INSERT INTO ledger_entries (
+    id, student_id, kind, amount, balance_after, reference, note, created_at
+)
+SELECT gen_random_uuid(), id, 'opening', balance, balance, '',
+       'Opening balance', NOW()
+FROM student_profiles
+WHERE balance <> 0
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0002_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LedgerEntry",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("opening", "Opening balance"),
+                            ("topup", "Top-up"),
+                            ("purchase", "Test purchase"),
+                            ("speaking", "Speaking fee"),
+                            ("adjustment", "Adjustment"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("amount", models.DecimalField(decimal_places=2, max_digits=12)),
+                ("balance_after", models.DecimalField(decimal_places=2, max_digits=12)),
+                ("reference", models.CharField(blank=True, default="", max_length=64)),
+                ("note", models.CharField(blank=True, default="", max_length=255)),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    "actor",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="ledger_actions",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "student",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ledger_entries",
+                        to="profiles.studentprofile",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "ledger_entries",
+            },
+        ),
+        migrations.AddField(
+            model_name="studenttopuplog",
+            name="ledger_entry",
+            field=models.OneToOneField(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="topup_log",
+                to="profiles.ledgerentry",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ledgerentry",
+            index=models.Index(
+                fields=["student", "created_at"], name="ledger_student_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="ledgerentry",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("reference", ""), _negated=True),
+                fields=("kind", "reference"),
+                name="uniq_ledger_reference",
+            ),
+        ),
+        migrations.RunSQL(OPENING_SQL, migrations.RunSQL.noop),
+    ]
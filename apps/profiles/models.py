@@ -1,4 +1,5 @@
 # apps/profiles/models.py
+import uuid
 from decimal import Decimal
 
 from django.conf import settings
@@ -6,6 +7,7 @@ from django.conf import settings
 from django.core.validators import MinValueValidator
 from django.db import models
 from django.db.models import Q
+from django.utils import timezone
 
 from apps.users.models import User, UUIDPrimaryKeyMixin, TimeStampedMixin
 
@@ -114,6 +116,13 @@ class StudentTopUpLog(UUIDPrimaryKeyMixin, TimeStampedMixin):
         related_name="student_topup_actions",
     )
     note = models.CharField(max_length=255, blank=True, default="")
+    ledger_entry = models.OneToOneField(
+        "LedgerEntry",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="topup_log",
+    )
 
     class Meta:
         db_table = "student_topup_logs"
@@ -124,3 +133,55 @@ class StudentTopUpLog(UUIDPrimaryKeyMixin, TimeStampedMixin):
     def __str__(self) -> str:
         who = self.actor.fullname if self.actor else "system"
         return f"TopUpLog<{self.student_id}> +{self.amount} by {who}, new={self.new_balance}"  # type: ignore[attr-defined]
+
+
+class LedgerEntry(models.Model):
+    """
+    Balans daftari (append-only): `StudentProfile.balance` — shu student
+    yozuvlari `amount` yig'indisi. Har bir yozuv balans o'zgarishi bilan
+    bitta SQL statement'da yoziladi (`ledger.post_entry`). `kind` —
+    qarama-qarshi hisob: pul qayerdan kelgan yoki qayerga ketgan.
+    """
+
+    class Kind(models.TextChoices):
+        OPENING = "opening", "Opening balance"
+        TOPUP = "topup", "Top-up"
+        PURCHASE = "purchase", "Test purchase"
+        SPEAKING = "speaking", "Speaking fee"
+        ADJUSTMENT = "adjustment", "Adjustment"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    student = models.ForeignKey(
+        StudentProfile, on_delete=models.CASCADE, related_name="ledger_entries"
+    )
+    kind = models.CharField(max_length=20, choices=Kind.choices)  # type: ignore[attr-defined]
+    # kirim musbat, chiqim manfiy
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    balance_after = models.DecimalField(max_digits=12, decimal_places=2)
+    # idempotentlik: masalan "payment:<id>", "user_test:<id>"
+    reference = models.CharField(max_length=64, blank=True, default="")
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="ledger_actions",
+    )
+    note = models.CharField(max_length=255, blank=True, default="")
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = "ledger_entries"
+        indexes = [
+            models.Index(fields=["student", "created_at"], name="ledger_student_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "reference"],
+                condition=~Q(reference=""),
+                name="uniq_ledger_reference",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"Ledger<{self.student_id}> {self.kind} {self.amount:+} = {self.balance_after}"  # type: ignore[attr-defined]
@@ -1,9 +1,11 @@
 # apps/profiles/signals.py
 from django.db import transaction
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
+from apps.user_tests.models import UserTest, TestResult
 from apps.users.models import User
+from .dashboard import invalidate_student_dashboard
 from .models import StudentProfile, TeacherProfile
 
 
@@ -16,3 +18,39 @@ def create_role_profile(sender, instance: User, created: bool, **kwargs):
             StudentProfile.objects.get_or_create(user=instance)
         elif instance.role == User.Roles.TEACHER:
             TeacherProfile.objects.get_or_create(user=instance)
+
+
+# --- Student dashboard keshini tozalash ---
+
+
+def _invalidate_on_commit(user_id):
+    if user_id:
+        transaction.on_commit(lambda: invalidate_student_dashboard(user_id))
+
+
+@receiver(post_save, sender=User)
+def user_changed(sender, instance: User, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= {"last_activity"}:
+        return  # TTL yetarli
+    _invalidate_on_commit(instance.pk)
+
+
+@receiver(post_save, sender=StudentProfile)
+def student_profile_changed(sender, instance: StudentProfile, **kwargs):
+    _invalidate_on_commit(instance.user_id)
+
+
+@receiver(post_save, sender=UserTest)
+@receiver(post_delete, sender=UserTest)
+def user_test_changed(sender, instance: UserTest, **kwargs):
+    _invalidate_on_commit(instance.user_id)
+
+
+@receiver(post_save, sender=TestResult)
+def test_result_changed(sender, instance: TestResult, **kwargs):
+    user_id = (
+        UserTest.objects.filter(pk=instance.user_test_id)
+        .values_list("user_id", flat=True)
+        .first()
+    )
+    _invalidate_on_commit(user_id)
@@ -5,7 +5,15 @@ from .models import SpeakingRequest
 
 @admin.register(SpeakingRequest)
 class SpeakingRequestAdmin(admin.ModelAdmin):
-    list_display = ("id", "student", "fee_amount", "currency", "status", "created_at")
+    list_display = (
+        "id",
+        "student",
+        "fee_amount",
+        "currency",
+        "status",
+        "admin_notified_at",
+        "created_at",
+    )
     list_filter = ("status", "created_at")
     search_fields = (
         "student__user__fullname",
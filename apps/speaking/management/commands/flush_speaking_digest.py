@@ -0,0 +1,33 @@
+# apps/speaking/management/commands/flush_speaking_digest.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.speaking.services import flush_admin_digest
+
+
+class Command(BaseCommand):
+    help = (
+        "Xabar qilinmagan speaking so'rovlarini bitta digest sifatida admin "
+        "chatiga (outbox orqali) yuboradi. `--force` — oyna kutilmaydi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true")
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Soniya; 0 bo'lsa bir marta ishlaydi.",
+        )
+
+    def handle(self, *args, **opts):
+        while True:
+            n = flush_admin_digest(force=opts["force"])
+            if n or not opts["interval"]:
+                self.stdout.write(
+                    self.style.SUCCESS(f"{n} ta so'rov digest'ga qo'shildi.")
+                )
+            if not opts["interval"]:
+                return
+            time.sleep(opts["interval"])
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-16 23:16
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def mark_existing(apps, schema_editor):
+    # Avvalgi so'rovlar yaratilganda darhol xabar qilingan
+    SpeakingRequest = apps.get_model("speaking", "SpeakingRequest")
+    SpeakingRequest.objects.update(admin_notified_at=F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0002_initial"),
+        ("speaking", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="speakingrequest",
+            name="admin_notified_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(mark_existing, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="speakingrequest",
+            index=models.Index(
+                condition=models.Q(("admin_notified_at__isnull", True)),
+                fields=["created_at"],
+                name="spreq_admin_pending_idx",
+            ),
+        ),
+    ]
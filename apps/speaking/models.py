@@ -21,11 +21,19 @@ class SpeakingRequest(UUIDPrimaryKeyMixin, TimeStampedMixin):
     currency = models.CharField(max_length=3, default="UZS")
     note = models.CharField(max_length=255, blank=True, default="")
 
+    # admin'ga Telegram xabari (alohida yoki digest ichida) yozilgan vaqt
+    admin_notified_at = models.DateTimeField(null=True, blank=True)
+
     class Meta:
         db_table = "speaking_requests"
         indexes = [
             models.Index(fields=["student", "status"], name="spreq_student_status_idx"),
             models.Index(fields=["created_at"], name="spreq_created_idx"),
+            models.Index(
+                fields=["created_at"],
+                condition=models.Q(admin_notified_at__isnull=True),
+                name="spreq_admin_pending_idx",
+            ),
         ]
 
     def __str__(self) -> str:
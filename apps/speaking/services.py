@@ -1,14 +1,26 @@
 # apps/speaking/services.py
+import uuid
+from datetime import timedelta
 from decimal import Decimal
+from html import escape
+from typing import Optional
+
 from django.conf import settings
 from django.db import transaction
-from django.db.models import F
+from django.db.models import Max, Min, Sum
+from django.urls import reverse
+from django.utils import timezone
 
-from apps.profiles.models import StudentProfile
-from apps.core.notifications import notify_telegram_admin_sync
+from apps.profiles.ledger import post_entry
+from apps.profiles.models import LedgerEntry, StudentProfile
+from apps.core.outbox import enqueue_admin_notification
 from .models import SpeakingRequest
 
 
+def _conf(key: str, default):
+    return settings.SPEAKING.get(key, default)
+
+
 @transaction.atomic
 def create_speaking_request(
     *, student: StudentProfile, note: str = ""
@@ -17,18 +29,27 @@ def create_speaking_request(
     if fee <= 0:
         raise ValueError("Speaking FEE misconfigured (SPEAKING.FEE <= 0)")
 
-    updated = StudentProfile.objects.filter(pk=student.pk, balance__gte=fee).update(
-        balance=F("balance") - fee
+    sr_id = uuid.uuid4()
+    # InsufficientFunds — ValueError, view uni 400 qiladi
+    post_entry(
+        student_id=student.pk,
+        amount=-fee,
+        kind=LedgerEntry.Kind.SPEAKING,
+        reference=f"speaking:{sr_id}",
     )
-    if updated == 0:
-        raise ValueError("Hisobingizda mablag' yetarli emas.")
 
+    # digest rejimida xabar `flush_admin_digest` bilan yuboriladi
+    digest = _conf("ADMIN_DIGEST", False)
     sr = SpeakingRequest.objects.create(
+        id=sr_id,
         student=student,
         fee_amount=fee,
         currency="UZS",
         note=note,
+        admin_notified_at=None if digest else timezone.now(),
     )
+    if digest:
+        return sr
 
     text = (
         "<b>Yangi Speaking so'rovi</b>\n"
@@ -38,9 +59,87 @@ def create_speaking_request(
         f"Fee: <b>{fee} UZS</b>\n"
         f"Request ID: <code>{sr.id}</code>"
     )
-    try:
-        notify_telegram_admin_sync(text)
-    except Exception: # noqa
-        pass
+    # outbox: shu tranzaksiyada yoziladi, dispatcher alohida yuboradi
+    enqueue_admin_notification(text)
 
     return sr
+
+
+def _admin_url(path: str) -> Optional[str]:
+    base = _conf("ADMIN_BASE_URL", "").rstrip("/")
+    return f"{base}{path}" if base else None
+
+
+def _digest_text(items, *, count: int, total: Decimal, since, until) -> str:
+    fmt = "%d.%m %H:%M"
+    lines = [
+        f"<b>Speaking so'rovlari: {count} ta</b>",
+        f"Jami: <b>{total} UZS</b>",
+        f"Davr: {timezone.localtime(since):{fmt}} – {timezone.localtime(until):{fmt}}",
+        "",
+    ]
+    for sr in items:
+        user = sr.student.user
+        line = (
+            f"• {escape((user.fullname or '-')[:40])} "
+            f"<code>{user.phone_number}</code> "
+            f"@{escape(user.telegram_username or '-')} — {sr.fee_amount} {sr.currency}"
+        )
+        url = _admin_url(reverse("admin:speaking_speakingrequest_change", args=[sr.pk]))
+        lines.append(f'{line} — <a href="{url}">ochish</a>' if url else line)
+    if count > len(items):
+        lines.append(f"… va yana {count - len(items)} ta")
+    url = _admin_url(reverse("admin:speaking_speakingrequest_changelist"))
+    if url:
+        lines.append(f'\n<a href="{url}">Barcha so\'rovlar</a>')
+    return "\n".join(lines)
+
+
+@transaction.atomic
+def flush_admin_digest(*, force: bool = False) -> int:
+    """
+    Xabar qilinmagan so'rovlarni bitta digest xabarga yig'ib outbox'ga
+    yozadi va `admin_notified_at`ni belgilaydi (bitta tranzaksiyada —
+    xabar ham, belgi ham birga commit bo'ladi). Eng eski so'rov
+    `DIGEST_WINDOW_MINUTES`dan kam kutgan bo'lsa (va `force` bo'lmasa)
+    hech narsa qilinmaydi. Parallel flush'lar SKIP LOCKED bilan
+    bir-birining qatorlarini olmaydi.
+    """
+    now = timezone.now()
+    pending = SpeakingRequest.objects.filter(admin_notified_at__isnull=True)
+    oldest = pending.order_by("created_at").values_list("created_at", flat=True).first()
+    if oldest is None:
+        return 0
+    window = timedelta(minutes=_conf("DIGEST_WINDOW_MINUTES", 10))
+    if not force and oldest > now - window:
+        return 0
+
+    ids = list(
+        pending.filter(created_at__lte=now)
+        .select_for_update(skip_locked=True)
+        .order_by("created_at")
+        .values_list("id", flat=True)
+    )
+    if not ids:
+        return 0
+
+    qs = SpeakingRequest.objects.filter(id__in=ids)
+    agg = qs.aggregate(
+        total=Sum("fee_amount"), since=Min("created_at"), until=Max("created_at")
+    )
+    items = list(
+        qs.select_related("student__user").order_by("created_at")[
+            : _conf("DIGEST_MAX_ITEMS", 20)
+        ]
+    )
+    enqueue_admin_notification(
+        _digest_text(
+            items,
+            count=len(ids),
+            total=agg["total"] or Decimal("0"),
+            since=agg["since"],
+            until=agg["until"],
+        )
+    )
+    qs.update(admin_notified_at=now)
+    return len(ids)
@@ -0,0 +1,161 @@
+# apps/teacher_checking/counters.py
+from __future__ import annotations
+
+import random
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, Q
+
+from .models import TeacherSubmission, SubmissionCounter
+
+__all__ = (
+    "record_transition",
+    "record_transitions",
+    "get_counts",
+    "counter_values",
+    "reconcile_counters",
+)
+
+Status = TeacherSubmission.Status
+
+# Teacher bo'yicha faqat shu statuslar sanaladi
+TEACHER_STATUSES = (Status.IN_CHECKING, Status.CHECKED)
+
+
+def _shards() -> int:
+    return max(1, getattr(settings, "TEACHER_CHECKING", {}).get("COUNTER_SHARDS", 1))
+
+
+def _bump(teacher_id, status: str, delta: int, shard: int = 0) -> None:
+    qs = SubmissionCounter.objects.filter(
+        teacher_id=teacher_id, status=status, shard=shard
+    )
+    if qs.update(value=F("value") + delta):
+        return
+    try:
+        with transaction.atomic():  # savepoint: parallel create bo'lishi mumkin
+            SubmissionCounter.objects.create(
+                teacher_id=teacher_id, status=status, shard=shard, value=delta
+            )
+    except IntegrityError:
+        qs.update(value=F("value") + delta)
+
+
+def _keys(status: Optional[str], teacher_id) -> Tuple[Tuple, ...]:
+    if status is None:
+        return ()
+    if teacher_id and status in TEACHER_STATUSES:
+        return (None, status), (teacher_id, status)
+    return ((None, status),)
+
+
+def _lock_order(item) -> Tuple[bool, str, str]:
+    (teacher_id, status), _ = item
+    return teacher_id is not None, str(teacher_id or ""), str(status)
+
+
+def record_transitions(items: Iterable[Tuple]) -> None:
+    """
+    `(old_status, old_teacher_id, new_status, new_teacher_id)` o'tishlari
+    bo'yicha counter'larni yangilaydi (bir nechta submission bitta
+    hisob-kitobda). Servis tranzaksiyasi ichida chaqiriladi.
+    """
+    delta: Counter = Counter()
+    for old_status, old_teacher_id, new_status, new_teacher_id in items:
+        for key in _keys(old_status, old_teacher_id):
+            delta[key] -= 1
+        for key in _keys(new_status, new_teacher_id):
+            delta[key] += 1
+    # deadlock bo'lmasligi uchun doim bir xil tartibda: avval global, keyin
+    # teacher qatorlari. Status enum ham, DB'dan kelgan str ham bo'lishi
+    # mumkin — repr emas, qiymat bo'yicha solishtiriladi.
+    # global qatorlar uchun bitta tasodifiy shard (butun chaqiruv uchun bir xil)
+    shard = random.randrange(_shards())
+    for (teacher_id, status), d in sorted(delta.items(), key=_lock_order):
+        if d:
+            _bump(teacher_id, status, d, shard if teacher_id is None else 0)
+
+
+def record_transition(
+    *,
+    old_status: Optional[str] = None,
+    old_teacher_id=None,
+    new_status: Optional[str] = None,
+    new_teacher_id=None,
+) -> None:
+    """Bitta submission uchun; `old_status=None` — yangi yozuv."""
+    record_transitions([(old_status, old_teacher_id, new_status, new_teacher_id)])
+
+
+def get_counts(teacher_id) -> Dict[str, int]:
+    """Teacher dashboard uchun: global `requested` + teacher'ning o'zi, 1 so'rov."""
+    rows = SubmissionCounter.objects.filter(
+        Q(teacher__isnull=True, status=Status.REQUESTED)
+        | Q(teacher_id=teacher_id, status__in=TEACHER_STATUSES)
+    ).values_list("status", "value")
+    counts = {s: 0 for s in Status.values}
+    for status, value in rows:  # global shard'lar yig'iladi
+        counts[status] += value
+    return counts
+
+
+def counter_values(submission_model) -> Dict[Tuple, int]:
+    """Haqiqiy sonlar: {(teacher_id, status): COUNT(*)}."""
+    values: Dict[Tuple, int] = {}
+    for row in submission_model.objects.values("status").annotate(n=Count("id")):
+        values[(None, row["status"])] = row["n"]
+    for row in (
+        submission_model.objects.filter(
+            teacher__isnull=False, status__in=TEACHER_STATUSES
+        )
+        .values("teacher_id", "status")
+        .annotate(n=Count("id"))
+    ):
+        values[(row["teacher_id"], row["status"])] = row["n"]
+    return values
+
+
+@transaction.atomic
+def reconcile_counters() -> Dict[Tuple, Tuple[int, int]]:
+    """
+    Counter'larni `COUNT(*)` bilan solishtirib tuzatadi.
+    Qaytaradi: {(teacher_id, status): (eski, yangi)} — faqat farq qilganlar.
+
+    Qator qulflari o'rniga jadval qulfi: `record_transitions` qatorlarni
+    boshqa tartibda qulflaydi, jadval qulfi esa faqat tugallanishini kutadi
+    (deadlock yo'q) va yangi yozuvchilarni shu tranzaksiya oxirigacha to'xtatadi.
+    """
+    with connection.cursor() as cur:
+        cur.execute(
+            f"LOCK TABLE {SubmissionCounter._meta.db_table} IN SHARE ROW EXCLUSIVE MODE"
+        )
+    current = defaultdict(list)
+    for c in SubmissionCounter.objects.order_by("shard"):
+        current[(c.teacher_id, c.status)].append(c)
+    actual = counter_values(TeacherSubmission)
+
+    fixed = {}
+    to_update, to_create = [], []
+    for key in set(current) | set(actual):
+        value = actual.get(key, 0)
+        counters = current.get(key, [])
+        total = sum(c.value for c in counters)
+        if total == value:
+            continue
+        fixed[key] = (total, value)
+        if not counters:
+            to_create.append(
+                SubmissionCounter(teacher_id=key[0], status=key[1], value=value)
+            )
+            continue
+        # butun qiymat birinchi shard'ga, qolganlari nolga
+        for i, counter in enumerate(counters):
+            counter.value = value if i == 0 else 0
+            to_update.append(counter)
+
+    SubmissionCounter.objects.bulk_update(to_update, ["value"])
+    SubmissionCounter.objects.bulk_create(to_create)
+    return fixed
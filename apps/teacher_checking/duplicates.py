@@ -0,0 +1,158 @@
+# apps/teacher_checking/duplicates.py
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+import numpy as np
+from django.conf import settings
+from django.db import connection, transaction
+
+from . import minhash
+from .models import TeacherSubmission, WritingSignature, WritingSignatureBand
+
+__all__ = (
+    "sign_submission",
+    "sign_submissions",
+    "flag_near_duplicates",
+)
+
+
+def _conf(key: str, default):
+    return getattr(settings, "TEACHER_CHECKING", {}).get(key, default)
+
+
+def _rows(subs: Iterable[TeacherSubmission]):
+    signatures, bands, ids = [], [], []
+    for sub in subs:
+        ids.append(sub.pk)
+        sig = minhash.signature(sub.submitted_text)
+        if sig is None:
+            continue
+        signatures.append(
+            WritingSignature(submission_id=sub.pk, signature=minhash.to_bytes(sig))
+        )
+        bands.extend(
+            WritingSignatureBand(submission_id=sub.pk, band=band, bucket=bucket)
+            for band, bucket in minhash.band_buckets(sig)
+        )
+    return ids, signatures, bands
+
+
+@transaction.atomic
+def sign_submissions(subs: Iterable[TeacherSubmission]) -> int:
+    """Signature va LSH band'larini (qayta) yozadi; eski qatorlar almashtiriladi."""
+    ids, signatures, bands = _rows(subs)
+    if not ids:
+        return 0
+    WritingSignatureBand.objects.filter(submission_id__in=ids).delete()
+    WritingSignature.objects.filter(submission_id__in=ids).delete()
+    WritingSignature.objects.bulk_create(signatures, batch_size=1000)
+    WritingSignatureBand.objects.bulk_create(bands, batch_size=1000)
+    return len(signatures)
+
+
+def sign_submission(sub: TeacherSubmission) -> None:
+    sign_submissions([sub])
+
+
+# Berilgan submission'lar bilan kamida bitta band'da to'qnashgan,
+# ulardan oldin topshirilgan submission'lar — (band, bucket) indeksi orqali.
+# `bucket_max`dan ko'p a'zoli bucket'lar (shablon matnlar) o'tkazib
+# yuboriladi: a'zolar `LIMIT bucket_max + 1` bilan sanaladi, fan-out chegaralangan.
+_CANDIDATES_SQL = """
+WITH src AS (
+    SELECT b.submission_id, b.band, b.bucket
+    FROM teacher_writing_signature_bands b
+    WHERE b.submission_id = ANY(%(ids)s::uuid[])
+      AND (
+          SELECT COUNT(*) FROM (
+              SELECT 1 FROM teacher_writing_signature_bands x
+              WHERE x.band = b.band AND x.bucket = b.bucket
+              LIMIT %(bucket_max)s + 1
+          ) members
+      ) <= %(bucket_max)s
+)
+SELECT DISTINCT src.submission_id, o.submission_id
+FROM src
+JOIN teacher_writing_signature_bands o
+  ON o.band = src.band AND o.bucket = src.bucket
+ AND o.submission_id <> src.submission_id
+JOIN teacher_submissions s ON s.id = src.submission_id
+JOIN teacher_submissions os ON os.id = o.submission_id
+WHERE os.submitted_at < s.submitted_at
+  AND os.user_test_id <> s.user_test_id
+"""
+
+
+def flag_near_duplicates(submission_ids: Iterable) -> Dict[str, List[dict]]:
+    """
+    Har bir submission uchun oldingi o'xshash matnlarni topib
+    `near_duplicates`ga yozadi. Nomzodlar LSH band'lari bo'yicha bitta
+    indeksli so'rov bilan olinadi (matnlar o'zaro solishtirilmaydi),
+    o'xshashlik esa signature'lar ustida vektorlashtirilgan holda
+    hisoblanadi. `NEAR_DUPLICATE_THRESHOLD`dan past nomzodlar tashlanadi,
+    eng o'xshash `NEAR_DUPLICATE_LIMIT` tasi qoladi;
+    `NEAR_DUPLICATE_BUCKET_MAX`dan katta bucket'lar nomzod bermaydi.
+    """
+    ids = sorted({str(i) for i in submission_ids})
+    if not ids:
+        return {}
+
+    with connection.cursor() as cur:
+        cur.execute(
+            _CANDIDATES_SQL,
+            {"ids": ids, "bucket_max": _conf("NEAR_DUPLICATE_BUCKET_MAX", 200)},
+        )
+        pairs = cur.fetchall()
+
+    candidates = defaultdict(list)
+    for src, other in pairs:
+        candidates[str(src)].append(str(other))
+
+    found: Dict[str, List[dict]] = {i: [] for i in ids}
+    if candidates:
+        others = {o for lst in candidates.values() for o in lst}
+        sigs = {
+            str(pk): minhash.from_bytes(raw)
+            for pk, raw in WritingSignature.objects.filter(
+                submission_id__in=set(candidates) | others
+            ).values_list("submission_id", "signature")
+        }
+        meta = {
+            str(row["id"]): row
+            for row in TeacherSubmission.objects.filter(id__in=others).values(
+                "id", "user_test__user__fullname", "status", "score"
+            )
+        }
+        threshold = _conf("NEAR_DUPLICATE_THRESHOLD", 0.8)
+        limit = _conf("NEAR_DUPLICATE_LIMIT", 5)
+
+        for src, lst in candidates.items():
+            if src not in sigs:
+                continue
+            lst = [o for o in lst if o in sigs and o in meta]
+            if not lst:
+                continue
+            scores = minhash.similarity(sigs[src], np.stack([sigs[o] for o in lst]))
+            order = np.argsort(-scores, kind="stable")[:limit]
+            found[src] = [
+                {
+                    "id": lst[i],
+                    "student_fullname": meta[lst[i]]["user_test__user__fullname"],
+                    "similarity": round(float(scores[i]), 3),
+                    "status": meta[lst[i]]["status"],
+                    "score": meta[lst[i]]["score"],
+                }
+                for i in order
+                if scores[i] >= threshold
+            ]
+
+    TeacherSubmission.objects.bulk_update(
+        [
+            TeacherSubmission(pk=pk, near_duplicates=items)
+            for pk, items in found.items()
+        ],
+        ["near_duplicates"],
+    )
+    return found
@@ -0,0 +1,29 @@
+# apps/teacher_checking/management/commands/backfill_writing_stats.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.teacher_checking.models import TeacherSubmission
+from apps.teacher_checking.stats import STATS_FIELDS, writing_stats
+
+
+class Command(BaseCommand):
+    help = "Mavjud submission'lar uchun essay statistikasini qayta hisoblaydi."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **opts):
+        qs = TeacherSubmission.objects.only("id", "submitted_text").order_by("id")
+        size, last, total = opts["batch_size"], None, 0
+        while True:
+            batch = list((qs.filter(id__gt=last) if last else qs)[:size])
+            if not batch:
+                break
+            for sub in batch:
+                for field, value in writing_stats(sub.submitted_text).items():
+                    setattr(sub, field, value)
+            with transaction.atomic():
+                TeacherSubmission.objects.bulk_update(batch, STATS_FIELDS)
+            total += len(batch)
+            last = batch[-1].pk
+        self.stdout.write(self.style.SUCCESS(f"{total} ta submission yangilandi."))
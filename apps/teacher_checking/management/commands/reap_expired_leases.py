@@ -0,0 +1,39 @@
+# apps/teacher_checking/management/commands/reap_expired_leases.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.teacher_checking.services import reap_expired_leases
+
+
+class Command(BaseCommand):
+    help = (
+        "Lease'i o'tgan IN_CHECKING submission'larni REQUESTED'ga qaytaradi. "
+        "Cron orqali yoki `--interval` bilan doimiy ishlatiladi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Soniya; 0 bo'lsa bir marta ishlaydi.",
+        )
+
+    def handle(self, *args, **opts):
+        size = max(1, opts["batch_size"])
+        while True:
+            total = 0
+            while True:
+                n = reap_expired_leases(limit=size)
+                total += n
+                if n < size:
+                    break
+            if total or not opts["interval"]:
+                self.stdout.write(
+                    self.style.SUCCESS(f"{total} ta submission pool'ga qaytarildi.")
+                )
+            if not opts["interval"]:
+                return
+            time.sleep(opts["interval"])
@@ -0,0 +1,14 @@
+# apps/teacher_checking/management/commands/reconcile_submission_counters.py
+from django.core.management.base import BaseCommand
+
+from apps.teacher_checking.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = "SubmissionCounter jadvalini haqiqiy COUNT(*) bilan solishtirib tuzatadi."
+
+    def handle(self, *args, **opts):
+        fixed = reconcile_counters()
+        for (teacher_id, status), (old, new) in sorted(fixed.items(), key=str):
+            self.stdout.write(f"{teacher_id or '*'} {status}: {old} -> {new}")
+        self.stdout.write(self.style.SUCCESS(f"{len(fixed)} ta counter tuzatildi."))
@@ -0,0 +1,28 @@
+# apps/teacher_checking/management/commands/sign_writing_submissions.py
+from django.core.management.base import BaseCommand
+
+from apps.teacher_checking.duplicates import sign_submissions
+from apps.teacher_checking.models import TeacherSubmission
+
+
+class Command(BaseCommand):
+    help = "Signature'i yo'q submission'lar uchun MinHash/LSH indeksini quradi."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--all", action="store_true", help="Barcha submission'larni qayta imzolash"
+        )
+
+    def handle(self, *args, **opts):
+        qs = TeacherSubmission.objects.only("id", "submitted_text").order_by("id")
+        if not opts["all"]:
+            qs = qs.filter(signature__isnull=True)
+        size, last, total = opts["batch_size"], None, 0
+        while True:
+            batch = list((qs.filter(id__gt=last) if last else qs)[:size])
+            if not batch:
+                break
+            total += sign_submissions(batch)
+            last = batch[-1].pk
+        self.stdout.write(self.style.SUCCESS(f"{total} ta signature yozildi."))
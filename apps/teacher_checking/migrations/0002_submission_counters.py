@@ -0,0 +1,91 @@
+# Generated by Django 5.2.6 on 2026-10-16 23:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_counters(apps, schema_editor):
+    # counters.counter_values nusxasi: migratsiya ilova kodiga bog'lanmasin
+    TeacherSubmission = apps.get_model("teacher_checking", "TeacherSubmission")
+    SubmissionCounter = apps.get_model("teacher_checking", "SubmissionCounter")
+    values = {}
+    for row in TeacherSubmission.objects.values("status").annotate(n=Count("id")):
+        values[(None, row["status"])] = row["n"]
+    for row in (
+        TeacherSubmission.objects.filter(
+            teacher__isnull=False, status__in=("in_checking", "checked")
+        )
+        .values("teacher_id", "status")
+        .annotate(n=Count("id"))
+    ):
+        values[(row["teacher_id"], row["status"])] = row["n"]
+    SubmissionCounter.objects.bulk_create(
+        SubmissionCounter(teacher_id=teacher_id, status=status, value=value)
+        for (teacher_id, status), value in values.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("teacher_checking", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SubmissionCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("requested", "Requested"),
+                            ("in_checking", "In checking"),
+                            ("checked", "Checked"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("value", models.IntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "teacher",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="submission_counters",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "teacher_submission_counters",
+                "constraints": [
+                    models.UniqueConstraint(
+                        condition=models.Q(("teacher__isnull", True)),
+                        fields=("status",),
+                        name="uniq_counter_global_status",
+                    ),
+                    models.UniqueConstraint(
+                        condition=models.Q(("teacher__isnull", False)),
+                        fields=("teacher", "status"),
+                        name="uniq_counter_teacher_status",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
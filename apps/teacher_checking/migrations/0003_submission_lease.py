@@ -0,0 +1,38 @@
+# Generated by Django 5.2.6 on 2026-10-16 23:03
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def lease_existing(apps, schema_editor):
+    # Hozir tekshirilayotganlar: lease oxirgi o'zgarishdan boshlab hisoblanadi
+    TeacherSubmission = apps.get_model("teacher_checking", "TeacherSubmission")
+    minutes = getattr(settings, "TEACHER_CHECKING", {}).get("LEASE_MINUTES", 30)
+    TeacherSubmission.objects.filter(status="in_checking").update(
+        claimed_at=F("updated_at"),
+        lease_expires_at=F("updated_at") + timedelta(minutes=minutes),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("teacher_checking", "0002_submission_counters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="teachersubmission",
+            name="claimed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="teachersubmission",
+            name="lease_expires_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(lease_existing, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-16 23:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("teacher_checking", "0003_submission_lease"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="teachersubmission",
+            index=models.Index(
+                fields=["status", "lease_expires_at"], name="ts_status_lease_idx"
+            ),
+        ),
+    ]
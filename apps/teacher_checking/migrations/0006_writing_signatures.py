@@ -0,0 +1,73 @@
+# Generated by Django 5.2.6 on 2026-10-16 23:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("teacher_checking", "0005_submission_search_vector"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WritingSignature",
+            fields=[
+                (
+                    "submission",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="signature",
+                        serialize=False,
+                        to="teacher_checking.teachersubmission",
+                    ),
+                ),
+                ("signature", models.BinaryField()),
+            ],
+            options={
+                "db_table": "teacher_writing_signatures",
+            },
+        ),
+        migrations.AddField(
+            model_name="teachersubmission",
+            name="near_duplicates",
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.CreateModel(
+            name="WritingSignatureBand",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("band", models.PositiveSmallIntegerField()),
+                ("bucket", models.BigIntegerField()),
+                (
+                    "submission",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="signature_bands",
+                        to="teacher_checking.teachersubmission",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "teacher_writing_signature_bands",
+                "indexes": [
+                    models.Index(fields=["band", "bucket"], name="tsb_band_bucket_idx")
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("submission", "band"), name="uniq_signature_band"
+                    )
+                ],
+            },
+        ),
+    ]
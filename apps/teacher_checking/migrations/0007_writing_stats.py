@@ -0,0 +1,38 @@
+# Generated by Django 5.2.6 on 2026-10-16 23:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("teacher_checking", "0006_writing_signatures"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="teachersubmission",
+            name="avg_sentence_length",
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name="teachersubmission",
+            name="paragraph_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="teachersubmission",
+            name="sentence_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="teachersubmission",
+            name="type_token_ratio",
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name="teachersubmission",
+            name="word_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.6 on 2026-10-16 23:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("teacher_checking", "0007_writing_stats"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="submissioncounter",
+            name="uniq_counter_global_status",
+        ),
+        migrations.AddField(
+            model_name="submissioncounter",
+            name="shard",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddConstraint(
+            model_name="submissioncounter",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("teacher__isnull", True)),
+                fields=("status", "shard"),
+                name="uniq_counter_global_status_shard",
+            ),
+        ),
+    ]
@@ -0,0 +1,84 @@
+# apps/teacher_checking/minhash.py
+"""
+Essay'lar uchun MinHash / LSH.
+
+Matn so'zlarining 3-gram shingle'lari -> 128 ta MinHash qiymati (uint32).
+Signature 16 band x 8 qatorga bo'linadi; har bir band hash'i indeks
+jadvaliga yoziladi. Jaccard o'xshashligi ~0.7 dan yuqori bo'lgan
+matnlar kamida bitta band'da to'qnashadi, shuning uchun nomzodlar
+`(band, bucket)` bo'yicha indeksli qidiruv bilan topiladi — barcha
+matnlarni o'zaro solishtirish shart emas.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+import zlib
+from typing import Optional
+
+import numpy as np
+
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE = 3
+
+_MERSENNE = np.uint64((1 << 61) - 1)
+_MAX32 = np.uint64(0xFFFFFFFF)
+
+# Doimiy seed: signature'lar processlar va deploy'lar orasida bir xil
+_rng = np.random.RandomState(1)
+_A = _rng.randint(1, int(_MERSENNE), size=NUM_PERM, dtype=np.uint64)
+_B = _rng.randint(0, int(_MERSENNE), size=NUM_PERM, dtype=np.uint64)
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def shingle_hashes(text: str) -> np.ndarray:
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < SHINGLE:
+        return np.empty(0, dtype=np.uint64)
+    grams = {" ".join(words[i : i + SHINGLE]) for i in range(len(words) - SHINGLE + 1)}
+    return np.fromiter(
+        (zlib.crc32(g.encode()) for g in grams), dtype=np.uint64, count=len(grams)
+    )
+
+
+def signature(text: str) -> Optional[np.ndarray]:
+    """`NUM_PERM` uzunlikdagi uint32 MinHash; juda qisqa matn uchun None."""
+    hashes = shingle_hashes(text)
+    if not hashes.size:
+        return None
+    # (NUM_PERM, n) matritsa: (a * h + b) mod p — uint64 overflow kutilgan
+    with np.errstate(over="ignore"):
+        phv = (_A[:, None] * hashes[None, :] + _B[:, None]) % _MERSENNE
+    return (phv & _MAX32).min(axis=1).astype(np.uint32)
+
+
+def to_bytes(sig: np.ndarray) -> bytes:
+    return sig.astype("<u4").tobytes()
+
+
+def from_bytes(raw: bytes) -> np.ndarray:
+    return np.frombuffer(bytes(raw), dtype="<u4")
+
+
+def band_buckets(sig: np.ndarray):
+    """[(band, bucket)] — bucket: band qatorlarining 63-bitli hash'i."""
+    rows = sig.astype("<u4").reshape(BANDS, ROWS)
+    return [
+        (
+            band,
+            int.from_bytes(
+                hashlib.blake2b(rows[band].tobytes(), digest_size=8).digest(),
+                "little",
+            )
+            >> 1,
+        )
+        for band in range(BANDS)
+    ]
+
+
+def similarity(sig: np.ndarray, others: np.ndarray) -> np.ndarray:
+    """Taxminiy Jaccard: `others` (k, NUM_PERM) bilan mos kelgan ulush."""
+    return (others == sig[None, :]).mean(axis=1)
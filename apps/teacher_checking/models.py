@@ -1,6 +1,8 @@
 #  app/models/teacher_checking.py
 import uuid
 
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
 from django.utils import timezone
 
@@ -26,6 +28,13 @@ class TeacherSubmission(models.Model):
     task = models.CharField(max_length=10, choices=Task.choices)  # type: ignore[attr-defined]
 
     submitted_text = models.TextField()
+
+    # submit paytida hisoblanadi (`stats.writing_stats`)
+    word_count = models.PositiveIntegerField(default=0)
+    sentence_count = models.PositiveIntegerField(default=0)
+    paragraph_count = models.PositiveIntegerField(default=0)
+    avg_sentence_length = models.FloatField(default=0)
+    type_token_ratio = models.FloatField(default=0)
     status = models.CharField(
         max_length=20, choices=Status.choices, default=Status.REQUESTED, db_index=True  # type: ignore[attr-defined]
     )
@@ -43,6 +52,21 @@ class TeacherSubmission(models.Model):
     submitted_at = models.DateTimeField(default=timezone.now)
     checked_at = models.DateTimeField(null=True, blank=True)
 
+    # Full-text search: Postgres o'zi hisoblaydi (GENERATED ALWAYS ... STORED)
+    search_vector = models.GeneratedField(
+        expression=SearchVector("submitted_text", weight="A", config="english")
+        + SearchVector("feedback", weight="B", config="english"),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    # claim lease: muddati o'tgan IN_CHECKING qayta pool'ga qaytadi
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+
+    # claim paytida topilgan o'xshash oldingi submission'lar (MinHash/LSH)
+    near_duplicates = models.JSONField(default=list, blank=True)
+
     created_at = models.DateTimeField(default=timezone.now, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -56,7 +80,89 @@ class TeacherSubmission(models.Model):
         indexes = [
             models.Index(fields=["status"], name="ts_status_idx"),
             models.Index(fields=["teacher", "status"], name="ts_teacher_status_idx"),
+            models.Index(
+                fields=["status", "lease_expires_at"], name="ts_status_lease_idx"
+            ),
+            GinIndex(fields=["search_vector"], name="ts_search_gin"),
         ]
 
     def __str__(self):
         return f"{self.user_test_id} {self.task} {self.status}"  # type: ignore[attr-defined]
+
+
+class SubmissionCounter(models.Model):
+    """
+    `TeacherSubmission` sonlari: `teacher=NULL` — status bo'yicha global,
+    aks holda teacher + status bo'yicha. Servislar ichida atomik yangilanadi
+    (`counters.record_transition`), drift `reconcile_submission_counters`
+    bilan tuzatiladi.
+    """
+
+    teacher = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="submission_counters",
+    )
+    status = models.CharField(max_length=20, choices=TeacherSubmission.Status.choices)  # type: ignore[attr-defined]
+    # global counter bir nechta qatorga bo'lingan (qiymat — yig'indi), shunda
+    # parallel claim/grade'lar bitta issiq qatorda navbat kutmaydi
+    shard = models.PositiveSmallIntegerField(default=0)
+    value = models.IntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "teacher_submission_counters"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["status", "shard"],
+                condition=models.Q(teacher__isnull=True),
+                name="uniq_counter_global_status_shard",
+            ),
+            models.UniqueConstraint(
+                fields=["teacher", "status"],
+                condition=models.Q(teacher__isnull=False),
+                name="uniq_counter_teacher_status",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.teacher_id or '*'} {self.status}[{self.shard}]={self.value}"  # type: ignore[attr-defined]
+
+
+class WritingSignature(models.Model):
+    """`submitted_text`ning MinHash signature'i (128 x uint32, little-endian)."""
+
+    submission = models.OneToOneField(
+        TeacherSubmission,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="signature",
+    )
+    signature = models.BinaryField()
+
+    class Meta:
+        db_table = "teacher_writing_signatures"
+
+
+class WritingSignatureBand(models.Model):
+    """LSH indeksi: har bir submission uchun `minhash.BANDS` ta qator."""
+
+    submission = models.ForeignKey(
+        TeacherSubmission, on_delete=models.CASCADE, related_name="signature_bands"
+    )
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        db_table = "teacher_writing_signature_bands"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["submission", "band"], name="uniq_signature_band"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["band", "bucket"], name="tsb_band_bucket_idx"),
+        ]
@@ -3,9 +3,24 @@ from rest_framework import serializers
 from apps.users.serializers import UserReadSerializer
 from apps.user_tests.serializers import UserTestSerializer
 from .models import TeacherSubmission
+from .stats import STATS_FIELDS, is_under_length
 
 
-class TeacherSubmissionSerializer(serializers.ModelSerializer):
+class WritingStatsMixin(serializers.Serializer):
+    word_count = serializers.IntegerField(read_only=True)
+    sentence_count = serializers.IntegerField(read_only=True)
+    paragraph_count = serializers.IntegerField(read_only=True)
+    avg_sentence_length = serializers.FloatField(read_only=True)
+    type_token_ratio = serializers.FloatField(read_only=True)
+    under_length = serializers.SerializerMethodField()
+
+    def get_under_length(self, obj) -> bool:
+        if isinstance(obj, dict):
+            return is_under_length(obj["task"], obj["word_count"])
+        return is_under_length(obj.task, obj.word_count)
+
+
+class TeacherSubmissionSerializer(WritingStatsMixin, serializers.ModelSerializer):
     user_test = UserTestSerializer(read_only=True)
     teacher = UserReadSerializer(read_only=True)
 
@@ -16,12 +31,17 @@ class TeacherSubmissionSerializer(serializers.ModelSerializer):
             "user_test",
             "task",
             "submitted_text",
+            *STATS_FIELDS,
+            "under_length",
             "status",
             "teacher",
             "score",
             "feedback",
             "submitted_at",
             "checked_at",
+            "claimed_at",
+            "lease_expires_at",
+            "near_duplicates",
         ]
         read_only_fields = [
             "status",
@@ -30,9 +50,36 @@ class TeacherSubmissionSerializer(serializers.ModelSerializer):
             "feedback",
             "submitted_at",
             "checked_at",
+            "claimed_at",
+            "lease_expires_at",
+            "near_duplicates",
         ]
 
 
+class TeacherSubmissionListSerializer(WritingStatsMixin, serializers.Serializer):
+    """Navbat ro'yxatlari uchun: `submission_list_queryset()` qatorlari."""
+
+    id = serializers.UUIDField()
+    user_test_id = serializers.UUIDField()
+    student_fullname = serializers.CharField()
+    test_title = serializers.CharField()
+    task = serializers.CharField()
+    status = serializers.CharField()
+    score = serializers.FloatField(allow_null=True)
+    teacher_id = serializers.UUIDField(allow_null=True)
+    text_length = serializers.IntegerField()
+    preview = serializers.CharField()
+    submitted_at = serializers.DateTimeField()
+    checked_at = serializers.DateTimeField(allow_null=True)
+    claimed_at = serializers.DateTimeField(allow_null=True)
+    lease_expires_at = serializers.DateTimeField(allow_null=True)
+
+
+class SubmissionSearchSerializer(TeacherSubmissionListSerializer):
+    rank = serializers.FloatField(required=False)
+    headline = serializers.CharField(required=False)
+
+
 class SubmissionCreateSerializer(serializers.Serializer):
     user_test_id = serializers.UUIDField()
     task = serializers.ChoiceField(choices=TeacherSubmission.Task.choices)  # type: ignore[attr-defined]
@@ -43,7 +90,39 @@ class ClaimSerializer(serializers.Serializer):
     submission_id = serializers.UUIDField()
 
 
+class ClaimNextSerializer(serializers.Serializer):
+    count = serializers.IntegerField(min_value=1, max_value=50, default=1)
+    priority = serializers.ChoiceField(choices=["age", "paid"], default="age")
+
+
+class HeartbeatResponseSerializer(serializers.Serializer):
+    submission_id = serializers.UUIDField()
+    lease_expires_at = serializers.DateTimeField()
+
+
 class GradeSerializer(serializers.Serializer):
     submission_id = serializers.UUIDField()
     score = serializers.FloatField(min_value=0, max_value=9)
     feedback = serializers.CharField(allow_blank=True, required=False)
+
+
+class GradeItemSerializer(serializers.Serializer):
+    submission_id = serializers.UUIDField()
+    score = serializers.FloatField(min_value=0, max_value=9)
+    feedback = serializers.CharField(allow_blank=True, required=False)
+
+
+class GradeBulkSerializer(serializers.Serializer):
+    items = GradeItemSerializer(many=True, allow_empty=False, max_length=100)
+
+
+class GradeItemStatusSerializer(serializers.Serializer):
+    submission_id = serializers.UUIDField()
+    status = serializers.ChoiceField(
+        choices=["graded", "not_found", "not_assigned", "invalid_status"]
+    )
+
+
+class GradeBulkResultSerializer(serializers.Serializer):
+    graded = serializers.IntegerField()
+    items = GradeItemStatusSerializer(many=True)
@@ -1,85 +1,416 @@
 from __future__ import annotations
 
+from datetime import timedelta
+from typing import Any, Dict, List
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
 from django.core.exceptions import ValidationError
-from django.db import transaction
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.db.models.functions import Length, Substr
 from django.utils import timezone
 
-from apps.user_tests.models import UserTest, TestResult
+from apps.user_tests.models import UserTest
+from apps.user_tests.results import record_scores, recompute_writing
 from apps.users.models import User
+from .counters import record_transition, record_transitions
+from .duplicates import flag_near_duplicates, sign_submission
 from .models import TeacherSubmission
+from .stats import STATS_FIELDS, under_length_q, writing_stats
+
+
+__all__ = (
+    "submission_list_queryset",
+    "claimable_q",
+    "search_submissions",
+    "filter_by_stats",
+    "submit_writing",
+    "claim_submission",
+    "claim_next",
+    "extend_lease",
+    "reap_expired_leases",
+    "grade_submission",
+    "grade_submissions_bulk",
+)
+
+
+def _conf(key: str, default):
+    return getattr(settings, "TEACHER_CHECKING", {}).get(key, default)
+
+
+def lease_delta() -> timedelta:
+    return timedelta(minutes=_conf("LEASE_MINUTES", 30))
+
+
+PREVIEW_CHARS = 200
+
+# Navbat ro'yxatlari uchun yengil proyeksiya: essay matni o'rniga uzunligi
+# va qisqa preview (to'liq matn faqat detail endpoint'da).
+SUBMISSION_LIST_FIELDS = (
+    "id",
+    "user_test_id",
+    "student_fullname",
+    "test_title",
+    "task",
+    "status",
+    "score",
+    "teacher_id",
+    "text_length",
+    "preview",
+    *STATS_FIELDS,
+    "submitted_at",
+    "checked_at",
+    "claimed_at",
+    "lease_expires_at",
+    "updated_at",
+)
 
 
-__all__ = ("submit_writing", "claim_submission", "grade_submission")
+def submission_list_queryset():
+    return TeacherSubmission.objects.annotate(
+        student_fullname=F("user_test__user__fullname"),
+        test_title=F("user_test__test__title"),
+        text_length=Length("submitted_text"),
+        preview=Substr("submitted_text", 1, PREVIEW_CHARS),
+    ).values(*SUBMISSION_LIST_FIELDS)
+
+
+def filter_by_stats(qs, params):
+    """`under_length`, `min_words`, `max_words` query parametrlari bo'yicha."""
+    under = str(params.get("under_length", "")).lower()
+    if under in {"1", "true", "yes"}:
+        qs = qs.filter(under_length_q())
+    elif under in {"0", "false", "no"}:
+        qs = qs.exclude(under_length_q())
+    for param, lookup in (("min_words", "gte"), ("max_words", "lte")):
+        try:
+            qs = qs.filter(**{f"word_count__{lookup}": int(params[param])})
+        except (KeyError, TypeError, ValueError):
+            pass
+    return qs
+
+
+def search_submissions(
+    *, q: str = "", student: str = "", test: str = "", task: str = "", status: str = ""
+):
+    """
+    `q` — essay/feedback bo'yicha full-text (websearch sintaksisi:
+    `"aniq ibora"`, `-so'z`, `or`), `search_vector` GIN indeksi orqali,
+    `SearchRank` bo'yicha tartiblanadi. `student`/`test` — ism va test
+    nomi bo'yicha filtr.
+    """
+    qs = submission_list_queryset()
+    if student:
+        qs = qs.filter(user_test__user__fullname__icontains=student)
+    if test:
+        qs = qs.filter(user_test__test__title__icontains=test)
+    if task:
+        qs = qs.filter(task=task)
+    if status:
+        qs = qs.filter(status=status)
+    if not q:
+        return qs.order_by("-submitted_at")
+
+    query = SearchQuery(q, search_type="websearch", config="english")
+    return (
+        qs.filter(search_vector=query)
+        .annotate(
+            rank=SearchRank(F("search_vector"), query),
+            headline=SearchHeadline(
+                "submitted_text",
+                query,
+                config="english",
+                max_words=35,
+                min_words=15,
+            ),
+        )
+        .order_by("-rank", "-submitted_at")
+    )
 
 
 @transaction.atomic
 def submit_writing(*, user_test: UserTest, task: str, text: str) -> TeacherSubmission:
+    stats = writing_stats(text)
     sub, created = TeacherSubmission.objects.get_or_create(
         user_test=user_test,
         task=task,
-        defaults={"submitted_text": text, "status": TeacherSubmission.Status.REQUESTED},
+        defaults={
+            "submitted_text": text,
+            "status": TeacherSubmission.Status.REQUESTED,
+            **stats,
+        },
     )
-    if not created:
+    if created:
+        record_transition(new_status=sub.status)
+    else:
+        sub = TeacherSubmission.objects.select_for_update().get(pk=sub.pk)
         if sub.status == TeacherSubmission.Status.CHECKED:
             raise ValidationError("This task is already checked.")
+        record_transition(
+            old_status=sub.status,
+            old_teacher_id=sub.teacher_id,  # type: ignore[attr-defined]
+            new_status=TeacherSubmission.Status.REQUESTED,
+        )
         sub.submitted_text = text
+        for field, value in stats.items():
+            setattr(sub, field, value)
         sub.status = TeacherSubmission.Status.REQUESTED
         sub.teacher = None
         sub.score = None
         sub.feedback = ""
         sub.submitted_at = timezone.now()
+        sub.claimed_at = None
+        sub.lease_expires_at = None
+        sub.near_duplicates = []  # eski matn bo'yicha; claim'da qayta hisoblanadi
         sub.save(
             update_fields=[
                 "submitted_text",
+                *STATS_FIELDS,
                 "status",
                 "teacher",
                 "score",
                 "feedback",
                 "submitted_at",
+                "claimed_at",
+                "lease_expires_at",
+                "near_duplicates",
                 "updated_at",
             ]
         )
+    # MinHash/LSH: claim paytida o'xshash oldingi matnlarni topish uchun
+    sign_submission(sub)
     return sub
 
 
+def claimable_q(now=None) -> Q:
+    """Pool: egasiz REQUESTED yoki lease'i o'tgan IN_CHECKING (claim bilan bir xil)."""
+    return Q(status=TeacherSubmission.Status.REQUESTED, teacher__isnull=True) | Q(
+        status=TeacherSubmission.Status.IN_CHECKING,
+        lease_expires_at__lt=now or timezone.now(),
+    )
+
+
 @transaction.atomic
 def claim_submission(*, submission_id, teacher: User) -> TeacherSubmission:
-    # SELECT ... FOR UPDATE SKIP LOCKED
+    # SELECT ... FOR UPDATE SKIP LOCKED; lease'i o'tgan IN_CHECKING ham olinadi
+    now = timezone.now()
     qs = TeacherSubmission.objects.select_for_update(skip_locked=True).filter(
-        id=submission_id,
-        status=TeacherSubmission.Status.REQUESTED,
-        teacher__isnull=True,
+        claimable_q(now), id=submission_id
     )
     sub = qs.first()
     if not sub:
         raise ValidationError(
             "Submission is already taken or not in 'requested' state."
         )
+    record_transition(
+        old_status=sub.status,
+        old_teacher_id=sub.teacher_id,  # type: ignore[attr-defined]
+        new_status=TeacherSubmission.Status.IN_CHECKING,
+        new_teacher_id=teacher.pk,
+    )
     sub.status = TeacherSubmission.Status.IN_CHECKING
     sub.teacher = teacher
-    sub.save(update_fields=["status", "teacher", "updated_at"])
+    sub.claimed_at = now
+    sub.lease_expires_at = now + lease_delta()
+    sub.save(
+        update_fields=[
+            "status",
+            "teacher",
+            "claimed_at",
+            "lease_expires_at",
+            "updated_at",
+        ]
+    )
+    sub.near_duplicates = flag_near_duplicates([sub.pk])[str(sub.pk)]
     return sub
 
 
+def extend_lease(*, submission_id, teacher: User):
+    """Heartbeat: teacher'dagi submission lease'ini uzaytiradi (bitta UPDATE)."""
+    expires = timezone.now() + lease_delta()
+    updated = TeacherSubmission.objects.filter(
+        id=submission_id,
+        teacher=teacher,
+        status=TeacherSubmission.Status.IN_CHECKING,
+    ).update(lease_expires_at=expires)
+    if not updated:
+        raise ValidationError("Submission is not in checking by you.")
+    return expires
+
+
+_REAP_SQL = """
+WITH expired AS (
+    SELECT id, teacher_id AS old_teacher_id
+    FROM teacher_submissions
+    WHERE status = %(in_checking)s AND lease_expires_at < %(now)s
+    ORDER BY lease_expires_at
+    LIMIT %(limit)s
+    FOR UPDATE SKIP LOCKED
+)
+UPDATE teacher_submissions t
+SET status = %(requested)s,
+    teacher_id = NULL,
+    claimed_at = NULL,
+    lease_expires_at = NULL,
+    updated_at = %(now)s
+FROM expired
+WHERE t.id = expired.id
+RETURNING t.id, expired.old_teacher_id
+"""
+
+
+@transaction.atomic
+def reap_expired_leases(*, limit: int = 1000) -> int:
+    """
+    Lease'i o'tgan `IN_CHECKING` submission'larni `REQUESTED`ga qaytaradi:
+    `(status, lease_expires_at)` indeksi bo'yicha bitta set-based UPDATE.
+    """
+    with connection.cursor() as cur:
+        cur.execute(
+            _REAP_SQL,
+            {
+                "requested": TeacherSubmission.Status.REQUESTED,
+                "in_checking": TeacherSubmission.Status.IN_CHECKING,
+                "now": timezone.now(),
+                "limit": limit,
+            },
+        )
+        rows = cur.fetchall()
+    record_transitions(
+        (
+            TeacherSubmission.Status.IN_CHECKING,
+            old_teacher_id,
+            TeacherSubmission.Status.REQUESTED,
+            None,
+        )
+        for _, old_teacher_id in rows
+    )
+    return len(rows)
+
+
+# ORDER BY — faqat shu ro'yxatdagi qiymatlar SQL'ga qo'yiladi
+CLAIM_PRIORITIES = {
+    "age": ("ts.submitted_at, ts.id", ("submitted_at", "id")),
+    "paid": (
+        "ut.price_paid DESC, ts.submitted_at, ts.id",
+        ("-user_test__price_paid", "submitted_at", "id"),
+    ),
+}
+
+_CLAIM_NEXT_SQL = """
+WITH picked AS (
+    SELECT ts.id, ts.status AS old_status, ts.teacher_id AS old_teacher_id
+    FROM teacher_submissions ts
+    JOIN user_tests ut ON ut.id = ts.user_test_id
+    WHERE (ts.status = %(requested)s AND ts.teacher_id IS NULL)
+       OR (ts.status = %(in_checking)s AND ts.lease_expires_at < %(now)s)
+    ORDER BY {order}
+    LIMIT %(limit)s
+    FOR UPDATE OF ts SKIP LOCKED
+)
+UPDATE teacher_submissions t
+SET status = %(in_checking)s,
+    teacher_id = %(teacher)s,
+    claimed_at = %(now)s,
+    lease_expires_at = %(lease)s,
+    updated_at = %(now)s
+FROM picked
+WHERE t.id = picked.id
+RETURNING t.id, picked.old_status, picked.old_teacher_id
+"""
+
+
+def _locked_in_checking(teacher_id) -> int:
+    # tranzaksiya oxirigacha; boshqa hech qayer bu kalitni olmaydi
+    with connection.cursor() as cur:
+        cur.execute(
+            "SELECT pg_advisory_xact_lock(hashtext(%s))", [f"claim_next:{teacher_id}"]
+        )
+    return TeacherSubmission.objects.filter(
+        teacher_id=teacher_id, status=TeacherSubmission.Status.IN_CHECKING
+    ).count()
+
+
+@transaction.atomic
+def claim_next(
+    *, teacher: User, count: int = 1, priority: str = "age"
+) -> List[TeacherSubmission]:
+    """
+    Navbatdagi `count` ta submission'ni teacher'ga biriktiradi: bitta
+    `UPDATE ... FROM (SELECT ... FOR UPDATE SKIP LOCKED LIMIT n) RETURNING`.
+    Boshqa teacher qulflagan qatorlar o'tkazib yuboriladi, shuning uchun
+    parallel claim'lar bir-birini kutmaydi va xato bermaydi. Lease'i
+    o'tgan `IN_CHECKING` ham qayta olinadi.
+
+    Per-teacher limit (`MAX_IN_CHECKING`) teacher bo'yicha advisory lock
+    ostida `teacher_submissions`dan sanaladi — bitta teacher'ning parallel
+    so'rovlari limitdan oshmaydi. Counter qatorlari bu yerda oldindan
+    qulflanmaydi: ular faqat `record_transitions`da, boshqa servislar
+    bilan bir xil tartibda olinadi (deadlock yo'q).
+    """
+    if priority not in CLAIM_PRIORITIES:
+        raise ValidationError(f"Unknown priority: {priority}")
+    sql_order, orm_order = CLAIM_PRIORITIES[priority]
+
+    in_checking = _locked_in_checking(teacher.pk)
+    limit = min(
+        count,
+        _conf("MAX_CLAIM_BATCH", 10),
+        _conf("MAX_IN_CHECKING", 10) - in_checking,
+    )
+    if limit <= 0:
+        raise ValidationError("In-checking limit reached. Finish current tasks first.")
+
+    now = timezone.now()
+    with connection.cursor() as cur:
+        cur.execute(
+            _CLAIM_NEXT_SQL.format(order=sql_order),
+            {
+                "requested": TeacherSubmission.Status.REQUESTED,
+                "in_checking": TeacherSubmission.Status.IN_CHECKING,
+                "teacher": teacher.pk,
+                "now": now,
+                "lease": now + lease_delta(),
+                "limit": limit,
+            },
+        )
+        rows = cur.fetchall()
+
+    record_transitions(
+        (old_status, old_teacher_id, TeacherSubmission.Status.IN_CHECKING, teacher.pk)
+        for _, old_status, old_teacher_id in rows
+    )
+    flag_near_duplicates(r[0] for r in rows)
+    return list(
+        TeacherSubmission.objects.filter(id__in=[r[0] for r in rows])
+        .select_related("user_test__user", "user_test__test", "teacher")
+        .order_by(*orm_order)
+    )
+
+
 @transaction.atomic
 def grade_submission(
     *, submission_id, teacher: User, score: float, feedback: str
 ) -> TeacherSubmission:
-    sub = (
-        TeacherSubmission.objects.select_for_update()
-        .select_related("user_test")
-        .get(id=submission_id)
-    )
+    sub = TeacherSubmission.objects.select_for_update().get(id=submission_id)
     if sub.teacher_id and sub.teacher_id != teacher.id:  # type: ignore[attr-defined]
         raise ValidationError("This submission is assigned to another teacher.")
     if sub.status != TeacherSubmission.Status.IN_CHECKING:
         raise ValidationError("Submission must be in 'in_checking' state to grade.")
 
+    record_transition(
+        old_status=sub.status,
+        old_teacher_id=sub.teacher_id,  # type: ignore[attr-defined]
+        new_status=TeacherSubmission.Status.CHECKED,
+        new_teacher_id=teacher.pk,
+    )
     sub.score = float(score)
     sub.feedback = feedback or ""
     sub.status = TeacherSubmission.Status.CHECKED
     sub.checked_at = timezone.now()
     sub.teacher = teacher
+    sub.lease_expires_at = None
     sub.save(
         update_fields=[
             "score",
@@ -87,26 +418,87 @@ def grade_submission(
             "status",
             "checked_at",
             "teacher",
+            "lease_expires_at",
             "updated_at",
         ]
     )
 
-    ut = sub.user_test
-    tr, _ = TestResult.objects.get_or_create(user_test=ut)
-
-    scores = list(
-        TeacherSubmission.objects.filter(
-            user_test=ut, status=TeacherSubmission.Status.CHECKED
-        ).values_list("score", flat=True)
-    )
-    if scores:
-        tr.writing_score = round(sum(scores) / len(scores), 1)
-        comps = [
-            x
-            for x in (tr.listening_score, tr.reading_score, tr.writing_score)
-            if x is not None
-        ]
-        tr.overall_score = round(sum(comps) / len(comps), 1) if comps else None
-        tr.save(update_fields=["writing_score", "overall_score", "updated_at"])
+    record_scores(user_test_id=sub.user_test_id, writing=[sub.score])
 
     return sub
+
+
+@transaction.atomic
+def grade_submissions_bulk(
+    *, teacher: User, items: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Ko'p submission'ni bittada baholaydi: barcha qatorlar bitta
+    `select_for_update` bilan qulflanadi, egasi/holati xotirada tekshiriladi,
+    ballar `bulk_update` bilan yoziladi va ta'sirlangan `TestResult`lar
+    bitta guruhlangan agregat bilan qayta hisoblanadi.
+
+    Xato bo'lgan elementlar butun batch'ni to'xtatmaydi — har biri uchun
+    status qaytadi: `graded`, `not_found`, `not_assigned`, `invalid_status`.
+    """
+    latest = {item["submission_id"]: item for item in items}
+    locked = {
+        sub.id: sub
+        for sub in TeacherSubmission.objects.select_for_update()
+        .filter(id__in=latest.keys())
+        .order_by("id")  # bir xil tartibda qulflash — deadlock bo'lmaydi
+    }
+
+    now = timezone.now()
+    statuses: Dict[Any, str] = {}
+    graded, transitions = [], []
+    for sid, item in latest.items():
+        sub = locked.get(sid)
+        if sub is None:
+            statuses[sid] = "not_found"
+        elif sub.teacher_id and sub.teacher_id != teacher.pk:  # type: ignore[attr-defined]
+            statuses[sid] = "not_assigned"
+        elif sub.status != TeacherSubmission.Status.IN_CHECKING:
+            statuses[sid] = "invalid_status"
+        else:
+            transitions.append(
+                (
+                    sub.status,
+                    sub.teacher_id,  # type: ignore[attr-defined]
+                    TeacherSubmission.Status.CHECKED,
+                    teacher.pk,
+                )
+            )
+            sub.score = float(item["score"])
+            sub.feedback = item.get("feedback") or ""
+            sub.status = TeacherSubmission.Status.CHECKED
+            sub.checked_at = now
+            sub.teacher = teacher
+            sub.lease_expires_at = None
+            sub.updated_at = now
+            graded.append(sub)
+            statuses[sid] = "graded"
+
+    if graded:
+        TeacherSubmission.objects.bulk_update(
+            graded,
+            [
+                "score",
+                "feedback",
+                "status",
+                "checked_at",
+                "teacher",
+                "lease_expires_at",
+                "updated_at",
+            ],
+        )
+        record_transitions(transitions)
+        recompute_writing(sub.user_test_id for sub in graded)
+
+    return [
+        {
+            "submission_id": item["submission_id"],
+            "status": statuses[item["submission_id"]],
+        }
+        for item in items
+    ]
@@ -0,0 +1,82 @@
+# apps/teacher_checking/stats.py
+"""
+Essay statistikasi: so'z, gap, paragraf soni, o'rtacha gap uzunligi va
+type/token ratio. Matn bitta regex bilan bir marta o'tiladi.
+"""
+from __future__ import annotations
+
+import re
+from typing import Any, Dict
+
+from django.db.models import Q
+
+__all__ = (
+    "MIN_WORDS",
+    "STATS_FIELDS",
+    "writing_stats",
+    "is_under_length",
+    "under_length_q",
+)
+
+# IELTS talabi: Task 1 — kamida 150, Task 2 — kamida 250 so'z
+MIN_WORDS = {"task1": 150, "task2": 250}
+
+STATS_FIELDS = (
+    "word_count",
+    "sentence_count",
+    "paragraph_count",
+    "avg_sentence_length",
+    "type_token_ratio",
+)
+
+# so'z (don't, well-known, 2024), gap oxiri yoki bo'sh qator (paragraf).
+# Tinish belgisi faqat ortidan bo'shliq/matn oxiri kelsa (yopuvchi qo'shtirnoq
+# yoki qavsdan keyin ham) gap oxiri — 3.5 yoki cdi.uz ichidagi nuqta emas.
+_TOKEN_RE = re.compile(
+    r"(?P<word>[^\W_]+(?:['’-][^\W_]+)*)"
+    r"|(?P<end>[.!?]+(?=[\"'”’)\]]*(?:\s|$)))"
+    r"|(?P<para>\n[^\S\n]*\n)"
+)
+
+
+def writing_stats(text: str) -> Dict[str, Any]:
+    words = sentences = paragraphs = 0
+    in_sentence = in_paragraph = False
+    types = set()
+
+    for m in _TOKEN_RE.finditer(text or ""):
+        kind = m.lastgroup
+        if kind == "word":
+            words += 1
+            types.add(m.group().lower())
+            in_sentence = in_paragraph = True
+        elif kind == "end":
+            if in_sentence:
+                sentences += 1
+                in_sentence = False
+        elif in_paragraph:
+            # paragraf tugadi; nuqtasiz oxirgi gap ham hisoblanadi
+            sentences += in_sentence
+            paragraphs += 1
+            in_sentence = in_paragraph = False
+
+    sentences += in_sentence
+    paragraphs += in_paragraph
+    return {
+        "word_count": words,
+        "sentence_count": sentences,
+        "paragraph_count": paragraphs,
+        "avg_sentence_length": round(words / sentences, 2) if sentences else 0.0,
+        "type_token_ratio": round(len(types) / words, 3) if words else 0.0,
+    }
+
+
+def is_under_length(task: str, word_count: int) -> bool:
+    return word_count < MIN_WORDS.get(task, 0)
+
+
+def under_length_q() -> Q:
+    cond = Q()
+    for task, minimum in MIN_WORDS.items():
+        cond |= Q(task=task, word_count__lt=minimum)
+    return cond
@@ -1,3 +1,63 @@
-from django.test import TestCase
+import random
 
-# Create your tests here.
+import numpy as np
+from django.test import SimpleTestCase
+
+from apps.teacher_checking import minhash
+from apps.teacher_checking.stats import writing_stats
+
+
+class WritingStatsTests(SimpleTestCase):
+    def test_decimal_point_is_not_sentence_end(self):
+        stats = writing_stats("Scores rose to 3.5 percent. Then fell.")
+        self.assertEqual(stats["sentence_count"], 2)
+
+    def test_terminator_before_closing_quote(self):
+        stats = writing_stats('He said "stop." They stopped!')
+        self.assertEqual(stats["sentence_count"], 2)
+
+    def test_paragraph_closes_unterminated_sentence(self):
+        stats = writing_stats("First line without dot\n\nSecond one.")
+        self.assertEqual(stats["sentence_count"], 2)
+        self.assertEqual(stats["paragraph_count"], 2)
+
+
+def _essay(seed: int, words: int = 250) -> str:
+    rng = random.Random(seed)
+    vocab = [f"w{seed}x{i}" for i in range(400)]
+    return " ".join(rng.choice(vocab) for _ in range(words))
+
+
+class MinHashTests(SimpleTestCase):
+    def _sim(self, a: str, b: str) -> float:
+        sig = minhash.signature(a)
+        return float(minhash.similarity(sig, np.stack([minhash.signature(b)]))[0])
+
+    def _shared_buckets(self, a: str, b: str) -> set:
+        return set(minhash.band_buckets(minhash.signature(a))) & set(
+            minhash.band_buckets(minhash.signature(b))
+        )
+
+    def test_identical_essays(self):
+        text = _essay(1)
+        self.assertEqual(self._sim(text, text), 1.0)
+        self.assertEqual(len(self._shared_buckets(text, text)), minhash.BANDS)
+
+    def test_lightly_edited_copy_is_a_candidate(self):
+        text = _essay(2)
+        words = text.split()
+        words[100] = "changed"
+        words.insert(200, "inserted")
+        edited = " ".join(words)
+        self.assertGreaterEqual(self._sim(text, edited), 0.8)
+        self.assertTrue(self._shared_buckets(text, edited))
+
+    def test_unrelated_essays_share_no_bucket(self):
+        a, b = _essay(3), _essay(4)
+        self.assertLess(self._sim(a, b), 0.1)
+        self.assertFalse(self._shared_buckets(a, b))
+
+    def test_signature_round_trip_and_short_text(self):
+        sig = minhash.signature(_essay(5))
+        self.assertTrue(np.array_equal(minhash.from_bytes(minhash.to_bytes(sig)), sig))
+        self.assertIsNone(minhash.signature("too short"))
@@ -4,8 +4,13 @@ from .views import (
     AllWritingList,
     MyCheckingList,
     MyCheckedList,
+    SubmissionDetail,
+    SubmissionSearchList,
     claim_view,
+    claim_next_view,
+    heartbeat_view,
     grade_view,
+    grade_bulk_view,
     student_submit_writing,
 )
 
@@ -16,7 +21,14 @@ urlpatterns = [
     path("all/", AllWritingList.as_view(), name="all-writing"),
     path("in-progress/", MyCheckingList.as_view(), name="my-checking"),
     path("checked/", MyCheckedList.as_view(), name="my-checked"),
+    path("search/", SubmissionSearchList.as_view(), name="submission-search"),
+    path(
+        "submissions/<uuid:pk>/", SubmissionDetail.as_view(), name="submission-detail"
+    ),
     # teacher actions
     path("claim/", claim_view, name="claim-writing"),
+    path("claim/next/", claim_next_view, name="claim-next-writing"),
+    path("claim/heartbeat/", heartbeat_view, name="claim-heartbeat"),
     path("grade/", grade_view, name="grade-writing"),
+    path("grade/bulk/", grade_bulk_view, name="grade-writing-bulk"),
 ]
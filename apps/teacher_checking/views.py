@@ -1,6 +1,8 @@
 #  apps/teacher_checking/views.py
+from django.core.exceptions import ValidationError
 from django.shortcuts import get_object_or_404
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
@@ -10,11 +12,28 @@ from apps.user_tests.models import UserTest
 from .models import TeacherSubmission
 from .serializers import (
     TeacherSubmissionSerializer,
+    TeacherSubmissionListSerializer,
+    SubmissionSearchSerializer,
     SubmissionCreateSerializer,
     ClaimSerializer,
+    ClaimNextSerializer,
+    HeartbeatResponseSerializer,
     GradeSerializer,
+    GradeBulkSerializer,
+    GradeBulkResultSerializer,
+)
+from .services import (
+    submission_list_queryset,
+    claimable_q,
+    filter_by_stats,
+    search_submissions,
+    submit_writing,
+    claim_submission,
+    claim_next,
+    extend_lease,
+    grade_submission,
+    grade_submissions_bulk,
 )
-from .services import submit_writing, claim_submission, grade_submission
 
 
 @extend_schema(
@@ -36,47 +55,155 @@ def student_submit_writing(request):
     )
 
 
-@extend_schema(tags=["Teacher Checking"], summary="All Writing (pool) — requested")
+# Essay statistikasi bo'yicha filtrlar (barcha ro'yxatlarda)
+STATS_PARAMETERS = [
+    OpenApiParameter(
+        name="under_length",
+        type=OpenApiTypes.BOOL,
+        location="query",
+        description="Task 1 < 150 / Task 2 < 250 so'z (`false` — teskarisi)",
+    ),
+    OpenApiParameter(
+        name="min_words",
+        type=OpenApiTypes.INT,
+        location="query",
+        description="Kamida shuncha so'z",
+    ),
+    OpenApiParameter(
+        name="max_words",
+        type=OpenApiTypes.INT,
+        location="query",
+        description="Ko'pi bilan shuncha so'z",
+    ),
+]
+
+
+@extend_schema(
+    tags=["Teacher Checking"],
+    summary="All Writing (pool) — requested",
+    description=(
+        "Yengil ro'yxat: essay o'rniga `text_length` va `preview` "
+        "qaytadi. To'liq matn — `submissions/{id}/`. Lease'i o'tgan "
+        "`in_checking` submission'lar ham shu yerda (claim qilish mumkin)."
+    ),
+    parameters=STATS_PARAMETERS,
+)
 class AllWritingList(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated, IsTeacherOrSuperAdmin]
-    serializer_class = TeacherSubmissionSerializer
+    serializer_class = TeacherSubmissionListSerializer
 
     def get_queryset(self):
-        return (
-            TeacherSubmission.objects.filter(status=TeacherSubmission.Status.REQUESTED)
-            .select_related("user_test__user", "user_test__test", "teacher")
-            .order_by("submitted_at")
-        )
+        return filter_by_stats(
+            submission_list_queryset().filter(claimable_q()),
+            self.request.query_params,
+        ).order_by("submitted_at")
 
 
-@extend_schema(tags=["Teacher Checking"], summary="My Checking — in_checking")
+@extend_schema(
+    tags=["Teacher Checking"],
+    summary="My Checking — in_checking",
+    parameters=STATS_PARAMETERS,
+)
 class MyCheckingList(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated, IsTeacherOrSuperAdmin]
-    serializer_class = TeacherSubmissionSerializer
+    serializer_class = TeacherSubmissionListSerializer
 
     def get_queryset(self):
-        return (
-            TeacherSubmission.objects.filter(
+        return filter_by_stats(
+            submission_list_queryset().filter(
                 status=TeacherSubmission.Status.IN_CHECKING, teacher=self.request.user
-            )
-            .select_related("user_test__user", "user_test__test", "teacher")
-            .order_by("-updated_at")
-        )
+            ),
+            self.request.query_params,
+        ).order_by("-updated_at")
 
 
-@extend_schema(tags=["Teacher Checking"], summary="Checked — by me")
+@extend_schema(
+    tags=["Teacher Checking"],
+    summary="Checked — by me",
+    parameters=STATS_PARAMETERS,
+)
 class MyCheckedList(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated, IsTeacherOrSuperAdmin]
-    serializer_class = TeacherSubmissionSerializer
+    serializer_class = TeacherSubmissionListSerializer
 
     def get_queryset(self):
-        return (
-            TeacherSubmission.objects.filter(
+        return filter_by_stats(
+            submission_list_queryset().filter(
                 status=TeacherSubmission.Status.CHECKED, teacher=self.request.user
-            )
-            .select_related("user_test__user", "user_test__test", "teacher")
-            .order_by("-checked_at")
+            ),
+            self.request.query_params,
+        ).order_by("-checked_at")
+
+
+@extend_schema(
+    tags=["Teacher Checking"],
+    summary="Submission qidiruv (full-text)",
+    description=(
+        "Essay matni va feedback bo'yicha full-text qidiruv (Postgres "
+        "`tsvector` + GIN), natijalar `rank` bo'yicha tartiblanadi va "
+        "`headline`da topilgan parcha qaytadi. `q` websearch sintaksisini "
+        "qo'llaydi: `\"aniq ibora\"`, `-so'z`, `or`."
+    ),
+    parameters=[
+        OpenApiParameter(
+            name="q",
+            type=OpenApiTypes.STR,
+            location="query",
+            description="Essay/feedback bo'yicha qidiruv",
+        ),
+        OpenApiParameter(
+            name="student",
+            type=OpenApiTypes.STR,
+            location="query",
+            description="Student ismi (qismi)",
+        ),
+        OpenApiParameter(
+            name="test",
+            type=OpenApiTypes.STR,
+            location="query",
+            description="Test nomi (qismi)",
+        ),
+        OpenApiParameter(
+            name="task",
+            type=OpenApiTypes.STR,
+            location="query",
+            description="`task1` yoki `task2`",
+        ),
+        OpenApiParameter(
+            name="status",
+            type=OpenApiTypes.STR,
+            location="query",
+            description="`requested`, `in_checking` yoki `checked`",
+        ),
+        *STATS_PARAMETERS,
+    ],
+)
+class SubmissionSearchList(generics.ListAPIView):
+    permission_classes = [permissions.IsAuthenticated, IsTeacherOrSuperAdmin]
+    serializer_class = SubmissionSearchSerializer
+
+    def get_queryset(self):
+        qp = self.request.query_params
+        qs = search_submissions(
+            q=qp.get("q", "").strip(),
+            student=qp.get("student", "").strip(),
+            test=qp.get("test", "").strip(),
+            task=qp.get("task", "").strip(),
+            status=qp.get("status", "").strip(),
         )
+        return filter_by_stats(qs, qp)
+
+
+@extend_schema(
+    tags=["Teacher Checking"],
+    summary="Submission detail (to'liq essay matni bilan)",
+)
+class SubmissionDetail(generics.RetrieveAPIView):
+    permission_classes = [permissions.IsAuthenticated, IsTeacherOrSuperAdmin]
+    serializer_class = TeacherSubmissionSerializer
+    queryset = TeacherSubmission.objects.select_related(
+        "user_test__user", "user_test__test", "teacher"
+    )
 
 
 @extend_schema(
@@ -105,6 +232,66 @@ def claim_view(request):
     return Response(TeacherSubmissionSerializer(sub).data)
 
 
+@extend_schema(
+    tags=["Teacher Checking"],
+    summary="Claim next — navbatdagi submission(lar)ni olish",
+    description=(
+        "Pool'dan navbatdagi `count` ta submission teacher'ga biriktiriladi "
+        "(id tanlash shart emas). Parallel so'rovlar bir-birini kutmaydi: "
+        "boshqa teacher olayotgan qatorlar o'tkazib yuboriladi.\n\n"
+        "- `priority`: `age` (eng eskisi birinchi) yoki `paid` "
+        "(to'langan summa bo'yicha, keyin eskisi).\n"
+        "- Lease muddati o'tgan `in_checking` submission'lar ham qayta olinadi.\n"
+        "- Teacher'da `MAX_IN_CHECKING` dan ko'p bo'lsa — `400`.\n"
+        "- Pool bo'sh bo'lsa `200` va `[]`."
+    ),
+    request=ClaimNextSerializer,
+    responses={200: TeacherSubmissionSerializer(many=True)},
+)
+@api_view(["POST"])
+@permission_classes([permissions.IsAuthenticated, IsTeacherOrSuperAdmin])
+def claim_next_view(request):
+    ser = ClaimNextSerializer(data=request.data)
+    ser.is_valid(raise_exception=True)
+    try:
+        subs = claim_next(
+            teacher=request.user,
+            count=ser.validated_data["count"],
+            priority=ser.validated_data["priority"],
+        )
+    except ValidationError as e:
+        return Response({"error": e.messages[0]}, status=400)
+    return Response(TeacherSubmissionSerializer(subs, many=True).data)
+
+
+@extend_schema(
+    tags=["Teacher Checking"],
+    summary="Heartbeat — claim lease'ini uzaytirish",
+    description=(
+        "Teacher tekshirayotgan submission lease'ini `LEASE_MINUTES`ga "
+        "uzaytiradi. Frontend tekshirish oynasi ochiq turganda davriy "
+        "chaqiradi; chaqirilmasa lease tugaydi va submission pool'ga qaytadi."
+    ),
+    request=ClaimSerializer,
+    responses={200: HeartbeatResponseSerializer},
+)
+@api_view(["POST"])
+@permission_classes([permissions.IsAuthenticated, IsTeacherOrSuperAdmin])
+def heartbeat_view(request):
+    ser = ClaimSerializer(data=request.data)
+    ser.is_valid(raise_exception=True)
+    sid = ser.validated_data["submission_id"]
+    try:
+        expires = extend_lease(submission_id=sid, teacher=request.user)
+    except ValidationError as e:
+        return Response({"error": e.messages[0]}, status=400)
+    return Response(
+        HeartbeatResponseSerializer(
+            {"submission_id": sid, "lease_expires_at": expires}
+        ).data
+    )
+
+
 @extend_schema(tags=["Teacher Checking"], summary="Grade submission and finish")
 @api_view(["POST"])
 @permission_classes([permissions.IsAuthenticated, IsTeacherOrSuperAdmin])
@@ -118,3 +305,29 @@ def grade_view(request):
         feedback=ser.validated_data.get("feedback") or "",
     )
     return Response(TeacherSubmissionSerializer(sub).data)
+
+
+@extend_schema(
+    tags=["Teacher Checking"],
+    summary="Bulk grading — bir nechta submission'ni bittada baholash",
+    description=(
+        "`{submission_id, score, feedback}` ro'yxatini qabul qiladi (max 100). "
+        "Barcha qatorlar bitta tranzaksiyada qulflanadi va yoziladi; "
+        "xato elementlar batch'ni to'xtatmaydi. Har bir element uchun status: "
+        "`graded`, `not_found`, `not_assigned` (boshqa teacher'da) yoki "
+        "`invalid_status` (`in_checking` emas)."
+    ),
+    request=GradeBulkSerializer,
+    responses={200: GradeBulkResultSerializer},
+)
+@api_view(["POST"])
+@permission_classes([permissions.IsAuthenticated, IsTeacherOrSuperAdmin])
+def grade_bulk_view(request):
+    ser = GradeBulkSerializer(data=request.data)
+    ser.is_valid(raise_exception=True)
+    items = grade_submissions_bulk(
+        teacher=request.user, items=ser.validated_data["items"]
+    )
+    return Response(
+        {"graded": sum(1 for x in items if x["status"] == "graded"), "items": items}
+    )
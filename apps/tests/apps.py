@@ -10,3 +10,4 @@ class ExamConfig(AppConfig):
     def ready(self):
         from . import signals  # noqa
         from . import signals_m2m  # noqa
+        from . import signals_snapshot  # noqa
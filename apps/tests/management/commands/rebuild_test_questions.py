@@ -0,0 +1,27 @@
+# apps/tests/management/commands/rebuild_test_questions.py
+from django.core.management.base import BaseCommand
+
+from apps.tests.models import Test
+from apps.tests.services import rebuild_test_questions
+
+
+class Command(BaseCommand):
+    help = "TestQuestion (test -> savollar) indeksini qayta quradi."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--test", type=int, action="append", dest="tests", help="Test ID"
+        )
+        parser.add_argument("--batch-size", type=int, default=100)
+
+    def handle(self, *args, **opts):
+        ids = opts["tests"] or list(
+            Test.objects.order_by("id").values_list("id", flat=True)
+        )
+        size = max(1, opts["batch_size"])
+        total = 0
+        for i in range(0, len(ids), size):
+            total += rebuild_test_questions(ids[i : i + size])
+        self.stdout.write(
+            self.style.SUCCESS(f"{len(ids)} test, {total} savol indekslandi.")
+        )
@@ -0,0 +1,129 @@
+# Generated by Django 5.2.6 on 2026-10-16 22:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Indeks holati shu migratsiyada qotirilgan: app kodi (`index_rows`) keyin
+# o'zgarsa ham migratsiya bir xil natija beradi. Tartib: section/passage,
+# set, question id; savol testda birinchi uchragan joyida sanaladi.
+_INDEX_SQL = """
+WITH flat AS (
+    SELECT t.id AS test_id,
+           s.{section} AS section_id,
+           sq.questionset_id AS qset_id,
+           q.question_id,
+           DENSE_RANK() OVER (PARTITION BY t.id ORDER BY s.{section}) AS section_no
+    FROM test_table t
+    JOIN {sections} s ON s.{parent} = t.{parent}
+    LEFT JOIN {section_sets} sq ON sq.{section} = s.{section}
+    LEFT JOIN tests_questionset_questions q ON q.questionset_id = sq.questionset_id
+), firsts AS (
+    SELECT DISTINCT ON (test_id, question_id)
+           test_id, question_id, section_id, qset_id, section_no
+    FROM flat
+    WHERE question_id IS NOT NULL
+    ORDER BY test_id, question_id, section_id, qset_id
+)
+INSERT INTO test_questions (test_id, question_id, module, section_no, "order")
+SELECT test_id, question_id, '{module}', section_no,
+       ROW_NUMBER() OVER (
+           PARTITION BY test_id ORDER BY section_id, qset_id, question_id
+       )
+FROM firsts
+"""
+
+POPULATE_SQL = [
+    _INDEX_SQL.format(
+        module="listening",
+        parent="listening_id",
+        sections="listening_sections",
+        section="listeningsection_id",
+        section_sets="listening_section_questions_set",
+    ),
+    _INDEX_SQL.format(
+        module="reading",
+        parent="reading_id",
+        sections="reading_passages",
+        section="readingpassage_id",
+        section_sets="reading_passage_questions_set",
+    ),
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tests", "0009_alter_listeningsection_name"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TestQuestion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "module",
+                    models.CharField(
+                        choices=[("listening", "Listening"), ("reading", "Reading")],
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "section_no",
+                    models.PositiveSmallIntegerField(
+                        help_text="Section/passage tartib raqami (1 dan)."
+                    ),
+                ),
+                (
+                    "order",
+                    models.PositiveSmallIntegerField(
+                        help_text="Modul ichidagi tartib raqami (1 dan)."
+                    ),
+                ),
+                (
+                    "question",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="test_index",
+                        to="tests.question",
+                    ),
+                ),
+                (
+                    "test",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="question_index",
+                        to="tests.test",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Test question",
+                "verbose_name_plural": "Test questions",
+                "db_table": "test_questions",
+                "ordering": ("test", "module", "order"),
+                "indexes": [
+                    models.Index(
+                        fields=["test", "module", "order"],
+                        name="tq_test_module_order_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("test", "module", "question"),
+                        name="uniq_test_module_question",
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(POPULATE_SQL, migrations.RunSQL.noop),
+    ]
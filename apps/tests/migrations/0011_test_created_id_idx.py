@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-16 22:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tests", "0010_test_question_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="test",
+            index=models.Index(fields=["created_at", "id"], name="test_created_id_idx"),
+        ),
+    ]
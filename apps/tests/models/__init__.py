@@ -3,3 +3,4 @@ from .question import Question, QuestionSet, QuestionType
 from .ielts import Test
 from .listening import Listening, ListeningSection
 from .reading import Reading, ReadingPassage
+from .test_question import TestQuestion
@@ -36,6 +36,10 @@ class Test(models.Model):
         verbose_name_plural = _("Tests")
         verbose_name = _("Test")
         ordering = ["created_at"]
+        indexes = [
+            # katalog keyset pagination: (created_at, id)
+            models.Index(fields=["created_at", "id"], name="test_created_id_idx"),
+        ]
 
     def __str__(self):
         return self.title
@@ -0,0 +1,51 @@
+#  apps/tests/models/test_question.py
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from .ielts import Test
+from .question import Question
+
+
+class TestQuestion(models.Model):
+    """
+    Denormallashtirilgan indeks: testdagi barcha savollar bitta jadvalda.
+    `signals_m2m` orqali yangilanadi, `rebuild_test_questions` buyrug'i
+    bilan to'liq qayta quriladi.
+    """
+
+    class Module(models.TextChoices):
+        LISTENING = "listening", _("Listening")
+        READING = "reading", _("Reading")
+
+    test = models.ForeignKey(
+        Test, on_delete=models.CASCADE, related_name="question_index"
+    )
+    question = models.ForeignKey(
+        Question, on_delete=models.CASCADE, related_name="test_index"
+    )
+    module = models.CharField(max_length=10, choices=Module.choices)  # type: ignore[attr-defined]
+    section_no = models.PositiveSmallIntegerField(
+        help_text=_("Section/passage tartib raqami (1 dan).")
+    )
+    order = models.PositiveSmallIntegerField(
+        help_text=_("Modul ichidagi tartib raqami (1 dan).")
+    )
+
+    class Meta:
+        verbose_name = _("Test question")
+        verbose_name_plural = _("Test questions")
+        db_table = "test_questions"
+        ordering = ("test", "module", "order")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["test", "module", "question"], name="uniq_test_module_question"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["test", "module", "order"], name="tq_test_module_order_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.test_id} {self.module} #{self.order}: {self.question_id}"  # type: ignore[attr-defined]
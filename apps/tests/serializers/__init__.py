@@ -1,4 +1,7 @@
 #  app/apps/tests/serializers/__init__.py
+from urllib.parse import urljoin
+
+from django.conf import settings
 from rest_framework import serializers
 from apps.tests.models.ielts import Test
 from apps.tests.models.listening import Listening, ListeningSection
@@ -7,6 +10,21 @@ from apps.tests.models.writing import Writing, TaskOne, TaskTwo
 from apps.tests.models.question import Question, QuestionSet
 
 
+class MediaURLField(serializers.FileField):
+    """Request bo'lmasa (snapshot) URL `MEDIA_BASE_URL` bilan absolyut qilinadi."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("read_only", True)
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        url = super().to_representation(value)
+        base = getattr(settings, "MEDIA_BASE_URL", "")
+        if url and base and "request" not in self.context:
+            return urljoin(base, url)
+        return url
+
+
 class QuestionSerializer(serializers.ModelSerializer):
     class Meta:
         model = Question
@@ -38,6 +56,7 @@ class QuestionSetDetailSerializer(serializers.ModelSerializer):
 
 
 class ListeningSectionSummarySerializer(serializers.ModelSerializer):
+    mp3_file = MediaURLField()
     question_set_ids = serializers.PrimaryKeyRelatedField(
         many=True, read_only=True, source="questions_set"
     )
@@ -74,6 +93,8 @@ class ReadingDetailSerializer(serializers.ModelSerializer):
 
 
 class TaskOneSerializer(serializers.ModelSerializer):
+    image = MediaURLField()
+
     class Meta:
         model = TaskOne
         fields = ["id", "topic", "image_title", "image"]
@@ -117,3 +138,78 @@ class TestDetailSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
         ]
+
+
+class QuestionBundleSerializer(QuestionSerializer):
+    """`include_answers=False` contextda answer kalitlarini olib tashlaydi."""
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self.context.get("include_answers", True):
+            fields.pop("answer_dict", None)
+            fields.pop("answer_list", None)
+        return fields
+
+
+class QuestionSetBundleSerializer(serializers.ModelSerializer):
+    questions = QuestionBundleSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = QuestionSet
+        fields = ["id", "name", "questions"]
+
+
+class ListeningSectionBundleSerializer(serializers.ModelSerializer):
+    mp3_file = MediaURLField()
+    question_sets = QuestionSetBundleSerializer(
+        many=True, read_only=True, source="questions_set"
+    )
+
+    class Meta:
+        model = ListeningSection
+        fields = ["id", "name", "mp3_file", "question_sets"]
+
+
+class ListeningBundleSerializer(serializers.ModelSerializer):
+    sections = ListeningSectionBundleSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Listening
+        fields = ["id", "title", "sections"]
+
+
+class ReadingPassageBundleSerializer(serializers.ModelSerializer):
+    question_sets = QuestionSetBundleSerializer(
+        many=True, read_only=True, source="questions_set"
+    )
+
+    class Meta:
+        model = ReadingPassage
+        fields = ["id", "name", "passage", "question_sets"]
+
+
+class ReadingBundleSerializer(serializers.ModelSerializer):
+    passages = ReadingPassageBundleSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Reading
+        fields = ["id", "title", "passages"]
+
+
+class TestBundleSerializer(serializers.ModelSerializer):
+    listening = ListeningBundleSerializer(read_only=True)
+    reading = ReadingBundleSerializer(read_only=True)
+    writing = WritingDetailSerializer(read_only=True)
+
+    class Meta:
+        model = Test
+        fields = [
+            "id",
+            "title",
+            "price",
+            "listening",
+            "reading",
+            "writing",
+            "created_at",
+            "updated_at",
+        ]
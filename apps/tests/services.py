@@ -0,0 +1,196 @@
+# apps/tests/services.py
+from __future__ import annotations
+
+from typing import Iterable, List, Set
+
+from django.db import transaction
+from django.db.models import Prefetch, Q
+from django.utils import timezone
+
+from .models import (
+    Test,
+    Listening,
+    ListeningSection,
+    Reading,
+    ReadingPassage,
+    Writing,
+    TaskOne,
+    TaskTwo,
+    QuestionSet,
+    Question,
+    TestQuestion,
+)
+
+__all__ = (
+    "LISTENING_PREFETCH",
+    "READING_PREFETCH",
+    "TEST_LOOKUPS",
+    "test_detail_queryset",
+    "test_bundle_queryset",
+    "test_questions_queryset",
+    "affected_test_ids",
+    "touch_tests",
+    "rebuild_test_questions",
+)
+
+LISTENING_PREFETCH = Prefetch(
+    "listening__sections",
+    queryset=ListeningSection.objects.all()
+    .only("id", "name", "mp3_file")
+    .prefetch_related("questions_set"),
+)
+READING_PREFETCH = Prefetch(
+    "reading__passages",
+    queryset=ReadingPassage.objects.all()
+    .only("id", "name")
+    .prefetch_related("questions_set"),
+)
+
+QUESTION_SETS_PREFETCH = Prefetch(
+    "questions_set",
+    queryset=QuestionSet.objects.order_by("id").prefetch_related(
+        Prefetch("questions", queryset=Question.objects.order_by("id"))
+    ),
+)
+
+
+# Model -> Test ustidagi lookup(lar). Content o'zgarganda qaysi testlarga
+# ta'sir qilishini topish uchun ishlatiladi (snapshot, index va h.k.).
+TEST_LOOKUPS = {
+    Test: ("pk",),
+    Listening: ("listening",),
+    ListeningSection: ("listening__sections",),
+    Reading: ("reading",),
+    ReadingPassage: ("reading__passages",),
+    Writing: ("writing",),
+    TaskOne: ("writing__task_one",),
+    TaskTwo: ("writing__task_one", "writing__task_two"),
+    QuestionSet: (
+        "listening__sections__questions_set",
+        "reading__passages__questions_set",
+    ),
+    Question: (
+        "listening__sections__questions_set__questions",
+        "reading__passages__questions_set__questions",
+    ),
+}
+
+
+def test_detail_queryset():
+    return Test.objects.select_related(
+        "writing__task_one", "writing__task_two", "listening", "reading"
+    ).prefetch_related(LISTENING_PREFETCH, READING_PREFETCH)
+
+
+def test_bundle_queryset():
+    # 7 ta so'rov: test + (section/passage, set, question) x 2
+    return Test.objects.select_related(
+        "writing__task_one", "writing__task_two", "listening", "reading"
+    ).prefetch_related(
+        Prefetch(
+            "listening__sections",
+            queryset=ListeningSection.objects.order_by("id").prefetch_related(
+                QUESTION_SETS_PREFETCH
+            ),
+        ),
+        Prefetch(
+            "reading__passages",
+            queryset=ReadingPassage.objects.order_by("id").prefetch_related(
+                QUESTION_SETS_PREFETCH
+            ),
+        ),
+    )
+
+
+def test_questions_queryset(test_id: int):
+    # TestQuestion indeksi orqali: 5 ta M2M join o'rniga bitta indeksli so'rov
+    return Question.objects.filter(
+        id__in=TestQuestion.objects.filter(test_id=test_id).values("question_id")
+    )
+
+
+def affected_test_ids(model, pks: Iterable) -> Set[int]:
+    pks = [pk for pk in pks if pk is not None]
+    lookups = TEST_LOOKUPS.get(model)
+    if not pks or not lookups:
+        return set()
+    if model is Test:
+        return set(pks)
+
+    cond = Q()
+    for lookup in lookups:
+        cond |= Q(**{f"{lookup}__in": pks})
+    return set(Test.objects.filter(cond).values_list("id", flat=True).distinct())
+
+
+def touch_tests(test_ids: Iterable[int]) -> None:
+    """`Test.updated_at` — content versiyasi (keshlar shunga tayanadi)."""
+    ids = list(test_ids)
+    if ids:
+        Test.objects.filter(pk__in=ids).update(updated_at=timezone.now())
+
+
+_INDEX_PATHS = (
+    (
+        "listening",
+        "listening__sections",
+        "listening__sections__questions_set",
+        "listening__sections__questions_set__questions",
+    ),
+    (
+        "reading",
+        "reading__passages",
+        "reading__passages__questions_set",
+        "reading__passages__questions_set__questions",
+    ),
+)
+
+
+def index_rows(test_model, index_model, test_ids: List[int]) -> List:
+    """
+    `TestQuestion` qatorlarini hisoblaydi. Tartib: section/passage, set,
+    question id.
+    """
+    rows = []
+    for module, section, qset, question in _INDEX_PATHS:
+        flat = (
+            test_model.objects.filter(pk__in=test_ids)
+            .order_by("id", section, qset, question)
+            .values_list("id", section, question)
+        )
+        # test_id -> (oxirgi section, section_no, order, ko'rilgan savollar)
+        state = {}
+        for test_id, section_id, question_id in flat:
+            if section_id is None:
+                continue
+            last_section, section_no, order, seen = state.get(
+                test_id, (None, 0, 0, set())
+            )
+            if section_id != last_section:
+                section_no += 1
+            if question_id is not None and question_id not in seen:
+                order += 1
+                seen.add(question_id)
+                rows.append(
+                    index_model(
+                        test_id=test_id,
+                        question_id=question_id,
+                        module=module,
+                        section_no=section_no,
+                        order=order,
+                    )
+                )
+            state[test_id] = (section_id, section_no, order, seen)
+    return rows
+
+
+@transaction.atomic
+def rebuild_test_questions(test_ids: Iterable[int]) -> int:
+    """`TestQuestion` indeksini berilgan testlar uchun qayta quradi."""
+    ids = sorted(set(test_ids))
+    if not ids:
+        return 0
+    rows = index_rows(Test, TestQuestion, ids)
+    TestQuestion.objects.filter(test_id__in=ids).delete()
+    TestQuestion.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
@@ -4,7 +4,10 @@ from django.db.models.signals import m2m_changed
 from django.dispatch import receiver
 
 from .models.listening import Listening, ListeningSection
+from .models.question import QuestionSet
 from .models.reading import Reading, ReadingPassage
+from .services import affected_test_ids
+from .signals_snapshot import schedule_refresh
 
 
 @receiver(m2m_changed, sender=Listening.sections.through)
@@ -49,3 +52,39 @@ def limit_passage_question_sets(
             raise ValidationError(
                 "Passage ichida maksimal 3 ta question set bo‘lishi mumkin."
             )
+
+
+@receiver(
+    m2m_changed,
+    sender=Listening.sections.through,
+    dispatch_uid="sync_listening_sections",
+)
+@receiver(
+    m2m_changed,
+    sender=ListeningSection.questions_set.through,
+    dispatch_uid="sync_section_question_sets",
+)
+@receiver(
+    m2m_changed,
+    sender=Reading.passages.through,
+    dispatch_uid="sync_reading_passages",
+)
+@receiver(
+    m2m_changed,
+    sender=ReadingPassage.questions_set.through,
+    dispatch_uid="sync_passage_question_sets",
+)
+@receiver(
+    m2m_changed,
+    sender=QuestionSet.questions.through,
+    dispatch_uid="sync_question_set_questions",
+)
+def sync_test_content(sender, instance, action, model, pk_set, **kwargs):
+    """TestQuestion indeksi, content versiyasi va snapshotlarni yangilaydi."""
+    # pre_remove/pre_clear: bog'lanish hali bor, ta'sir qiladigan testlarni
+    # topish mumkin; qayta qurish baribir commit'dan keyin bo'ladi.
+    if action not in {"post_add", "pre_remove", "pre_clear"}:
+        return
+    ids = affected_test_ids(type(instance), [instance.pk])
+    ids |= affected_test_ids(model, pk_set or [])
+    schedule_refresh(ids)
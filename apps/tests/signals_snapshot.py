@@ -0,0 +1,101 @@
+# apps/tests/signals_snapshot.py
+import logging
+
+from django.db import transaction
+from django.db.models.signals import post_save, pre_delete
+
+from .models import (
+    Test,
+    Listening,
+    ListeningSection,
+    Reading,
+    ReadingPassage,
+    Writing,
+    TaskOne,
+    TaskTwo,
+    QuestionSet,
+    Question,
+)
+from .services import affected_test_ids, touch_tests, rebuild_test_questions
+from .snapshots import refresh_snapshots
+
+log = logging.getLogger(__name__)
+
+CONTENT_MODELS = (
+    Test,
+    Listening,
+    ListeningSection,
+    Reading,
+    ReadingPassage,
+    Writing,
+    TaskOne,
+    TaskTwo,
+    QuestionSet,
+    Question,
+)
+THROUGH_MODELS = (
+    Listening.sections.through,
+    ListeningSection.questions_set.through,
+    Reading.passages.through,
+    ReadingPassage.questions_set.through,
+    QuestionSet.questions.through,
+)
+
+
+def _refresh(test_ids):
+    # Versiya (`updated_at`) indeks bilan bitta tranzaksiyada, indeks tayyor
+    # bo'lgandan keyin yangilanadi: oraliqda kelgan baholash eski kalitni
+    # eski versiya ostida oladi, yangi versiya esa doim yangi indeksni ko'radi.
+    try:
+        with transaction.atomic():
+            rebuild_test_questions(test_ids)
+            touch_tests(test_ids)
+    except Exception:
+        # content allaqachon commit bo'lgan — so'rov 500 bermasin
+        log.exception("TestQuestion rebuild failed for tests %s", test_ids)
+    refresh_snapshots(test_ids)
+
+
+def schedule_refresh(test_ids):
+    """
+    Content o'zgardi: `TestQuestion` indeksi, versiya va snapshotlar
+    commit'dan keyin yangilanadi.
+    """
+    if test_ids:
+        ids = sorted(test_ids)
+        transaction.on_commit(lambda: _refresh(ids))
+
+
+def through_test_ids(instance):
+    ids = set()
+    for f in instance._meta.fields:
+        if f.is_relation:
+            ids |= affected_test_ids(f.related_model, [getattr(instance, f.attname)])
+    return ids
+
+
+def content_saved(sender, instance, **kwargs):
+    schedule_refresh(affected_test_ids(sender, [instance.pk]))
+
+
+def content_deleting(sender, instance, **kwargs):
+    # pre_delete: bog'lanishlar hali o'chmagan, testlarni topish mumkin
+    schedule_refresh(affected_test_ids(sender, [instance.pk]))
+
+
+def through_changed(sender, instance, **kwargs):
+    schedule_refresh(through_test_ids(instance))
+
+
+for _model in CONTENT_MODELS:
+    post_save.connect(
+        content_saved, sender=_model, dispatch_uid=f"snap_save_{_model.__name__}"
+    )
+    pre_delete.connect(
+        content_deleting, sender=_model, dispatch_uid=f"snap_del_{_model.__name__}"
+    )
+
+for _through in THROUGH_MODELS:
+    uid = _through._meta.db_table
+    post_save.connect(through_changed, sender=_through, dispatch_uid=f"snap_ts_{uid}")
+    pre_delete.connect(through_changed, sender=_through, dispatch_uid=f"snap_td_{uid}")
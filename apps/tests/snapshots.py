@@ -0,0 +1,171 @@
+# apps/tests/snapshots.py
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Optional
+
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+from rest_framework.renderers import JSONRenderer
+
+from apps.core.cache import cache_timeout
+
+from .serializers import TestDetailSerializer, TestBundleSerializer
+from .services import test_detail_queryset, test_bundle_queryset
+
+log = logging.getLogger(__name__)
+
+__all__ = (
+    "Snapshot",
+    "snapshot_builder",
+    "get_snapshot",
+    "build_snapshot",
+    "refresh_snapshots",
+    "snapshot_response",
+)
+
+# Serializer shakli o'zgarsa shu raqamni oshiring — eski snapshotlar
+# avtomatik eskiradi.
+SNAPSHOT_VERSION = 3
+# Signal orqali yangilanadi; locmem'da boshqa worker'lar signalni ko'rmaydi,
+# shuning uchun u yerda qisqa TTL.
+SNAPSHOT_TIMEOUT = 60 * 60 * 24
+SNAPSHOT_LOCAL_TIMEOUT = 60
+# Muddati o'tgan snapshot bitta so'rov qayta qurguncha shuncha vaqt beriladi
+SNAPSHOT_STALE_GRACE = 60
+# Qayta qurish qulfi (cache.add); qurayotgan jarayon o'lsa shundan keyin bo'shaydi
+SNAPSHOT_LOCK_TIMEOUT = 30
+# Sovuq miss'da boshqa so'rov qurayotgan snapshot'ni kutish
+SNAPSHOT_WAIT_SECONDS = 2.0
+SNAPSHOT_WAIT_STEP = 0.05
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    body: bytes
+    etag: str
+
+
+_BUILDERS: Dict[str, Callable[[int], Optional[dict]]] = {}
+
+
+def snapshot_builder(kind: str):
+    def register(fn: Callable[[int], Optional[dict]]):
+        _BUILDERS[kind] = fn
+        return fn
+
+    return register
+
+
+def _key(kind: str, test_id: int) -> str:
+    return f"tests:snapshot:v{SNAPSHOT_VERSION}:{kind}:{test_id}"
+
+
+@snapshot_builder("detail")
+def _build_detail(test_id: int) -> Optional[dict]:
+    test = test_detail_queryset().filter(pk=test_id).first()
+    if test is None:
+        return None
+    return TestDetailSerializer(test).data
+
+
+def _build_bundle(test_id: int, include_answers: bool) -> Optional[dict]:
+    test = test_bundle_queryset().filter(pk=test_id).first()
+    if test is None:
+        return None
+    return TestBundleSerializer(test, context={"include_answers": include_answers}).data
+
+
+@snapshot_builder("bundle")
+def _build_bundle_full(test_id: int) -> Optional[dict]:
+    return _build_bundle(test_id, include_answers=True)
+
+
+@snapshot_builder("bundle_public")
+def _build_bundle_public(test_id: int) -> Optional[dict]:
+    return _build_bundle(test_id, include_answers=False)
+
+
+def _lock_key(kind: str, test_id: int) -> str:
+    return _key(kind, test_id) + ":lock"
+
+
+def build_snapshot(kind: str, test_id: int) -> Optional[Snapshot]:
+    data = _BUILDERS[kind](test_id)
+    if data is None:
+        cache.delete(_key(kind, test_id))
+        return None
+
+    body = JSONRenderer().render(data)
+    etag = '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+    fresh = cache_timeout(SNAPSHOT_TIMEOUT, local=SNAPSHOT_LOCAL_TIMEOUT)
+    # kesh yozuvi `fresh`dan biroz uzoqroq yashaydi: eskirgan nusxa qayta
+    # qurilayotganda boshqa so'rovlarga beriladi
+    cache.set(
+        _key(kind, test_id),
+        (body, etag, time.time() + fresh),
+        timeout=fresh + SNAPSHOT_STALE_GRACE,
+    )
+    return Snapshot(body=body, etag=etag)
+
+
+def _build_locked(kind: str, test_id: int) -> Optional[Snapshot]:
+    try:
+        return build_snapshot(kind, test_id)
+    finally:
+        cache.delete(_lock_key(kind, test_id))
+
+
+def get_snapshot(kind: str, test_id: int) -> Optional[Snapshot]:
+    """
+    Keshdan snapshot. Qayta qurishni faqat `cache.add` qulfini olgan bitta
+    so'rov bajaradi: muddati o'tgan bo'lsa qolganlar eski nusxani oladi,
+    umuman yo'q bo'lsa qisqa kutadi (imtihon boshlanganda hamma bir vaqtda
+    miss qilganda bir xil snapshot'ni qayta-qayta qurmaslik uchun).
+    """
+    key = _key(kind, test_id)
+    cached = cache.get(key)
+    if cached is not None:
+        body, etag, fresh_until = cached
+        if fresh_until > time.time() or not cache.add(
+            _lock_key(kind, test_id), 1, timeout=SNAPSHOT_LOCK_TIMEOUT
+        ):
+            return Snapshot(body, etag)
+        return _build_locked(kind, test_id)
+
+    if cache.add(_lock_key(kind, test_id), 1, timeout=SNAPSHOT_LOCK_TIMEOUT):
+        return _build_locked(kind, test_id)
+    deadline = time.monotonic() + SNAPSHOT_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(SNAPSHOT_WAIT_STEP)
+        cached = cache.get(key)
+        if cached is not None:
+            return Snapshot(*cached[:2])
+    # quruvchi juda sekin (yoki test yo'q) — o'zimiz quramiz
+    return build_snapshot(kind, test_id)
+
+
+def refresh_snapshots(test_ids: Iterable[int]) -> None:
+    for test_id in test_ids:
+        for kind in _BUILDERS:
+            try:
+                build_snapshot(kind, test_id)
+            except Exception as e:  # noqa
+                # Qayta qurib bo'lmasa eskisini o'chiramiz — keyingi so'rov
+                # uni lazily quradi.
+                log.warning("Snapshot %s/%s rebuild failed: %s", kind, test_id, e)
+                cache.delete(_key(kind, test_id))
+
+
+def snapshot_response(request, snap: Snapshot) -> HttpResponse:
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH", "")
+    if snap.etag in {t.strip() for t in if_none_match.split(",")}:
+        resp = HttpResponseNotModified()
+    else:
+        resp = HttpResponse(snap.body, content_type="application/json")
+    resp["ETag"] = snap.etag
+    resp["Cache-Control"] = "no-cache"
+    return resp
@@ -1,32 +1,23 @@
 # apps/tests/views.py
-from django.db.models import Count, Prefetch
+from django.db.models import Count
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse
 from rest_framework import viewsets, mixins, permissions, filters
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, PermissionDenied
 
+from apps.core.pagination import KeysetPagination
 from apps.tests.models.ielts import Test
-from apps.tests.models.listening import ListeningSection
 from apps.tests.models.question import QuestionSet
-from apps.tests.models.reading import ReadingPassage
 from apps.tests.serializers import (
     TestListSerializer,
     TestDetailSerializer,
+    TestBundleSerializer,
     QuestionSetSummarySerializer,
     QuestionSetDetailSerializer,
 )
-
-LISTENING_PREFETCH = Prefetch(
-    "listening__sections",
-    queryset=ListeningSection.objects.all()
-    .only("id", "name", "mp3_file")
-    .prefetch_related("questions_set"),
-)
-READING_PREFETCH = Prefetch(
-    "reading__passages",
-    queryset=ReadingPassage.objects.all()
-    .only("id", "name")
-    .prefetch_related("questions_set"),
-)
+from apps.tests.services import test_detail_queryset
+from apps.tests.snapshots import get_snapshot, snapshot_response
 
 
 @extend_schema(
@@ -34,7 +25,8 @@ READING_PREFETCH = Prefetch(
     summary="IELTS testlari ro'yxati",
     description=(
         "Barcha mavjud testlar. `ordering` parametri qo'llab-quvvatlanadi "
-        "(`created_at` yoki `title`). Bo'sh bo'lsa ham `200 OK` va `[]` qaytadi."
+        "(`created_at` yoki `title`). Keyset (cursor) pagination: keyingi "
+        "sahifa `next` orqali olinadi, `count=false` COUNT(*) ni o'chiradi."
     ),
     parameters=[
         OpenApiParameter(
@@ -52,18 +44,16 @@ class TestViewSet(
     mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet
 ):
     permission_classes = [permissions.AllowAny]
+    pagination_class = KeysetPagination
     filter_backends = [filters.OrderingFilter]
     ordering_fields = ["created_at", "title"]
     ordering = ["-created_at"]
     lookup_value_regex = r"\d+"
 
     def get_queryset(self):
-        base = Test.objects.all()
         if getattr(self, "action", None) == "list":
-            return base.only("id", "title", "price", "created_at")
-        return base.select_related(
-            "writing__task_one", "writing__task_two", "listening", "reading"
-        ).prefetch_related(LISTENING_PREFETCH, READING_PREFETCH)
+            return Test.objects.only("id", "title", "price", "created_at")
+        return test_detail_queryset()
 
     def get_serializer_class(self):
         return (
@@ -85,11 +75,56 @@ class TestViewSet(
     @extend_schema(
         responses={
             200: OpenApiResponse(response=TestDetailSerializer, description="OK"),
+            304: OpenApiResponse(description="Not Modified (If-None-Match)"),
             404: OpenApiResponse(description="Not Found"),
-        }
+        },
+        description=(
+            "Oldindan tayyorlangan JSON snapshot qaytaradi (`ETag` bilan). "
+            "Media URL'lar `MEDIA_BASE_URL` asosida absolyut."
+        ),
     )
     def retrieve(self, request, *args, **kwargs):
-        return super().retrieve(request, *args, **kwargs)
+        snap = get_snapshot("detail", int(kwargs[self.lookup_field]))
+        if snap is None:
+            raise NotFound()
+        return snapshot_response(request, snap)
+
+    @extend_schema(
+        summary="Butun imtihon (test + barcha question set'lar) bitta javobda",
+        description=(
+            "Test, har bir section/passage ichidagi barcha `QuestionSet` va "
+            "`Question`lar bitta javobda qaytadi (25 ta alohida so'rov o'rniga). "
+            "`answer_dict`/`answer_list` faqat `answers=true` va staff "
+            "foydalanuvchi uchun qaytariladi. "
+            "Javob butunlay keshlanadi va `ETag` bilan qaytadi."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="answers",
+                type=OpenApiTypes.BOOL,
+                location="query",
+                description="Javob kalitlarini qo'shish (faqat staff, default: false)",
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(response=TestBundleSerializer, description="OK"),
+            304: OpenApiResponse(description="Not Modified (If-None-Match)"),
+            403: OpenApiResponse(description="answers=true faqat staff uchun"),
+            404: OpenApiResponse(description="Not Found"),
+        },
+    )
+    @action(detail=True, methods=["get"], url_path="bundle")
+    def bundle(self, request, *args, **kwargs):
+        answers = request.query_params.get("answers", "false").lower()
+        kind = "bundle_public"
+        if answers in {"1", "true", "yes"}:
+            if not request.user.is_staff:
+                raise PermissionDenied("Javob kalitlari faqat staff uchun.")
+            kind = "bundle"
+        snap = get_snapshot(kind, int(kwargs[self.lookup_field]))
+        if snap is None:
+            raise NotFound()
+        return snapshot_response(request, snap)
 
 
 @extend_schema(
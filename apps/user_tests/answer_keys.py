@@ -0,0 +1,192 @@
+#  apps/user_tests/answer_keys.py
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+from apps.tests.models.ielts import Test
+from apps.tests.models.question import QuestionType
+from apps.tests.services import test_questions_queryset
+
+__all__ = (
+    "normalize_text",
+    "CompiledAnswer",
+    "AnswerKeyIndex",
+    "compile_answer",
+    "get_answer_key",
+)
+
+# Bitta worker xotirasida saqlanadigan testlar soni (LRU)
+ANSWER_KEY_CACHE_SIZE = 128
+
+_SPACES_RE = re.compile(r"\s+")
+_EDGE_PUNCT = " .,;:!?\"'`()[]"
+
+_TFNG_ALIASES = {
+    "t": "true",
+    "f": "false",
+    "y": "yes",
+    "n": "no",
+    "ng": "not given",
+    "notgiven": "not given",
+    "not-given": "not given",
+}
+
+
+def normalize_text(value: Any) -> str:
+    if value is None:
+        return ""
+    text = _SPACES_RE.sub(" ", str(value)).strip(_EDGE_PUNCT)
+    return text.casefold()
+
+
+def _norm_choice(value: Any) -> str:
+    # "A", "a)", "(A)", " iv " kabi variantlar bir xil deb olinadi
+    return normalize_text(value).replace(" ", "")
+
+
+def _norm_tfng(value: Any) -> str:
+    text = normalize_text(value)
+    return _TFNG_ALIASES.get(text, text)
+
+
+Normalizer = Callable[[Any], str]
+
+# QuestionType -> normalizer: kalit ham, javob ham shu orqali solishtiriladi
+STRATEGIES: Dict[str, Normalizer] = {
+    QuestionType.R_YES_NO_NOT_GIVEN: _norm_tfng,
+    QuestionType.R_TRUE_FALSE_NOT_GIVEN: _norm_tfng,
+    QuestionType.R_MULTIPLE_CHOICE: _norm_choice,
+    QuestionType.R_MATCHING_INFORMATION: _norm_choice,
+    QuestionType.R_MATCHING_HEADINGS: _norm_choice,
+    QuestionType.R_MATCHING_FEATURES: _norm_choice,
+    QuestionType.R_MATCHING_SENTENCE_ENDINGS: _norm_choice,
+    QuestionType.R_SENTENCE_COMPLETION: normalize_text,
+    QuestionType.R_SUMMARY_COMPLETION: normalize_text,
+    QuestionType.R_SHORT_ANSWER: normalize_text,
+    QuestionType.R_DIAGRAM_COMPLETION: normalize_text,
+    QuestionType.L_MULTIPLE_CHOICE: _norm_choice,
+    QuestionType.L_MATCHING_HEADINGS: _norm_choice,
+    QuestionType.L_DIAGRAM_LABELLING: normalize_text,
+    QuestionType.L_FORM_COMPLETION: normalize_text,
+    QuestionType.L_SENTENCE_COMPLETION: normalize_text,
+    QuestionType.L_SHORT_ANSWER: normalize_text,
+}
+MULTI_SELECT_TYPES = {QuestionType.R_MULTIPLE_CHOICE, QuestionType.L_MULTIPLE_CHOICE}
+
+
+def _alternatives(expected: Any) -> List[Any]:
+    return list(expected) if isinstance(expected, (list, tuple)) else [expected]
+
+
+def _expected_set(normalize: Normalizer, expected: Any) -> FrozenSet[str]:
+    return frozenset(filter(None, (normalize(x) for x in _alternatives(expected))))
+
+
+@dataclass(frozen=True)
+class CompiledAnswer:
+    """Oldindan normallashtirilgan javob kaliti (bitta `Question` uchun)."""
+
+    question_type: str
+    normalize: Normalizer
+    parts: Tuple[Tuple[str, FrozenSet[str]], ...] = ()
+    choices: FrozenSet[str] = frozenset()
+    alternatives: FrozenSet[str] = frozenset()
+
+    @property
+    def total(self) -> int:
+        if self.parts:
+            return len(self.parts)
+        if self.choices:
+            return len(self.choices)
+        return 1 if self.alternatives else 0
+
+    def grade(self, raw_answer: Any) -> Tuple[int, int]:
+        normalize = self.normalize
+        if self.parts:
+            given = raw_answer if isinstance(raw_answer, dict) else {}
+            correct = sum(
+                1 for key, exp in self.parts if normalize(given.get(key)) in exp
+            )
+            return correct, len(self.parts)
+
+        if self.choices:
+            chosen = {normalize(x) for x in _alternatives(raw_answer)}
+            chosen.discard("")
+            if len(chosen) > len(self.choices):
+                return 0, len(self.choices)
+            return len(chosen & self.choices), len(self.choices)
+
+        if self.alternatives:
+            return int(normalize(raw_answer) in self.alternatives), 1
+        return 0, 0
+
+
+def compile_answer(
+    question_type: str, answer_dict: Optional[dict], answer_list: Optional[list]
+) -> CompiledAnswer:
+    """
+    - `answer_dict`: {kalit: javob | [muqobil javoblar]} — har bir kalit 1 ball,
+      `raw_answer` ham shu kalitlar bilan dict bo'ladi.
+    - `answer_list` (multiple choice, >1 element): "choose TWO" — har bir
+      to'g'ri harf 1 ball, keragidan ko'p tanlansa 0.
+    - `answer_list` (qolganlari): bitta savol uchun muqobil javoblar.
+    """
+    normalize = STRATEGIES.get(question_type, normalize_text)
+    if answer_dict:
+        return CompiledAnswer(
+            question_type,
+            normalize,
+            parts=tuple(
+                (str(k), _expected_set(normalize, v)) for k, v in answer_dict.items()
+            ),
+        )
+    if question_type in MULTI_SELECT_TYPES and answer_list and len(answer_list) > 1:
+        return CompiledAnswer(
+            question_type, normalize, choices=_expected_set(normalize, answer_list)
+        )
+    return CompiledAnswer(
+        question_type,
+        normalize,
+        alternatives=_expected_set(normalize, answer_list or []),
+    )
+
+
+@dataclass(frozen=True)
+class AnswerKeyIndex:
+    version: Any
+    answers: Mapping[int, CompiledAnswer]
+    totals: Mapping[str, int]  # question_type -> jami ball
+
+
+def get_answer_key(test_id: int) -> AnswerKeyIndex:
+    """
+    Test uchun kompilyatsiya qilingan javob kalitlari. Versiya —
+    `Test.updated_at` (content o'zgarsa signal uni yangilaydi), shuning
+    uchun eski versiyalar LRU orqali o'z-o'zidan chiqib ketadi.
+    """
+    version = (
+        Test.objects.filter(pk=test_id).values_list("updated_at", flat=True).first()
+    )
+    return _compile_answer_key(test_id, version)
+
+
+@lru_cache(maxsize=ANSWER_KEY_CACHE_SIZE)
+def _compile_answer_key(test_id: int, version) -> AnswerKeyIndex:
+    answers: Dict[int, CompiledAnswer] = {}
+    totals: Dict[str, int] = {}
+    rows = test_questions_queryset(test_id).values_list(
+        "id", "question_type", "answer_dict", "answer_list"
+    )
+    for qid, qtype, answer_dict, answer_list in rows:
+        compiled = compile_answer(qtype, answer_dict, answer_list)
+        answers[qid] = compiled
+        totals[qtype] = totals.get(qtype, 0) + compiled.total
+    return AnswerKeyIndex(
+        version=version,
+        answers=MappingProxyType(answers),
+        totals=MappingProxyType(totals),
+    )
@@ -0,0 +1,120 @@
+# apps/user_tests/catalogue.py
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Dict, FrozenSet, List
+
+from django.core.cache import cache
+
+from apps.core.cache import cache_timeout
+from apps.tests.models.ielts import Test
+from .models import UserTest
+from .serializers import TestSerializer
+
+__all__ = (
+    "get_purchased_ids",
+    "forget_purchases",
+    "catalogue_version",
+    "bump_catalogue_version",
+    "catalogue_page",
+    "catalogue_items",
+    "with_purchased",
+)
+
+PURCHASED_TIMEOUT = 60 * 60 * 24
+PURCHASED_LOCAL_TIMEOUT = 60  # locmem: boshqa worker'lar delete'ni ko'rmaydi
+CATALOGUE_TIMEOUT = 60 * 10
+CATALOGUE_LOCAL_TIMEOUT = 30  # locmem: versiya bump'i boshqa worker'da ko'rinmaydi
+_VERSION_KEY = "tests:catalogue:version"
+
+
+# --- Per-user sotib olingan testlar to'plami ---
+
+
+def _purchased_key(user_id) -> str:
+    return f"user_tests:purchased:{user_id}"
+
+
+def get_purchased_ids(user_id) -> FrozenSet[int]:
+    key = _purchased_key(user_id)
+    ids = cache.get(key)
+    if ids is None:
+        ids = frozenset(
+            UserTest.objects.filter(user_id=user_id).values_list("test_id", flat=True)
+        )
+        cache.set(
+            key,
+            ids,
+            timeout=cache_timeout(PURCHASED_TIMEOUT, local=PURCHASED_LOCAL_TIMEOUT),
+        )
+    return ids
+
+
+def forget_purchases(user_id) -> None:
+    """Xariddan keyin: to'plam o'chiriladi, keyingi o'qish DB'dan yuklaydi."""
+    cache.delete(_purchased_key(user_id))
+
+
+# --- Umumiy (user'ga bog'liq bo'lmagan) katalog ---
+
+
+def _catalogue_timeout():
+    return cache_timeout(CATALOGUE_TIMEOUT, local=CATALOGUE_LOCAL_TIMEOUT)
+
+
+def catalogue_version() -> int:
+    cache.add(_VERSION_KEY, 1, timeout=None)
+    return cache.get(_VERSION_KEY) or 1
+
+
+def bump_catalogue_version() -> None:
+    try:
+        cache.incr(_VERSION_KEY)
+    except ValueError:
+        cache.set(_VERSION_KEY, 2, timeout=None)
+
+
+def catalogue_page(request, paginator) -> List[Dict[str, Any]]:
+    """
+    Katalog sahifasini keshdan oladi (versiya + cursor + page_size bo'yicha)
+    va `paginator` holatini tiklaydi. `purchased` bu yerda yo'q —
+    `with_purchased` bilan qo'shiladi.
+    """
+    cursor = request.query_params.get(paginator.cursor_query_param, "")
+    key = "tests:catalogue:v%s:page:%s:%s:%d" % (
+        catalogue_version(),
+        hashlib.md5(cursor.encode()).hexdigest(),
+        paginator.get_page_size(request),
+        paginator.want_count(request),
+    )
+    cached = cache.get(key)
+    if cached is None:
+        page = paginator.paginate_queryset(
+            Test.objects.only("id", "title", "price", "created_at"), request
+        )
+        cached = (
+            paginator.count,
+            paginator.next_cursor,
+            list(TestSerializer(page, many=True).data),
+        )
+        cache.set(key, cached, timeout=_catalogue_timeout())
+
+    count, next_cursor, rows = cached
+    paginator.restore(request, count=count, next_cursor=next_cursor)
+    return rows
+
+
+def catalogue_items(limit: int = 0) -> List[Dict[str, Any]]:
+    """Dashboard uchun: `-created_at` bo'yicha `{id, title, price}` ro'yxati."""
+    key = "tests:catalogue:v%s:items:%d" % (catalogue_version(), limit)
+    rows = cache.get(key)
+    if rows is None:
+        qs = Test.objects.order_by("-created_at").values("id", "title", "price")
+        rows = list(qs[:limit] if limit > 0 else qs)
+        cache.set(key, rows, timeout=_catalogue_timeout())
+    return rows
+
+
+def with_purchased(rows: List[Dict[str, Any]], user_id) -> List[Dict[str, Any]]:
+    purchased = get_purchased_ids(user_id)
+    return [{**row, "purchased": row["id"] in purchased} for row in rows]
@@ -0,0 +1,130 @@
+#  apps/user_tests/grading.py
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+
+from apps.tests.models.question import is_listening_type, is_reading_type
+from .answer_keys import compile_answer, get_answer_key
+from .models import UserTest, UserAnswer, TestResult
+from .results import record_scores
+
+__all__ = (
+    "grade_answer",
+    "raw_to_band",
+    "grade_user_test",
+)
+
+RAW_MAX = 40
+
+# (minimal raw ball / 40, band) — kamayish tartibida
+LISTENING_BANDS: Tuple[Tuple[int, float], ...] = (
+    (39, 9.0),
+    (37, 8.5),
+    (35, 8.0),
+    (32, 7.5),
+    (30, 7.0),
+    (26, 6.5),
+    (23, 6.0),
+    (18, 5.5),
+    (16, 5.0),
+    (13, 4.5),
+    (10, 4.0),
+    (8, 3.5),
+    (6, 3.0),
+    (4, 2.5),
+    (3, 2.0),
+    (2, 1.5),
+    (1, 1.0),
+)
+READING_BANDS: Tuple[Tuple[int, float], ...] = (
+    (39, 9.0),
+    (37, 8.5),
+    (35, 8.0),
+    (33, 7.5),
+    (30, 7.0),
+    (27, 6.5),
+    (23, 6.0),
+    (19, 5.5),
+    (15, 5.0),
+    (13, 4.5),
+    (10, 4.0),
+    (8, 3.5),
+    (6, 3.0),
+    (4, 2.5),
+    (3, 2.0),
+    (2, 1.5),
+    (1, 1.0),
+)
+
+
+def grade_answer(
+    question_type: str,
+    answer_dict: Optional[dict],
+    answer_list: Optional[list],
+    raw_answer: Any,
+) -> Tuple[int, int]:
+    """(to'g'ri, jami) ballarni qaytaradi."""
+    return compile_answer(question_type, answer_dict, answer_list).grade(raw_answer)
+
+
+def raw_to_band(correct: int, total: int, table: Iterable[Tuple[int, float]]):
+    if total <= 0:
+        return None
+    raw = round(correct * RAW_MAX / total) if total != RAW_MAX else correct
+    for min_raw, band in table:
+        if raw >= min_raw:
+            return band
+    return 0.0
+
+
+@transaction.atomic
+def grade_user_test(user_test: UserTest) -> TestResult:
+    """
+    Bitta `UserTest`ni bulk tarzda baholaydi: kalitlar kompilyatsiya
+    qilingan indeksdan olinadi, hammasi xotirada tekshiriladi, `is_correct`
+    bitta `bulk_update` bilan yoziladi. So'rovlar soni javoblar soniga
+    bog'liq emas.
+    """
+    index = get_answer_key(user_test.test_id)
+
+    totals: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+    for qtype, marks in index.totals.items():
+        totals[qtype][1] = marks
+
+    answers = list(
+        UserAnswer.objects.filter(user_test=user_test).only(
+            "id", "question_id", "raw_answer", "is_correct"
+        )
+    )
+    changed = []
+    for ans in answers:
+        key = index.answers.get(ans.question_id)
+        if key is None:
+            continue
+        correct, total = key.grade(ans.raw_answer)
+        totals[key.question_type][0] += correct
+        is_correct = (correct == total) if total else None
+        if ans.is_correct != is_correct:
+            ans.is_correct = is_correct
+            changed.append(ans)
+    if changed:
+        UserAnswer.objects.bulk_update(changed, ["is_correct"], batch_size=500)
+
+    l_correct = sum(c for t, (c, _) in totals.items() if is_listening_type(t))
+    l_total = sum(n for t, (_, n) in totals.items() if is_listening_type(t))
+    r_correct = sum(c for t, (c, _) in totals.items() if is_reading_type(t))
+    r_total = sum(n for t, (_, n) in totals.items() if is_reading_type(t))
+
+    return record_scores(
+        user_test_id=user_test.pk,
+        listening=raw_to_band(l_correct, l_total, LISTENING_BANDS),
+        reading=raw_to_band(r_correct, r_total, READING_BANDS),
+        analysis={
+            "listening": {"correct": l_correct, "total": l_total},
+            "reading": {"correct": r_correct, "total": r_total},
+            "by_type": {t: {"correct": c, "total": n} for t, (c, n) in totals.items()},
+        },
+    )
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.6 on 2026-10-16 23:05
+
+from django.db import migrations, models
+
+# Mavjud tekshirilgan writing'lardan sum/count'ni to'ldiramiz
+BACKFILL_SQL = """
+UPDATE test_results tr
+SET writing_sum = s.total, writing_count = s.n
+FROM (
+    SELECT user_test_id, SUM(score) AS total, COUNT(*) AS n
+    FROM teacher_submissions
+    WHERE status = 'checked' AND score IS NOT NULL
+    GROUP BY user_test_id
+) s
+WHERE tr.user_test_id = s.user_test_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user_tests", "0002_alltestsproxy_alter_testresult_options_and_more"),
+        ("teacher_checking", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="testresult",
+            name="writing_count",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="testresult",
+            name="writing_sum",
+            field=models.FloatField(default=0),
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
@@ -110,6 +110,10 @@ class TestResult(models.Model):
     writing_score = models.FloatField(null=True, blank=True)
     overall_score = models.FloatField(null=True, blank=True)
 
+    # writing_score = writing_sum / writing_count (incremental, results.py)
+    writing_sum = models.FloatField(default=0)
+    writing_count = models.PositiveSmallIntegerField(default=0)
+
     feedback = models.TextField(blank=True, default="")
     errors_analysis = models.JSONField(default=dict)
 
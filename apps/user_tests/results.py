@@ -0,0 +1,177 @@
+# apps/user_tests/results.py
+from __future__ import annotations
+
+import json
+import uuid
+from typing import Any, Dict, Iterable, Optional
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.profiles.dashboard import invalidate_student_dashboard
+from apps.teacher_checking.models import TeacherSubmission
+from .models import TestResult
+
+__all__ = (
+    "record_scores",
+    "recompute_writing",
+)
+
+
+def _writing_sql(ws: str, wn: str) -> str:
+    return (
+        f"CASE WHEN {wn} > 0 THEN ROUND(({ws} / {wn})::numeric, 1)::double precision "
+        "ELSE tr.writing_score END"
+    )
+
+
+def _overall_sql(l: str, r: str, w: str) -> str:
+    # IELTS rounding: FLOOR(avg * 2 + 0.5) / 2, faqat mavjud modullar bo'yicha
+    return (
+        f"FLOOR((COALESCE({l}, 0) + COALESCE({r}, 0) + COALESCE({w}, 0))"
+        f" / NULLIF(({l} IS NOT NULL)::int + ({r} IS NOT NULL)::int"
+        f" + ({w} IS NOT NULL)::int, 0) * 2 + 0.5) / 2"
+    )
+
+
+# SET ichida o'ng tomon eski qiymatlarni ko'radi, shuning uchun yangi
+# qiymatlar ifoda sifatida qayta ishlatiladi.
+_L = "COALESCE(%(listening)s::double precision, tr.listening_score)"
+_R = "COALESCE(%(reading)s::double precision, tr.reading_score)"
+_WS = "(tr.writing_sum + %(writing_sum)s::double precision)"
+_WN = "(tr.writing_count + %(writing_count)s::integer)"
+_W = _writing_sql(_WS, _WN)
+
+_UPDATE_SQL = f"""
+UPDATE test_results tr
+SET listening_score = {_L},
+    reading_score = {_R},
+    writing_sum = {_WS},
+    writing_count = {_WN},
+    writing_score = {_W},
+    overall_score = {_overall_sql(_L, _R, _W)},
+    errors_analysis = tr.errors_analysis || %(analysis)s::jsonb,
+    updated_at = %(now)s
+FROM user_tests ut
+WHERE tr.user_test_id = %(user_test_id)s AND ut.id = tr.user_test_id
+RETURNING tr.*, ut.user_id AS owner_id
+"""
+
+_ENSURE_SQL = """
+INSERT INTO test_results (
+    id, user_test_id, writing_sum, writing_count,
+    feedback, errors_analysis, created_at, updated_at
+)
+VALUES (%s, %s, 0, 0, '', '{}'::jsonb, %s, %s)
+ON CONFLICT (user_test_id) DO NOTHING
+"""
+
+
+def _params(user_test_id, listening, reading, writing: Iterable[float], analysis):
+    writing = list(writing)
+    return {
+        "user_test_id": user_test_id,
+        "listening": listening,
+        "reading": reading,
+        "writing_sum": float(sum(writing)),
+        "writing_count": len(writing),
+        "analysis": json.dumps(analysis or {}),
+        "now": timezone.now(),
+    }
+
+
+@transaction.atomic
+def record_scores(
+    *,
+    user_test_id,
+    listening: Optional[float] = None,
+    reading: Optional[float] = None,
+    writing: Iterable[float] = (),
+    analysis: Optional[Dict[str, Any]] = None,
+) -> TestResult:
+    """
+    `TestResult`ni bitta `UPDATE ... RETURNING` bilan yangilaydi:
+
+    - `listening` / `reading` — band (None bo'lsa eskisi qoladi);
+    - `writing` — yangi tekshirilgan task ballari, sum/count'ga qo'shiladi;
+    - `analysis` — `errors_analysis`ga top-level merge.
+
+    `writing_score` va `overall_score` (IELTS rounding) SQL ichida
+    hisoblanadi — read-modify-write yo'q, parallel baholashlar bir-birini
+    yo'qotmaydi. Qator bo'lmasa avval `INSERT ... ON CONFLICT DO NOTHING`.
+    """
+    params = _params(user_test_id, listening, reading, writing, analysis)
+    rows = list(TestResult.objects.raw(_UPDATE_SQL, params))
+    if not rows:
+        with connection.cursor() as cur:
+            cur.execute(
+                _ENSURE_SQL,
+                [uuid.uuid4(), user_test_id, params["now"], params["now"]],
+            )
+        rows = list(TestResult.objects.raw(_UPDATE_SQL, params))
+
+    tr = rows[0]
+    owner_id = tr.owner_id
+    # raw SQL signal yubormaydi — dashboard keshini o'zimiz tozalaymiz
+    transaction.on_commit(lambda: invalidate_student_dashboard(owner_id))
+    return tr
+
+
+_ENSURE_MANY_SQL = """
+INSERT INTO test_results (
+    id, user_test_id, writing_sum, writing_count,
+    feedback, errors_analysis, created_at, updated_at
+)
+SELECT gen_random_uuid(), ut_id, 0, 0, '', '{}'::jsonb, %(now)s, %(now)s
+FROM unnest(%(ids)s::uuid[]) AS ut_id
+ON CONFLICT (user_test_id) DO NOTHING
+"""
+
+_AGG_W = _writing_sql("agg.total", "agg.n")
+
+_RECOMPUTE_SQL = f"""
+WITH agg AS (
+    SELECT user_test_id, SUM(score) AS total, COUNT(*) AS n
+    FROM teacher_submissions
+    WHERE user_test_id = ANY(%(ids)s::uuid[])
+      AND status = %(checked)s AND score IS NOT NULL
+    GROUP BY user_test_id
+)
+UPDATE test_results tr
+SET writing_sum = agg.total,
+    writing_count = agg.n,
+    writing_score = {_AGG_W},
+    overall_score = {_overall_sql("tr.listening_score", "tr.reading_score", _AGG_W)},
+    updated_at = %(now)s
+FROM agg, user_tests ut
+WHERE tr.user_test_id = agg.user_test_id AND ut.id = tr.user_test_id
+RETURNING ut.user_id
+"""
+
+
+@transaction.atomic
+def recompute_writing(user_test_ids: Iterable) -> int:
+    """
+    Bir nechta `UserTest` uchun writing sum/count va bandlarni tekshirilgan
+    submission'lardan bitta guruhlangan agregat bilan qayta hisoblaydi
+    (bulk baholashda ishlatiladi).
+    """
+    ids = sorted({str(i) for i in user_test_ids})
+    if not ids:
+        return 0
+    params = {
+        "ids": ids,
+        "now": timezone.now(),
+        "checked": TeacherSubmission.Status.CHECKED,
+    }
+    with connection.cursor() as cur:
+        cur.execute(_ENSURE_MANY_SQL, params)
+        cur.execute(_RECOMPUTE_SQL, params)
+        owners = {row[0] for row in cur.fetchall()}
+
+    def invalidate():
+        for owner in owners:
+            invalidate_student_dashboard(owner)
+
+    transaction.on_commit(invalidate)
+    return len(ids)
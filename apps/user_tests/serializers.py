@@ -13,6 +13,14 @@ class TestListItemSerializer(serializers.ModelSerializer):
         fields = ["id", "title", "created_at", "price", "purchased"]
 
 
+class TestListPageSerializer(serializers.Serializer):
+    """`KeysetPagination` javobi; `count=false` bo'lsa `count` bo'lmaydi."""
+
+    count = serializers.IntegerField(required=False)
+    next = serializers.URLField(allow_null=True)
+    results = TestListItemSerializer(many=True)
+
+
 class TestSerializer(serializers.ModelSerializer):
     class Meta:
         model = Test
@@ -53,3 +61,37 @@ class TestResultSerializer(serializers.ModelSerializer):
             "errors_analysis",
             "created_at",
         ]
+
+
+class AnswerItemSerializer(serializers.Serializer):
+    question_id = serializers.IntegerField(min_value=1)
+    raw_answer = serializers.JSONField(allow_null=True)
+
+
+class AnswerBatchSerializer(serializers.Serializer):
+    answers = AnswerItemSerializer(many=True, allow_empty=False, max_length=200)
+
+
+class AnswerItemStatusSerializer(serializers.Serializer):
+    question_id = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=["saved", "invalid_question"])
+
+
+class AnswerBatchResultSerializer(serializers.Serializer):
+    saved = serializers.IntegerField()
+    items = AnswerItemStatusSerializer(many=True)
+
+
+class BulkPurchaseSerializer(serializers.Serializer):
+    test_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=50,
+    )
+
+
+class BulkPurchaseResultSerializer(serializers.Serializer):
+    purchased = UserTestSerializer(many=True)
+    already_owned = serializers.ListField(child=serializers.IntegerField())
+    total_price = serializers.DecimalField(max_digits=12, decimal_places=2)
+    balance = serializers.DecimalField(max_digits=12, decimal_places=2, allow_null=True)
@@ -1,38 +1,234 @@
 #  apps/user_tests/services.py
+import uuid
 from decimal import Decimal
+from typing import Any, Dict, List, Optional
 
 from django.core.exceptions import ValidationError
-from django.db import transaction
+from django.db import connection, transaction
+from django.utils import timezone
 
-from apps.profiles.models import StudentProfile
+from apps.profiles.dashboard import invalidate_student_dashboard
+from apps.profiles.ledger import InsufficientFunds, post_entry
+from apps.profiles.models import LedgerEntry, StudentProfile
 from apps.tests.models.ielts import Test
-from .models import UserTest
+from apps.tests.services import test_questions_queryset
+from .catalogue import forget_purchases
+from .grading import grade_user_test
+from .models import UserTest, UserAnswer, TestResult
+
+
+# Narx jadvali `test_price`dan (har bir student turi uchun) keladi;
+# profil alohida o'qilmaydi — turi INSERT ichida jadvaldan tanlanadi
+_PURCHASE_SQL = """
+WITH sp AS (
+    SELECT s.id, p.price
+    FROM student_profiles s
+    JOIN unnest(%(types)s::text[], %(prices)s::numeric[]) AS p(type, price)
+      ON p.type = s.type
+    WHERE s.user_id = %(user)s
+), ins AS (
+    INSERT INTO user_tests (
+        id, user_id, test_id, status, price_paid, created_at, updated_at
+    )
+    SELECT %(id)s, %(user)s, %(test)s, %(status)s, sp.price, %(now)s, %(now)s
+    FROM sp
+    ON CONFLICT (user_id, test_id) DO NOTHING
+    RETURNING id, price_paid
+)
+SELECT sp.id, ins.id, ins.price_paid FROM sp LEFT JOIN ins ON TRUE
+"""
 
 
 @transaction.atomic
-def purchase_test(*, user, test: Test) -> UserTest:
-    sp = getattr(user, "student_profile", None)
-    if not sp:
+def purchase_test(*, user, test: Test) -> Optional[UserTest]:
+    """
+    Testni sotib oladi: `user_tests`ga `INSERT ... ON CONFLICT DO NOTHING`
+    (narx `test_price` bo'yicha, student turi SQL ichida tanlanadi),
+    keyin yangi qator bo'lsa ledger orqali bitta shartli debit. Jami ko'pi
+    bilan ikki statement, balans qatori faqat debit statement'idan
+    tranzaksiya oxirigacha qulflanadi.
+
+    `None` — test allaqachon sotib olingan. Balans yetmasa `ValidationError`
+    (INSERT ham bekor bo'ladi).
+    """
+    types = [t for t, _ in StudentProfile.TYPE_CHOICES]
+    now = timezone.now()
+    params = {
+        "id": uuid.uuid4(),
+        "user": user.pk,
+        "test": test.pk,
+        "types": types,
+        "prices": [
+            test_price(student=StudentProfile(type=t), test=test) for t in types
+        ],
+        "status": UserTest.Status.NOT_STARTED,
+        "now": now,
+    }
+    with connection.cursor() as cur:
+        cur.execute(_PURCHASE_SQL, params)
+        row = cur.fetchone()
+    if row is None:
         raise ValidationError("Student profile mavjud emas")
+    student_id, ut_id, price = row
+    if ut_id is None:
+        return None  # allaqachon sotib olingan
 
-    price = (
-        Decimal(getattr(test, "price", 0))
-        if sp.type == StudentProfile.TYPE_ONLINE
-        else Decimal("0.00")
+    if price > 0:
+        try:
+            post_entry(
+                student_id=student_id,
+                amount=-price,
+                kind=LedgerEntry.Kind.PURCHASE,
+                reference=f"user_test:{ut_id}",
+            )
+        except InsufficientFunds:
+            raise ValidationError("Balance yetarli emas!")
+
+    ut = UserTest(
+        id=ut_id,
+        user=user,
+        test=test,
+        status=params["status"],
+        price_paid=price,
+        created_at=now,
+        updated_at=now,
     )
+    ut._state.adding = False
+    ut._state.db = connection.alias
+
+    # raw INSERT post_save signal'ini yubormaydi
+    def on_commit():
+        forget_purchases(user.pk)
+        invalidate_student_dashboard(user.pk)
+
+    transaction.on_commit(on_commit)
+    return ut
+
+
+def test_price(*, student: StudentProfile, test: Test) -> Decimal:
+    """Online student to'laydi, offline (tasdiqlangan) student uchun bepul."""
+    if student.type != StudentProfile.TYPE_ONLINE:
+        return Decimal("0.00")
+    return Decimal(getattr(test, "price", 0))
+
+
+@transaction.atomic
+def purchase_tests_bulk(*, user, test_ids: List[int]) -> Dict[str, Any]:
+    """
+    Bir nechta testni bitta tranzaksiyada sotib oladi: barcha `UserTest`
+    qatorlari bitta `bulk_create(ignore_conflicts=True)` bilan yoziladi,
+    haqiqatda yaratilganlari oldindan berilgan id'lar bo'yicha qayta
+    o'qiladi va ularning jami narxi balansdan bitta ledger debit bilan
+    yechiladi. Balans yetmasa `ValidationError` — hech narsa yaratilmaydi.
+    """
+    sp = StudentProfile.objects.only("id", "type").filter(user=user).first()
+    if sp is None:
+        raise ValidationError("Student profile mavjud emas")
 
-    ut, created = UserTest.objects.get_or_create(
-        user=user, test=test, defaults={"price_paid": price}
+    wanted = list(dict.fromkeys(test_ids))
+    # TestSerializer maydonlari ham — javobda qayta so'rov yo'q
+    tests = Test.objects.only("id", "title", "created_at", "price").in_bulk(wanted)
+    missing = [tid for tid in wanted if tid not in tests]
+    if missing:
+        raise ValidationError(f"Test topilmadi: {missing}")
+
+    rows = [
+        UserTest(
+            id=uuid.uuid4(),
+            user=user,
+            test_id=tid,
+            price_paid=test_price(student=sp, test=tests[tid]),
+        )
+        for tid in wanted
+    ]
+    UserTest.objects.bulk_create(rows, ignore_conflicts=True)
+    # ignore_conflicts id'larni qaytarmaydi: bizning id bilan yozilganlari yangi
+    created_ids = set(
+        UserTest.objects.filter(id__in=[ut.id for ut in rows]).values_list(
+            "id", flat=True
+        )
     )
-    if not created:
-        return ut  # allaqachon sotib olingan
+    created = [ut for ut in rows if ut.id in created_ids]
+    total = sum((ut.price_paid for ut in created), Decimal("0.00"))
 
-    if price > 0:
-        # concurrency-safe balansni tekshirish
-        sp = StudentProfile.objects.select_for_update().get(pk=sp.pk)
-        if sp.balance < price:
+    balance = None
+    if total > 0:
+        try:
+            entry = post_entry(
+                student_id=sp.pk,
+                amount=-total,
+                kind=LedgerEntry.Kind.PURCHASE,
+                reference=f"user_tests:{created[0].id}",
+                note=f"Bulk purchase: {len(created)} ta test",
+            )
+        except InsufficientFunds:
             raise ValidationError("Balance yetarli emas!")
-        sp.balance -= price
-        sp.save(update_fields=["balance"])
+        balance = entry.balance_after
 
-    return ut
+    for ut in created:
+        ut.test = tests[ut.test_id]
+
+    # bulk_create post_save signal'ini yubormaydi
+    def on_commit():
+        forget_purchases(user.pk)
+        invalidate_student_dashboard(user.pk)
+
+    if created:
+        transaction.on_commit(on_commit)
+    bought = {ut.test_id for ut in created}
+    return {
+        "purchased": created,
+        "already_owned": [tid for tid in wanted if tid not in bought],
+        "total_price": total,
+        "balance": balance,
+    }
+
+
+@transaction.atomic
+def complete_user_test(*, user_test: UserTest) -> TestResult:
+    user_test.mark_completed()
+    return grade_user_test(user_test)
+
+
+@transaction.atomic
+def save_answers(
+    *, user_test: UserTest, items: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Javoblarni batch holatda upsert qiladi: test savollariga tegishliligi
+    bitta so'rovda tekshiriladi, keyin bitta `INSERT ... ON CONFLICT DO UPDATE`.
+    """
+    if user_test.status == UserTest.Status.COMPLETED:
+        raise ValidationError("Test allaqachon yakunlangan.")
+
+    latest = {item["question_id"]: item["raw_answer"] for item in items}
+    valid = set(
+        test_questions_queryset(user_test.test_id)
+        .filter(id__in=latest.keys())
+        .values_list("id", flat=True)
+    )
+
+    if valid:
+        UserAnswer.objects.bulk_create(
+            [
+                UserAnswer(
+                    user_test=user_test,
+                    question_id=qid,
+                    raw_answer=latest[qid],
+                    is_correct=None,
+                )
+                for qid in valid
+            ],
+            update_conflicts=True,
+            unique_fields=["user_test", "question"],
+            update_fields=["raw_answer", "is_correct"],
+        )
+        user_test.mark_started()
+
+    return [
+        {
+            "question_id": item["question_id"],
+            "status": "saved" if item["question_id"] in valid else "invalid_question",
+        }
+        for item in items
+    ]
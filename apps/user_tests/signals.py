@@ -0,0 +1,27 @@
+# apps/user_tests/signals.py
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.tests.models.ielts import Test
+from .catalogue import forget_purchases, bump_catalogue_version
+from .models import UserTest
+
+
+@receiver(post_save, sender=UserTest)
+def user_test_saved(sender, instance: UserTest, created, **kwargs):
+    # to'plam keyingi o'qishda qayta yuklanadi (get-then-set poygasi yo'q)
+    user_id = instance.user_id
+    transaction.on_commit(lambda: forget_purchases(user_id))
+
+
+@receiver(post_delete, sender=UserTest)
+def user_test_deleted(sender, instance: UserTest, **kwargs):
+    user_id = instance.user_id
+    transaction.on_commit(lambda: forget_purchases(user_id))
+
+
+@receiver(post_save, sender=Test)
+@receiver(post_delete, sender=Test)
+def catalogue_changed(sender, **kwargs):
+    transaction.on_commit(bump_catalogue_version)
@@ -1,3 +1,80 @@
-from django.test import TestCase
+from django.test import SimpleTestCase
 
-# Create your tests here.
+from apps.tests.models.question import QuestionType
+from apps.user_tests.answer_keys import normalize_text
+from apps.user_tests.grading import (
+    LISTENING_BANDS,
+    READING_BANDS,
+    grade_answer,
+    raw_to_band,
+)
+
+
+class RawToBandTests(SimpleTestCase):
+    def test_listening_boundaries(self):
+        cases = [(40, 9.0), (39, 9.0), (38, 8.5), (30, 7.0), (29, 6.5), (1, 1.0)]
+        for raw, band in cases:
+            with self.subTest(raw=raw):
+                self.assertEqual(raw_to_band(raw, 40, LISTENING_BANDS), band)
+
+    def test_reading_boundaries(self):
+        cases = [(33, 7.5), (32, 7.0), (27, 6.5), (26, 6.0), (15, 5.0), (14, 4.5)]
+        for raw, band in cases:
+            with self.subTest(raw=raw):
+                self.assertEqual(raw_to_band(raw, 40, READING_BANDS), band)
+
+    def test_zero_and_empty(self):
+        self.assertEqual(raw_to_band(0, 40, LISTENING_BANDS), 0.0)
+        self.assertIsNone(raw_to_band(0, 0, LISTENING_BANDS))
+
+    def test_scaled_to_forty(self):
+        # 15/20 -> 30/40
+        self.assertEqual(raw_to_band(15, 20, LISTENING_BANDS), 7.0)
+
+
+class GradeAnswerTests(SimpleTestCase):
+    def test_true_false_not_given_aliases(self):
+        qtype = QuestionType.R_TRUE_FALSE_NOT_GIVEN
+        for given in ("T", "true", " True. "):
+            with self.subTest(given=given):
+                self.assertEqual(grade_answer(qtype, None, ["TRUE"], given), (1, 1))
+        self.assertEqual(grade_answer(qtype, None, ["NOT GIVEN"], "ng"), (1, 1))
+        self.assertEqual(grade_answer(qtype, None, ["NOT GIVEN"], "F"), (0, 1))
+
+    def test_yes_no_not_given_aliases(self):
+        qtype = QuestionType.R_YES_NO_NOT_GIVEN
+        self.assertEqual(grade_answer(qtype, None, ["YES"], "y"), (1, 1))
+        self.assertEqual(grade_answer(qtype, None, ["NO"], "N"), (1, 1))
+        self.assertEqual(grade_answer(qtype, None, ["not given"], "NotGiven"), (1, 1))
+
+    def test_multi_select(self):
+        qtype = QuestionType.R_MULTIPLE_CHOICE
+        self.assertEqual(grade_answer(qtype, None, ["A", "C"], ["c", "(A)"]), (2, 2))
+        self.assertEqual(grade_answer(qtype, None, ["A", "C"], ["A", "B"]), (1, 2))
+
+    def test_multi_select_too_many_options_scores_zero(self):
+        qtype = QuestionType.L_MULTIPLE_CHOICE
+        self.assertEqual(grade_answer(qtype, None, ["A", "C"], ["A", "B", "C"]), (0, 2))
+
+    def test_per_part_dict_answers(self):
+        qtype = QuestionType.L_FORM_COMPLETION
+        key = {"1": "London", "2": ["10 am", "10:00"], "3": "bus"}
+        given = {"1": "london", "2": "10:00", "3": "train"}
+        self.assertEqual(grade_answer(qtype, key, None, given), (2, 3))
+        self.assertEqual(grade_answer(qtype, key, None, "London"), (0, 3))
+
+    def test_text_alternatives(self):
+        qtype = QuestionType.R_SHORT_ANSWER
+        key = ["car park", "parking lot"]
+        self.assertEqual(grade_answer(qtype, None, key, "Parking  Lot."), (1, 1))
+        self.assertEqual(grade_answer(qtype, None, key, "garage"), (0, 1))
+
+
+class NormalizeTextTests(SimpleTestCase):
+    def test_whitespace_case_and_edge_punctuation(self):
+        self.assertEqual(normalize_text('  "The   Old\tMill." '), "the old mill")
+        self.assertEqual(normalize_text("(B)"), "b")
+
+    def test_none_and_numbers(self):
+        self.assertEqual(normalize_text(None), "")
+        self.assertEqual(normalize_text(42), "42")
@@ -5,6 +5,17 @@ from . import views
 urlpatterns = [
     path("all-tests/", views.all_tests, name="all-tests"),
     path("purchase/<int:test_id>/", views.purchase_test_api, name="purchase-test"),
+    path("purchase/bulk/", views.purchase_bulk_api, name="purchase-bulk"),
     path("my-tests/", views.my_tests, name="my-tests"),
     path("results/", views.my_results, name="my-results"),
+    path(
+        "<uuid:user_test_id>/answers/",
+        views.submit_answers_api,
+        name="submit-answers",
+    ),
+    path(
+        "<uuid:user_test_id>/complete/",
+        views.complete_test_api,
+        name="complete-test",
+    ),
 ]
@@ -1,5 +1,5 @@
 # apps/user_tests/views.py
-from django.db.models import Exists, OuterRef
+from django.core.exceptions import ValidationError
 from django.shortcuts import get_object_or_404
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
@@ -8,31 +8,63 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from apps.core.pagination import KeysetPagination
 from apps.tests.models.ielts import Test
 from .models import UserTest, TestResult
 from .serializers import (
-    TestListItemSerializer,
+    TestListPageSerializer,
     UserTestSerializer,
     TestResultSerializer,
+    AnswerBatchSerializer,
+    AnswerBatchResultSerializer,
+    BulkPurchaseSerializer,
+    BulkPurchaseResultSerializer,
+)
+from .catalogue import catalogue_page, with_purchased
+from .services import (
+    purchase_test,
+    purchase_tests_bulk,
+    complete_user_test,
+    save_answers,
 )
-from .services import purchase_test
 
 
 @extend_schema(
     tags=["UserTests"],
     summary="Barcha testlar (purchased flag bilan)",
-    responses={200: TestListItemSerializer(many=True)},
+    description=(
+        "`-created_at` bo'yicha keyset (cursor) pagination. Keyingi sahifa "
+        "`next` orqali olinadi; `count=false` bo'lsa `count` hisoblanmaydi."
+    ),
+    parameters=[
+        OpenApiParameter(
+            name="cursor",
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY,  # noqa
+            description="Keyingi sahifa kursori (`next` ichidan)",
+        ),
+        OpenApiParameter(
+            name="page_size",
+            type=OpenApiTypes.INT,
+            location=OpenApiParameter.QUERY,  # noqa
+            description="Sahifa hajmi (max 100)",
+        ),
+        OpenApiParameter(
+            name="count",
+            type=OpenApiTypes.BOOL,
+            location=OpenApiParameter.QUERY,  # noqa
+            description="`false` bo'lsa COUNT(*) hisoblanmaydi",
+        ),
+    ],
+    responses={200: TestListPageSerializer},
 )
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def all_tests(request):
-    purchased_qs = UserTest.objects.filter(user=request.user, test=OuterRef("pk"))
-    tests = (
-        Test.objects.all()
-        .annotate(purchased=Exists(purchased_qs))
-        .order_by("-created_at")
-    )
-    return Response(TestListItemSerializer(tests, many=True).data)
+    # katalog sahifasi umumiy keshdan, `purchased` esa user to'plamidan
+    paginator = KeysetPagination()
+    rows = catalogue_page(request, paginator)
+    return paginator.get_paginated_response(with_purchased(rows, request.user.pk))
 
 
 @extend_schema(
@@ -55,17 +87,44 @@ def purchase_test_api(request, test_id: int):
     user = request.user
     test = get_object_or_404(Test, pk=test_id)
 
-    if UserTest.objects.filter(user=user, test=test).exists():
-        return Response({"detail": "Already purchased"}, status=400)
-
     try:
         ut = purchase_test(user=user, test=test)
     except Exception as e:
         return Response({"error": str(e)}, status=400)
+    if ut is None:
+        return Response({"detail": "Already purchased"}, status=400)
 
     return Response(UserTestSerializer(ut).data, status=status.HTTP_201_CREATED)
 
 
+@extend_schema(
+    tags=["UserTests"],
+    summary="Bir nechta testni birdan sotib olish (bitta balans yechimi)",
+    description=(
+        "Narx `purchase` bilan bir xil: online student to'laydi, offline "
+        "student uchun bepul. Allaqachon sotib olinganlar `already_owned`da "
+        "qaytadi va pul yechilmaydi. `balance` — yechimdan keyingi balans "
+        "(hech narsa yechilmagan bo'lsa `null`)."
+    ),
+    request=BulkPurchaseSerializer,
+    responses={200: BulkPurchaseResultSerializer},
+)
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def purchase_bulk_api(request):
+    ser = BulkPurchaseSerializer(data=request.data)
+    ser.is_valid(raise_exception=True)
+
+    try:
+        result = purchase_tests_bulk(
+            user=request.user, test_ids=ser.validated_data["test_ids"]
+        )
+    except ValidationError as e:
+        return Response({"error": e.messages[0]}, status=400)
+
+    return Response(BulkPurchaseResultSerializer(result).data)
+
+
 @extend_schema(
     tags=["UserTests"],
     summary="Mening sotib olingan testlarim (My tests)",
@@ -96,3 +155,66 @@ def my_results(request):
         .order_by("-created_at")
     )
     return Response(TestResultSerializer(results, many=True).data)
+
+
+@extend_schema(
+    tags=["UserTests"],
+    summary="Javoblarni batch holatda saqlash (autosave)",
+    description=(
+        "`{question_id, raw_answer}` juftliklari ro'yxatini qabul qiladi va "
+        "bitta upsert bilan saqlaydi. Har bir element uchun status qaytadi: "
+        "`saved` yoki `invalid_question` (savol bu testga tegishli emas)."
+    ),
+    parameters=[
+        OpenApiParameter(
+            name="user_test_id",
+            type=OpenApiTypes.UUID,
+            location=OpenApiParameter.PATH,  # noqa
+            description="UserTest ID-si",
+            required=True,
+        )
+    ],
+    request=AnswerBatchSerializer,
+    responses={200: AnswerBatchResultSerializer},
+)
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def submit_answers_api(request, user_test_id):
+    ser = AnswerBatchSerializer(data=request.data)
+    ser.is_valid(raise_exception=True)
+    ut = get_object_or_404(UserTest, id=user_test_id, user=request.user)
+
+    try:
+        items = save_answers(user_test=ut, items=ser.validated_data["answers"])
+    except ValidationError as e:
+        return Response({"error": e.messages[0]}, status=400)
+
+    return Response(
+        {"saved": sum(1 for x in items if x["status"] == "saved"), "items": items}
+    )
+
+
+@extend_schema(
+    tags=["UserTests"],
+    summary="Testni yakunlash va listening/reading'ni avtomatik baholash",
+    parameters=[
+        OpenApiParameter(
+            name="user_test_id",
+            type=OpenApiTypes.UUID,
+            location=OpenApiParameter.PATH,  # noqa
+            description="UserTest ID-si",
+            required=True,
+        )
+    ],
+    request=None,
+    responses={200: TestResultSerializer},
+)
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def complete_test_api(request, user_test_id):
+    ut = get_object_or_404(
+        UserTest.objects.select_related("test"), id=user_test_id, user=request.user
+    )
+    tr = complete_user_test(user_test=ut)
+    tr.user_test = ut
+    return Response(TestResultSerializer(tr).data)
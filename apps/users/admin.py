@@ -21,7 +21,7 @@ try:
         can_delete = False
         extra = 0
         fields = ("balance", "is_approved", "type", "created_at", "updated_at")
-        readonly_fields = ("type", "created_at", "updated_at")
+        readonly_fields = ("balance", "type", "created_at", "updated_at")
 
     class TeacherInline(admin.StackedInline):
         model = TeacherProfile
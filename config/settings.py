@@ -35,6 +35,7 @@ DJANGO_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 ]
 
 THIRD_PARTY_APPS = [
@@ -92,6 +93,11 @@ DATABASES = {
     }
 }
 
+# ===================================
+# CACHE (default: LocMem; prod: CACHE_URL=redis://...)
+# ===================================
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+
 # ===================================
 # AUTH USER MODEL
 # ===================================
@@ -144,6 +150,9 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 STATICFILES_DIRS = [BASE_DIR / "static"]
 
 MEDIA_URL = "/media/"
+# Test snapshot'lari request'siz quriladi — ulardagi media URL'lar uchun
+# bazaviy manzil (masalan https://api.cdi.uz). Bo'sh bo'lsa nisbiy qoladi.
+MEDIA_BASE_URL = env("MEDIA_BASE_URL", default="")
 MEDIA_ROOT = BASE_DIR / "media"
 
 # ===================================
@@ -272,15 +281,57 @@ CLICK = {
 PAYMENTS = {
     "MIN_TOPUP": 1000,  # 1 000 UZS
     "MAX_TOPUP": 5_000_000,  # 5 mln UZS
+    "MAX_EVENT_ATTEMPTS": 5,  # Click event'i shuncha xatodan keyin `failed`
+    "EVENT_BACKOFF_BASE": 5,  # soniya: 5, 10, 20, ... (jitter bilan)
+    "EVENT_BACKOFF_MAX": 3600,
 }
 
 
 SPEAKING = {
     "FEE": 50000,
+    # True: har so'rov uchun xabar o'rniga digest (`flush_speaking_digest`
+    # cron yoki `--interval` bilan ishlashi kerak)
+    "ADMIN_DIGEST": env.bool("SPEAKING_ADMIN_DIGEST", default=False),
+    "DIGEST_WINDOW_MINUTES": 10,  # eng eski so'rov shuncha kutgach yuboriladi
+    "DIGEST_MAX_ITEMS": 20,  # xabarda ro'yxatlanadigan so'rovlar
+    "ADMIN_BASE_URL": env("ADMIN_BASE_URL", default=""),  # masalan https://api.cdi.uz
+}
+
+TEACHER_CHECKING = {
+    "LEASE_MINUTES": 30,  # claim muddati; o'tsa submission qayta pool'ga
+    "MAX_IN_CHECKING": 10,  # bir teacher'da bir vaqtda nechta bo'lishi mumkin
+    "MAX_CLAIM_BATCH": 10,
+    "COUNTER_SHARDS": 8,  # global counter qatorlari soni (issiq qatorni bo'lish)
+    "NEAR_DUPLICATE_THRESHOLD": 0.8,  # MinHash bo'yicha taxminiy Jaccard
+    "NEAR_DUPLICATE_LIMIT": 5,
+    "NEAR_DUPLICATE_BUCKET_MAX": 200,  # bundan katta LSH bucket'lar e'tiborsiz
+}
+
+DASHBOARD = {
+    "CACHE_TTL": 30,  # soniya; signal orqali ham tozalanadi
+    # bo'limlarni parallel thread'larda yig'ish; faqat CONN_MAX_AGE/pool bilan
+    "CONCURRENT": env.bool("DASHBOARD_CONCURRENT", default=False),
+    "WORKERS": 4,
 }
 TELEGRAM_BOT_TOKEN = env("TELEGRAM_BOT_TOKEN", default="")
 TELEGRAM_ADMIN_CHAT_ID = env("TELEGRAM_ADMIN_CHAT_ID", default="")
 
+# Notification outbox dispatcher (`manage.py dispatch_notifications`)
+NOTIFICATIONS = {
+    "API_URL": env("TELEGRAM_API_URL", default="https://api.telegram.org"),
+    "MAX_CONNECTIONS": 10,  # keep-alive pool (har bir event loop uchun)
+    "MAX_CONCURRENCY": 10,  # bir vaqtda yuborilayotgan so'rovlar
+    "TIMEOUT": 10.0,
+    "MAX_ATTEMPTS": 8,
+    "BACKOFF_BASE": 2,  # soniya: 2, 4, 8, ... (jitter bilan)
+    "BACKOFF_MAX": 600,
+    "LEASE_SECONDS": 120,  # olingan xabar shuncha vaqt boshqa dispatcher'ga ko'rinmaydi
+    "GLOBAL_RATE": 25,  # msg/s, Telegram limiti ~30
+    "CHAT_INTERVAL": 1.0,  # bitta chatga ~1 msg/s
+    "GROUP_INTERVAL": 3.0,  # guruhga ~20 msg/min
+    "MAX_WAIT": 30,  # rate limit uchun bundan ko'p kutilmaydi, keyinga qoldiriladi
+}
+
 # ===================================
 # LOGGING (useful in Docker)
 # ===================================